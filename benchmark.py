@@ -0,0 +1,86 @@
+import os
+import sys
+import shutil
+import atexit
+import argparse
+import tempfile
+
+# Diretórios de estado do pipeline (cache da API, game logs, registro de modelos, agregados e intermediários).
+# Cada medição começa com eles vazios, para que a baseline e as comparações façam o mesmo trabalho; os
+# módulos leem os diretórios ao serem importados, então eles são definidos antes dos imports do projeto
+DIRETORIOS_ESTADO = ("NBA_CACHE_DIR", "NBA_GAMELOGS_DIR", "NBA_MODELOS_DIR", "NBA_AGREGADOS_DIR", "NBA_INTERMEDIARIOS_DIR")
+ESTADO = "reaproveitado" if "--reaproveitar-estado" in sys.argv else "isolado"
+if ESTADO == "isolado":
+    _estado_dir = tempfile.mkdtemp(prefix="nba_benchmark_")
+    atexit.register(shutil.rmtree, _estado_dir, ignore_errors=True)
+    for variavel in DIRETORIOS_ESTADO:
+        os.environ[variavel] = os.path.join(_estado_dir, variavel[len("NBA_"):-len("_DIR")].lower())
+
+from src.rf.etapas import ETAPAS
+from src.data.transporte_gravado import ativar_transporte, MODOS
+from src.utils.pipeline import selecionar_etapas
+from src.utils.benchmark import (executar_benchmark, montar_relatorio, comparar_com_baseline, salvar_relatorio,
+                                 ler_relatorio, TOLERANCIA_PADRAO)
+
+BASELINE_PADRAO = "benchmarks/baseline.json"
+RESULTADO_PADRAO = "benchmarks/resultado.json"
+
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(
+        description="Mede cada etapa do pipeline (tempo, CPU, requisições HTTP, memória e arquivos gravados)."
+    )
+    parser.add_argument("--only", nargs="+", metavar="ETAPA",
+                        help="Mede apenas as etapas ou partes informadas (ex.: parte2, P3-RF1).")
+    parser.add_argument("--from", dest="a_partir_de", metavar="ETAPA", help="Mede a partir da etapa informada.")
+    parser.add_argument("--http", choices=MODOS, default="reproduzir",
+                        help="Modo das requisições HTTP (padrão: reproduzir as respostas gravadas).")
+    parser.add_argument("--fixtures", default=None, metavar="DIR",
+                        help="Diretório das respostas gravadas (padrão: NBA_HTTP_FIXTURES_DIR ou data/fixtures/http).")
+    parser.add_argument("--latencia", default="0",
+                        help="Na reprodução, segundos de espera por resposta ou 'gravada' (padrão: 0).")
+    parser.add_argument("--saida", default=RESULTADO_PADRAO, help=f"Arquivo JSON do resultado (padrão: {RESULTADO_PADRAO}).")
+    parser.add_argument("--comparar", nargs="?", const=BASELINE_PADRAO, default=None, metavar="BASELINE",
+                        help=f"Compara com uma baseline e sai com erro se houver regressões (padrão: {BASELINE_PADRAO}).")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help=f"Aumento relativo tolerado em tempo, CPU e memória (padrão: {TOLERANCIA_PADRAO}).")
+    parser.add_argument("--salvar-baseline", action="store_true", help=f"Grava o resultado também em {BASELINE_PADRAO}.")
+    parser.add_argument("--reaproveitar-estado", action="store_true",
+                        help="Usa o cache, os game logs, os modelos e os agregados já existentes, em vez de diretórios "
+                             "vazios (só é comparável com uma baseline medida da mesma forma).")
+    return parser.parse_args()
+
+
+def main():
+    args = ler_argumentos()
+    ativar_transporte(args.http, args.fixtures, args.latencia)
+
+    selecionadas = selecionar_etapas(ETAPAS, somente=args.only, a_partir_de=args.a_partir_de)
+    relatorio = montar_relatorio(executar_benchmark(ETAPAS, selecionadas), modo_http=args.http, estado=ESTADO)
+
+    salvar_relatorio(relatorio, args.saida)
+    print(f"Resultado salvo em {args.saida}.")
+    if args.salvar_baseline:
+        salvar_relatorio(relatorio, BASELINE_PADRAO)
+        print(f"Baseline salva em {BASELINE_PADRAO}.")
+
+    totais = relatorio["totais"]
+    print(f"Total: {totais['tempo_s']:.1f}s, CPU {totais['cpu_s']:.1f}s, {totais['requisicoes_http']} requisições "
+          f"({totais['bytes_http'] / 2 ** 20:.1f} MB), pico de {totais['pico_rss_mb']:.0f} MB, "
+          f"{totais['bytes_artefatos'] / 2 ** 20:.1f} MB em arquivos.")
+
+    if args.comparar:
+        try:
+            regressoes = comparar_com_baseline(relatorio, ler_relatorio(args.comparar), args.tolerancia)
+        except ValueError as e:
+            print(f"Comparação recusada: {e}")
+            sys.exit(2)
+        for regressao in regressoes:
+            print(f"Regressão: {regressao}")
+        if regressoes:
+            sys.exit(1)
+        print("Nenhuma regressão em relação à baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.data.lago import ler_gamelogs
+from src.data.repositorio_gamelogs import precarregar_gamelogs
+from src.analytics.quantis import atualizar_estimadores, carregar_estimadores, salvar_estimadores
+from src.analytics.histogramas import Histograma, histogramas_por_grupo, menores_por_grupo
+from src.analytics.resumos import ResumoDistribuicao
+from src.utils.instrumentacao import span
+
+# Agregados dos jogos de cada jogador, usados pela Parte 2 RF5 a RF8 (médias, medianas, modas e desvios).
+# O resumo da temporada (uma linha por jogador e métrica) sai dos estimadores salvos, sem percorrer os jogos
+# (resumir_jogos() calcula o mesmo resumo direto dos game logs, em uma única passada agrupada).
+# A tabela por jogo, com as médias e desvios móveis (últimos 5, 10 e 20 jogos) e acumulados até cada
+# jogo, fica salva em AGREGADOS_DIR/<temporada>/<time>.parquet e é atualizada só com os jogos novos.
+# Ao lado dela, em <time>_quantis.json e <time>_histogramas.json, ficam os estimadores de mediana
+# (src/analytics/quantis.py) e os histogramas (src/analytics/histogramas.py) de cada jogador e métrica,
+# que também recebem só os jogos novos, e, em <time>_resumo.parquet, o resumo da temporada. No pipeline,
+# a etapa P2-AGREGADOS atualiza esses arquivos uma vez e os RF5 a RF8 só leem o resumo.
+AGREGADOS_DIR = os.getenv("NBA_AGREGADOS_DIR", "data/agregados")
+
+# Temporada resumida pela Parte 2
+TEMPORADA_PADRAO = "2024-25"
+
+# Métricas agregadas
+METRICAS = ("PTS", "REB", "AST")
+
+# Nomes das métricas nas tabelas da Parte 2
+NOMES_METRICAS = {"PTS": "Pontos", "REB": "Rebotes", "AST": "Assistências"}
+
+# Janelas (em jogos) das médias e desvios móveis
+JANELAS = (5, 10, 20)
+
+
+def resumir_jogos(jogos, metricas=METRICAS, por="PLAYER_ID"):
+    """
+    Calcula as estatísticas da temporada de cada jogador e métrica.
+
+    Args:
+        jogos (pd.DataFrame): Game logs, com uma coluna por métrica.
+        metricas (tuple): Métricas resumidas (padrão: METRICAS).
+        por (str): Coluna que identifica o jogador (padrão: 'PLAYER_ID').
+
+    Returns:
+        pd.DataFrame: Uma linha por jogador e métrica, na ordem de `metricas`, com 'jogos', 'media',
+        'mediana', 'desvio' (amostral), 'pct_abaixo_media' e 'pct_abaixo_mediana' (0 a 100), 'modas' e
+        'ocorrencias_moda' (listas em ordem crescente) e 'possui_moda' (False quando todos os valores
+        aparecem o mesmo número de vezes).
+    """
+    longo = jogos.melt(id_vars=[por], value_vars=list(metricas), var_name="metrica", value_name="valor")
+    longo = longo.dropna(subset=["valor"])
+    longo["metrica"] = pd.Categorical(longo["metrica"], categories=list(metricas), ordered=True)
+    chaves = [por, "metrica"]
+
+    with span("transformacao", "resumir_jogos", linhas=len(longo)):
+        grupos = longo.groupby(chaves, observed=True)["valor"]
+        resumo = grupos.agg(jogos="count", media="mean", mediana="median", desvio="std")
+        valores = longo["valor"].to_numpy()
+        abaixo = pd.Series(valores < grupos.transform("median").to_numpy(), index=longo.index, name="pct_abaixo_mediana")
+        resumo = resumo.join(abaixo.groupby([longo[por], longo["metrica"]], observed=True).mean() * 100)
+
+        if valores.size and valores.min() >= 0 and np.array_equal(valores, np.round(valores)):
+            # Estatísticas de box score: um histograma por grupo dá as modas e a % abaixo da média
+            histogramas = histogramas_por_grupo(valores, grupos.ngroup().to_numpy(), len(resumo))
+            maximos = histogramas.max(axis=1)
+            modas = [np.flatnonzero(linha == maximo).tolist() for linha, maximo in zip(histogramas, maximos)]
+            resumo["pct_abaixo_media"] = menores_por_grupo(histogramas, resumo["media"].to_numpy()) / resumo["jogos"].to_numpy() * 100
+            resumo["modas"] = modas
+            resumo["ocorrencias_moda"] = [[int(maximo)] * len(valores_moda) for valores_moda, maximo in zip(modas, maximos)]
+            resumo["possui_moda"] = [len(np.unique(linha[linha > 0])) > 1 for linha in histogramas]
+        else:
+            resumo["pct_abaixo_media"] = pd.Series(valores < grupos.transform("mean").to_numpy(), index=longo.index) \
+                .groupby([longo[por], longo["metrica"]], observed=True).mean() * 100
+
+            # Modas: os valores que aparecem o número máximo de vezes em cada grupo
+            contagens = longo.groupby(chaves + ["valor"], observed=True).size()
+            maximo = contagens.groupby(level=[0, 1], observed=True).transform("max")
+            modas = contagens[contagens == maximo].reset_index(name="ocorrencias")
+            modas = modas.groupby(chaves, observed=True).agg(modas=("valor", list), ocorrencias_moda=("ocorrencias", list))
+            resumo = resumo.join(modas)
+            resumo["possui_moda"] = contagens.groupby(level=[0, 1], observed=True).nunique() > 1
+
+        resumo = resumo[["jogos", "media", "mediana", "desvio", "pct_abaixo_media", "pct_abaixo_mediana",
+                         "modas", "ocorrencias_moda", "possui_moda"]]
+
+    return resumo.reset_index()
+
+
+def _somas_acumuladas(novos, metricas, por, anteriores):
+    # Número de jogos e somas (e somas dos quadrados) acumulados, continuando dos últimos valores salvos
+    grupos = novos.groupby(por, sort=False)
+    base = anteriores.reindex(novos[por].to_numpy()).fillna(0).to_numpy() if anteriores is not None else 0
+    colunas = {"jogos_acum": grupos.cumcount().to_numpy() + 1}
+    for metrica in metricas:
+        valores = novos[metrica].astype(np.float64)
+        colunas[f"{metrica}_soma_acum"] = valores.groupby(novos[por], sort=False).cumsum().to_numpy()
+        colunas[f"{metrica}_soma2_acum"] = (valores ** 2).groupby(novos[por], sort=False).cumsum().to_numpy()
+    somas = pd.DataFrame(colunas, index=novos.index) + base
+    return somas.astype({"jogos_acum": np.int64})
+
+
+def _medias_e_desvios(n, soma, soma2):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        media = soma / n
+        variancia = np.maximum(soma2 - soma * media, 0) / (n - 1)
+    return media, np.where(n > 1, np.sqrt(variancia), np.nan)
+
+
+def acumular_jogos(jogos, metricas=METRICAS, por="PLAYER_ID", janelas=JANELAS, anterior=None):
+    """
+    Monta a tabela por jogo com as médias e desvios móveis e acumulados de cada jogador.
+
+    Os valores vêm de somas acumuladas: a soma dos últimos w jogos é a diferença entre a soma acumulada
+    do jogo atual e a de w jogos antes. Com a tabela `anterior`, só os jogos novos são calculados, a partir
+    das somas do último jogo salvo de cada jogador. Se algum jogo antigo mudou, sumiu ou foi inserido
+    antes do último salvo, a tabela do jogador é refeita.
+
+    Args:
+        jogos (pd.DataFrame): Game logs com por, 'GAME_ID', 'GAME_DATE' e as métricas.
+        metricas (tuple): Métricas agregadas (padrão: METRICAS).
+        por (str): Coluna que identifica o jogador (padrão: 'PLAYER_ID').
+        janelas (tuple): Tamanhos das janelas móveis, em jogos (padrão: JANELAS).
+        anterior (pd.DataFrame, opcional): Tabela retornada por uma chamada anterior.
+
+    Returns:
+        pd.DataFrame: Uma linha por jogo, em ordem cronológica por jogador, com as métricas e as colunas
+        '<métrica>_media_acum', '<métrica>_desvio_acum', '<métrica>_media_<w>' e '<métrica>_desvio_<w>'.
+    """
+    colunas = [por, "GAME_ID", "GAME_DATE", *metricas]
+    jogos = jogos[colunas].sort_values([por, "GAME_DATE", "GAME_ID"], kind="stable").reset_index(drop=True)
+
+    contexto = anterior if anterior is not None else pd.DataFrame(columns=colunas)
+    if not contexto.empty:
+        # Jogadores cujos jogos salvos não são um prefixo dos jogos atuais são refeitos do zero
+        salvos = contexto[colunas].merge(jogos, how="left", on=[por, "GAME_ID"], suffixes=("", "_atual"),
+                                        indicator=True)
+        alterado = salvos["_merge"] != "both"
+        for coluna in ["GAME_DATE", *metricas]:
+            alterado |= salvos[coluna].to_numpy() != salvos[f"{coluna}_atual"].to_numpy()
+        ultimo = contexto.groupby(por)["GAME_DATE"].max()
+        chegada = jogos.merge(contexto[[por, "GAME_ID"]], how="left", on=[por, "GAME_ID"], indicator=True)
+        fora_de_ordem = (chegada["_merge"] == "left_only") & (
+            chegada["GAME_DATE"].to_numpy() < chegada[por].map(ultimo).to_numpy())
+        refazer = set(salvos.loc[alterado, por]) | set(chegada.loc[fora_de_ordem, por])
+        contexto = contexto[~contexto[por].isin(refazer) & contexto[por].isin(jogos[por])]
+
+    novos = jogos.merge(contexto[[por, "GAME_ID"]], how="left", on=[por, "GAME_ID"], indicator=True)
+    novos = novos[novos["_merge"] == "left_only"].drop(columns="_merge")
+    if novos.empty:
+        return contexto.reset_index(drop=True)
+
+    colunas_somas = ["jogos_acum"] + [f"{m}_{s}" for m in metricas for s in ("soma_acum", "soma2_acum")]
+    with span("transformacao", "acumular_jogos", jogos_novos=len(novos)):
+        ultimos = contexto.groupby(por)[colunas_somas].last() if not contexto.empty else None
+        novos = pd.concat([novos, _somas_acumuladas(novos, metricas, por, ultimos)[colunas_somas]], axis=1)
+
+        # As janelas dos jogos novos podem começar nos jogos salvos: os últimos max(janelas) entram como contexto
+        if contexto.empty:
+            tabela = novos
+        else:
+            tabela = pd.concat([contexto.groupby(por).tail(max(janelas))[novos.columns], novos], ignore_index=True)
+        tabela = tabela.sort_values([por, "jogos_acum"], kind="stable").reset_index(drop=True)
+        grupos = tabela.groupby(por, sort=False)
+        n_acum = tabela["jogos_acum"].to_numpy(dtype=np.float64)
+
+        for metrica in metricas:
+            soma = tabela[f"{metrica}_soma_acum"].to_numpy()
+            soma2 = tabela[f"{metrica}_soma2_acum"].to_numpy()
+            tabela[f"{metrica}_media_acum"], tabela[f"{metrica}_desvio_acum"] = _medias_e_desvios(n_acum, soma, soma2)
+            for janela in janelas:
+                antes = grupos[[f"{metrica}_soma_acum", f"{metrica}_soma2_acum"]].shift(janela).fillna(0).to_numpy()
+                n = np.minimum(n_acum, janela)
+                tabela[f"{metrica}_media_{janela}"], tabela[f"{metrica}_desvio_{janela}"] = _medias_e_desvios(
+                    n, soma - antes[:, 0], soma2 - antes[:, 1])
+
+        novos = tabela.merge(novos[[por, "GAME_ID"]], on=[por, "GAME_ID"])
+
+    resultado = pd.concat([contexto, novos], ignore_index=True) if not contexto.empty else novos
+    return resultado.sort_values([por, "jogos_acum"], kind="stable").reset_index(drop=True)
+
+
+def resumo_jogador(resumo, player_id):
+    """
+    Seleciona no resumo as linhas de um jogador, com a coluna 'Estatística' (nome da métrica em português).
+
+    Returns:
+        pd.DataFrame: Uma linha por métrica, vazio se o jogador não tiver jogos.
+    """
+    linhas = resumo[resumo["PLAYER_ID"] == player_id]
+    return linhas.assign(**{"Estatística": linhas["metrica"].astype(str).map(NOMES_METRICAS)}).reset_index(drop=True)
+
+
+def caminho_agregados(season, team_abbr, diretorio=None, sufixo=".parquet"):
+    """
+    Retorna o arquivo da tabela por jogo de um time em uma temporada, ou, com outro sufixo ('_quantis.json',
+    '_histogramas.json' ou '_resumo.parquet'), o dos estimadores ou do resumo.
+    """
+    return os.path.join(diretorio or AGREGADOS_DIR, season, f"{team_abbr}{sufixo}")
+
+
+def _resumo_dos_estimadores(jogadores, quantis, histogramas, metricas=METRICAS, por="PLAYER_ID"):
+    # Resumo da temporada montado só com os estimadores salvos, sem percorrer os jogos: mediana e % abaixo
+    # da mediana dos estimadores de quantis; jogos, média, desvio, modas e % abaixo da média do resumo de
+    # distribuição (src/analytics/resumos.py) sobre os histogramas. Mesmas colunas de resumir_jogos()
+    jogadores = np.sort(np.asarray(jogadores))
+    chaves = [(int(jogador), metrica) for jogador in jogadores for metrica in metricas]
+    estimados = [quantis[chave] for chave in chaves]
+    resumos = [ResumoDistribuicao(histograma=histogramas[chave]) for chave in chaves]
+    return pd.DataFrame({
+        por: np.repeat(jogadores, len(metricas)),
+        "metrica": pd.Categorical([metrica for _, metrica in chaves], categories=list(metricas), ordered=True),
+        "jogos": np.array([distribuicao.n for distribuicao in resumos], dtype=np.int64),
+        "media": np.array([distribuicao.media for distribuicao in resumos], dtype=np.float64),
+        "mediana": np.array([estimador.mediana() for estimador in estimados], dtype=np.float64),
+        "desvio": np.array([distribuicao.desvio for distribuicao in resumos], dtype=np.float64),
+        "pct_abaixo_media": np.array([distribuicao.proporcao_abaixo(distribuicao.media) * 100 for distribuicao in resumos], dtype=np.float64),
+        "pct_abaixo_mediana": np.array([estimador.proporcao_abaixo_mediana() * 100 for estimador in estimados], dtype=np.float64),
+        "modas": [distribuicao.modas for distribuicao in resumos],
+        "ocorrencias_moda": [distribuicao.ocorrencias_moda for distribuicao in resumos],
+        "possui_moda": np.array([distribuicao.possui_moda for distribuicao in resumos], dtype=bool),
+    })
+
+
+def _gravar_resumo(resumo, caminho):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    resumo.to_parquet(caminho_tmp, index=False)
+    os.replace(caminho_tmp, caminho)
+
+
+def _ler_resumo(caminho):
+    resumo = pd.read_parquet(caminho)
+    # As listas voltam do Parquet como arrays
+    for coluna in ("modas", "ocorrencias_moda"):
+        resumo[coluna] = [valores.tolist() for valores in resumo[coluna]]
+    return resumo
+
+
+def agregados_jogadores(player_ids, season=TEMPORADA_PADRAO, team_abbr="BKN", diretorio=None):
+    """
+    Carrega os jogos dos jogadores pelo time e retorna o resumo da temporada e a tabela por jogo.
+
+    Os game logs que faltarem são buscados no repositório. A tabela por jogo salva e os estimadores de
+    mediana e os histogramas são atualizados só com os jogos novos e gravados de novo, assim como o
+    resumo; os jogadores que não estão em `player_ids` continuam nos arquivos. O resumo é montado só com
+    os estimadores: a mediana e a % abaixo da mediana dos estimadores de quantis, e os demais campos, dos
+    histogramas.
+
+    Args:
+        player_ids (list): IDs dos jogadores.
+        season (str): Temporada no formato 'YYYY-YY' (padrão: '2024-25').
+        team_abbr (str): Sigla do time pelo qual os jogadores atuam (padrão: "BKN").
+        diretorio (str, opcional): Pasta dos agregados (padrão: AGREGADOS_DIR).
+
+    Returns:
+        tuple: (resumo, por_jogo), como em resumir_jogos() e acumular_jogos().
+    """
+    player_ids = list(player_ids)
+    precarregar_gamelogs(player_ids, [season])
+    jogos = ler_gamelogs("jogadores", colunas=["PLAYER_ID", "GAME_ID", "GAME_DATE", "MATCHUP", *METRICAS],
+                         filtros={"SEASON": season, "PLAYER_ID": player_ids})
+    if not jogos.empty:
+        jogos = jogos[jogos["MATCHUP"].str.contains(team_abbr)]
+
+    caminho = caminho_agregados(season, team_abbr, diretorio)
+    salvo = pd.read_parquet(caminho) if os.path.exists(caminho) else None
+    outros = salvo[~salvo["PLAYER_ID"].isin(player_ids)] if salvo is not None else None
+    anterior = salvo[salvo["PLAYER_ID"].isin(player_ids)] if salvo is not None else None
+
+    if jogos.empty:
+        return _resumo_dos_estimadores([], {}, {}), jogos
+
+    por_jogo = acumular_jogos(jogos, anterior=anterior)
+    alterado = anterior is None or not por_jogo.equals(anterior.reset_index(drop=True))
+    if alterado:
+        tabela = pd.concat([outros, por_jogo], ignore_index=True) if outros is not None and not outros.empty else por_jogo
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        caminho_tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        tabela.to_parquet(caminho_tmp, index=False)
+        os.replace(caminho_tmp, caminho)
+
+    estimadores = {}
+    for sufixo, classe in (("_quantis.json", None), ("_histogramas.json", Histograma)):
+        caminho_estimadores = caminho_agregados(season, team_abbr, diretorio, sufixo)
+        estimadores[sufixo], estimadores_alterados = atualizar_estimadores(
+            por_jogo, METRICAS, carregar_estimadores(caminho_estimadores, classe), classe=classe)
+        if estimadores_alterados:
+            salvar_estimadores(estimadores[sufixo], caminho_estimadores)
+        alterado |= estimadores_alterados
+
+    resumo = _resumo_dos_estimadores(por_jogo["PLAYER_ID"].unique(), estimadores["_quantis.json"],
+                                     estimadores["_histogramas.json"])
+
+    # O resumo salvo é o que os RF5 a RF8 leem (carregar_resumo); os outros jogadores continuam nele
+    caminho_resumo = caminho_agregados(season, team_abbr, diretorio, "_resumo.parquet")
+    salvo = _ler_resumo(caminho_resumo) if os.path.exists(caminho_resumo) else None
+    if alterado or salvo is None or not set(resumo["PLAYER_ID"]) <= set(salvo["PLAYER_ID"]):
+        outros = salvo[~salvo["PLAYER_ID"].isin(player_ids)] if salvo is not None else None
+        tabela = pd.concat([outros, resumo], ignore_index=True) if outros is not None and not outros.empty else resumo
+        _gravar_resumo(tabela, caminho_resumo)
+    return resumo, por_jogo
+
+
+def carregar_resumo(player_ids, season=TEMPORADA_PADRAO, team_abbr="BKN", diretorio=None):
+    """
+    Lê o resumo da temporada gravado por agregados_jogadores() (na etapa P2-AGREGADOS do pipeline).
+
+    Os agregados só são atualizados aqui se o resumo ainda não existir ou não tiver algum dos jogadores,
+    como ao executar um RF fora do pipeline.
+
+    Returns:
+        pd.DataFrame: Linhas dos jogadores, como em resumir_jogos().
+    """
+    player_ids = list(player_ids)
+    caminho = caminho_agregados(season, team_abbr, diretorio, "_resumo.parquet")
+    resumo = _ler_resumo(caminho) if os.path.exists(caminho) else None
+    if resumo is None or not set(player_ids) <= set(resumo["PLAYER_ID"]):
+        resumo, _ = agregados_jogadores(player_ids, season, team_abbr, diretorio)
+    return resumo[resumo["PLAYER_ID"].isin(player_ids)].reset_index(drop=True)
+
+
+def resumos_distribuicao(player_ids, seasons=(TEMPORADA_PADRAO,), team_abbr="BKN", diretorio=None):
+    """
+    Monta os resumos de distribuição dos jogos dos jogadores a partir dos histogramas salvos.
+
+    Os histogramas de cada temporada (gravados pela etapa P2-AGREGADOS) são unidos, então as etapas que
+    leem o mesmo jogador e métrica (a Parte 2 e a Parte 3 RF7 e RF8) partem do mesmo resumo, sem
+    percorrer os jogos. Os agregados de uma temporada só são atualizados aqui se os histogramas ainda não
+    existirem ou não tiverem algum dos jogadores, como ao executar um RF fora do pipeline.
+
+    Args:
+        player_ids (list): IDs dos jogadores.
+        seasons (list): Temporadas no formato 'YYYY-YY' (padrão: TEMPORADA_PADRAO).
+        team_abbr (str): Sigla do time (padrão: "BKN").
+        diretorio (str, opcional): Pasta dos agregados (padrão: AGREGADOS_DIR).
+
+    Returns:
+        dict: (jogador, métrica de METRICAS) -> ResumoDistribuicao. Jogadores sem jogos ficam de fora.
+    """
+    player_ids = [int(player_id) for player_id in player_ids]
+    unidos = {}
+    for season in seasons:
+        caminho = caminho_agregados(season, team_abbr, diretorio, "_histogramas.json")
+        histogramas = carregar_estimadores(caminho, Histograma)
+        if not set(player_ids) <= {jogador for jogador, _ in histogramas}:
+            agregados_jogadores(player_ids, season, team_abbr, diretorio)
+            histogramas = carregar_estimadores(caminho, Histograma)
+        for chave, histograma in histogramas.items():
+            if chave[0] in player_ids:
+                unidos[chave] = unidos[chave].unir(histograma) if chave in unidos else histograma
+    return {chave: ResumoDistribuicao(histograma=histograma) for chave, histograma in unidos.items()}
+
+
+def atualizar_agregados(players, team_abbr="BKN", seasons=(TEMPORADA_PADRAO,)):
+    """
+    Atualiza os agregados, os estimadores e o resumo dos jogadores em cada temporada (etapa P2-AGREGADOS).
+
+    Args:
+        players (list): Dicionários com 'PLAYER' e 'PLAYER_ID'.
+        team_abbr (str): Sigla do time (padrão: "BKN").
+        seasons (tuple): Temporadas no formato 'YYYY-YY' (padrão: TEMPORADA_PADRAO).
+    """
+    player_ids = [player['PLAYER_ID'] for player in players]
+    for season in seasons:
+        resumo, por_jogo = agregados_jogadores(player_ids, season, team_abbr)
+        print(f"Agregados de {team_abbr} na temporada {season} atualizados: {len(por_jogo)} jogos, "
+              f"{resumo['PLAYER_ID'].nunique()} jogadores.")
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.histogramas import contagens_abaixo, histogramas_por_grupo
+from src.utils.instrumentacao import span
+
+# Ajuste da distribuição de Gumbel (valores extremos) para muitos grupos de uma vez.
+# Os jogos de todos os grupos (jogador x métrica, por exemplo) ficam em um único vetor, identificado por
+# um código de grupo, e as somas de cada grupo são feitas com np.bincount. Assim, ajustar a liga inteira
+# e avaliar dezenas de limiares custa algumas operações vetorizadas, e não um ajuste do scipy por grupo.
+
+# Métricas dos game logs usadas no método de Gumbel
+METRICAS = ("PTS", "REB", "AST")
+
+# 'mle': máxima verossimilhança (mesmo resultado do scipy.stats.gumbel_r.fit, resolvido por Newton);
+# 'momentos': método dos momentos (fórmula fechada, mais rápido e menos preciso em amostras pequenas)
+METODOS = ("mle", "momentos")
+
+# Limiares varridos por padrão: 0 a 60
+LIMIARES_PADRAO = np.arange(0, 61)
+
+_ITERACOES_MLE = 100
+_TOLERANCIA_MLE = 1e-10
+
+
+def _formato_longo(jogos, metricas, por):
+    # Aceita os game logs com uma coluna por métrica ou já no formato longo (colunas 'metrica' e 'valor')
+    if {"metrica", "valor"}.issubset(jogos.columns):
+        longo = jogos[por + ["metrica", "valor"]]
+        if metricas is not None:
+            longo = longo[longo["metrica"].isin(metricas)]
+    else:
+        metricas = [m for m in (metricas or METRICAS) if m in jogos.columns]
+        longo = jogos.melt(id_vars=por, value_vars=metricas, var_name="metrica", value_name="valor")
+    longo = longo.dropna(subset=["valor"])
+    return longo.astype({"valor": np.float64})
+
+
+def ajustar_gumbel(valores, codigos, n_grupos=None, metodo="mle"):
+    """
+    Ajusta a distribuição de Gumbel (gumbel_r) em vários grupos de uma vez.
+
+    Args:
+        valores (np.ndarray): Valores observados de todos os grupos.
+        codigos (np.ndarray): Código do grupo (0 a n_grupos - 1) de cada valor.
+        n_grupos (int, opcional): Quantidade de grupos (padrão: maior código + 1).
+        metodo (str): 'mle' ou 'momentos'.
+
+    Returns:
+        tuple: (loc, scale), um valor por grupo. Grupos com menos de dois valores distintos ficam com NaN.
+    """
+    if metodo not in METODOS:
+        raise ValueError(f"Método de ajuste desconhecido: {metodo} (use {', '.join(METODOS)}).")
+    valores = np.asarray(valores, dtype=np.float64)
+    codigos = np.asarray(codigos)
+    n_grupos = n_grupos if n_grupos is not None else int(codigos.max()) + 1
+
+    n = np.bincount(codigos, minlength=n_grupos).astype(np.float64)
+    com_jogos = n > 0
+    media = np.bincount(codigos, valores, minlength=n_grupos) / np.where(com_jogos, n, 1)
+    soma_quadrados = np.bincount(codigos, (valores - media[codigos]) ** 2, minlength=n_grupos)
+    desvio = np.sqrt(soma_quadrados / np.maximum(n - 1, 1))
+
+    valido = (n >= 2) & (desvio > 0)
+    scale = np.where(valido, desvio * np.sqrt(6) / np.pi, np.nan)
+    if metodo == "momentos":
+        return media - np.euler_gamma * scale, scale
+
+    # Máxima verossimilhança: scale é a raiz de f(b) = b - média + soma(x e^(-x/b)) / soma(e^(-x/b)).
+    # Os valores são deslocados pelo mínimo do grupo para que os pesos e^(-x/b) não estourem.
+    minimo = np.full(n_grupos, np.inf)
+    np.minimum.at(minimo, codigos, valores)
+    deslocados = valores - minimo[codigos]
+    media_deslocada = media - np.where(com_jogos, minimo, 0)
+    beta = np.where(valido, scale, 1.0)
+
+    for _ in range(_ITERACOES_MLE):
+        pesos = np.exp(-deslocados / beta[codigos])
+        soma_pesos = np.bincount(codigos, pesos, minlength=n_grupos)
+        media_ponderada = np.bincount(codigos, deslocados * pesos, minlength=n_grupos) / soma_pesos
+        variancia_ponderada = np.bincount(codigos, deslocados ** 2 * pesos, minlength=n_grupos) / soma_pesos - media_ponderada ** 2
+        # f'(b) = 1 + variância ponderada / b², sempre positiva: a raiz é única
+        passo = (beta - media_deslocada + media_ponderada) / (1 + variancia_ponderada / beta ** 2)
+        novo = beta - passo
+        novo = np.where(novo > 0, novo, beta / 2)
+        convergiu = np.abs(novo - beta) <= _TOLERANCIA_MLE * beta
+        beta = np.where(valido, novo, 1.0)
+        if convergiu[valido].all():
+            break
+
+    soma_pesos = np.bincount(codigos, np.exp(-deslocados / beta[codigos]), minlength=n_grupos)
+    loc = minimo - beta * np.log(soma_pesos / np.where(com_jogos, n, 1))
+    return np.where(valido, loc, np.nan), np.where(valido, beta, np.nan)
+
+
+def _proporcoes_empiricas(valores, codigos, n_grupos, limiares):
+    # Estatísticas inteiras e não negativas (PTS, REB, AST): as contagens saem dos histogramas dos grupos
+    if valores.min() >= 0 and np.array_equal(valores, np.round(valores)):
+        return contagens_abaixo(histogramas_por_grupo(valores, codigos, n_grupos), limiares)
+
+    # Demais valores: conta, para cada grupo e limiar, os valores < limiar e <= limiar com uma única busca
+    # binária, com os valores ordenados por (grupo, valor) em uma chave composta grupo * largura + valor
+    menor = min(valores.min(), limiares.min())
+    largura = max(valores.max(), limiares.max()) - menor + 1
+    chaves = np.sort(codigos * largura + (valores - menor))
+    consultas = np.arange(n_grupos)[:, None] * largura + (limiares[None, :] - menor)
+    inicio = np.searchsorted(chaves, np.arange(n_grupos) * largura, side="left")[:, None]
+    menores = np.searchsorted(chaves, consultas, side="left") - inicio
+    menores_iguais = np.searchsorted(chaves, consultas, side="right") - inicio
+    return menores, menores_iguais
+
+
+def probabilidades_gumbel(jogos, limiares=LIMIARES_PADRAO, metricas=None, por=None, metodo="mle"):
+    """
+    Ajusta a distribuição de Gumbel em cada grupo e calcula as probabilidades de todos os limiares.
+
+    Args:
+        jogos (pd.DataFrame): Game logs, com uma coluna por métrica (ex.: 'PTS', 'REB', 'AST') ou no formato
+            longo, com as colunas 'metrica' e 'valor'.
+        limiares (array): Valores de X avaliados em todos os grupos (padrão: 0 a 60).
+        metricas (list, opcional): Métricas avaliadas (padrão: METRICAS presentes nos jogos).
+        por (list, opcional): Colunas que definem os grupos além da métrica (ex.: ['PLAYER_ID']).
+        metodo (str): 'mle' (padrão) ou 'momentos'.
+
+    Returns:
+        pd.DataFrame: Uma linha por grupo, métrica e limiar, com as colunas de `por`, 'metrica', 'limiar',
+        'jogos', 'loc', 'scale', 'prob_acima' e 'prob_abaixo' (Gumbel), 'prop_menor_igual' e
+        'prop_menor' (proporções observadas). Probabilidades e proporções vão de 0 a 1.
+    """
+    por = list(por or [])
+    limiares = np.atleast_1d(np.asarray(limiares, dtype=np.float64))
+    longo = _formato_longo(jogos, metricas, por)
+    colunas = por + ["metrica", "limiar", "jogos", "loc", "scale", "prob_acima", "prob_abaixo",
+                     "prop_menor_igual", "prop_menor"]
+    if longo.empty:
+        return pd.DataFrame(columns=colunas)
+
+    agrupado = longo.groupby(por + ["metrica"], sort=True, observed=True)
+    codigos = agrupado.ngroup().to_numpy()
+    grupos = agrupado.size()
+    n_grupos, n_limiares = len(grupos), len(limiares)
+    valores = longo["valor"].to_numpy()
+
+    with span("ajuste", "gumbel", grupos=n_grupos, limiares=n_limiares, metodo=metodo):
+        loc, scale = ajustar_gumbel(valores, codigos, n_grupos, metodo)
+
+    # CDF e SF de todos os grupos e limiares de uma vez (grupos x limiares)
+    with np.errstate(invalid="ignore"):
+        z = np.exp(-(limiares[None, :] - loc[:, None]) / scale[:, None])
+    prob_abaixo = np.exp(-z)
+    prob_acima = -np.expm1(-z)
+    menores, menores_iguais = _proporcoes_empiricas(valores, codigos, n_grupos, limiares)
+    n = grupos.to_numpy()[:, None]
+
+    tabela = grupos.index.to_frame(index=False).loc[np.repeat(np.arange(n_grupos), n_limiares)].reset_index(drop=True)
+    tabela["limiar"] = np.tile(limiares, n_grupos)
+    tabela["jogos"] = np.repeat(grupos.to_numpy(), n_limiares)
+    tabela["loc"] = np.repeat(loc, n_limiares)
+    tabela["scale"] = np.repeat(scale, n_limiares)
+    tabela["prob_acima"] = prob_acima.ravel()
+    tabela["prob_abaixo"] = prob_abaixo.ravel()
+    tabela["prop_menor_igual"] = (menores_iguais / n).ravel()
+    tabela["prop_menor"] = (menores / n).ravel()
+    return tabela[colunas]
@@ -0,0 +1,161 @@
+import numpy as np
+
+# Histogramas das estatísticas de box score (pontos, rebotes, assistências...), que são inteiros pequenos
+# e não negativos: a posição v do vetor de contagens guarda quantos jogos tiveram valor v. Modas e suas
+# ocorrências, proporções abaixo de um limiar, média e mediana saem do vetor sem percorrer os jogos de
+# novo, e dois histogramas (temporadas ou times diferentes) são unidos somando as contagens.
+
+
+def _inteiros(valores):
+    valores = np.asarray(valores)
+    if valores.size and (valores.min() < 0 or not np.array_equal(valores, np.round(valores))):
+        raise ValueError("O histograma aceita apenas valores inteiros não negativos.")
+    return valores.astype(np.int64)
+
+
+class Histograma:
+    """
+    Distribuição de uma estatística inteira e não negativa de um jogador, em contagens por valor.
+    """
+
+    def __init__(self, contagens=()):
+        self.contagens = np.asarray(contagens, dtype=np.int64)
+
+    @classmethod
+    def de_valores(cls, valores):
+        """Monta o histograma de uma sequência de valores com uma única chamada a np.bincount."""
+        return cls(np.bincount(_inteiros(valores)))
+
+    def __len__(self):
+        return int(self.contagens.sum())
+
+    def _valores(self):
+        return np.arange(len(self.contagens))
+
+    def adicionar(self, valor):
+        """Acrescenta o valor de um jogo."""
+        valor = int(_inteiros([valor])[0])
+        if valor >= len(self.contagens):
+            self.contagens = np.concatenate([self.contagens, np.zeros(valor + 1 - len(self.contagens), dtype=np.int64)])
+        self.contagens[valor] += 1
+
+    def unir(self, outro):
+        """Soma as contagens de outro histograma (ex.: de outra temporada)."""
+        tamanho = max(len(self.contagens), len(outro.contagens))
+        self.contagens = np.pad(self.contagens, (0, tamanho - len(self.contagens))) + \
+            np.pad(outro.contagens, (0, tamanho - len(outro.contagens)))
+        return self
+
+    @property
+    def soma(self):
+        return int(self.contagens @ self._valores())
+
+    @property
+    def soma2(self):
+        return int(self.contagens @ self._valores() ** 2)
+
+    @property
+    def media(self):
+        return self.soma / len(self) if len(self) else float("nan")
+
+    @property
+    def minimo(self):
+        return int(np.flatnonzero(self.contagens)[0])
+
+    @property
+    def maximo(self):
+        return int(np.flatnonzero(self.contagens)[-1])
+
+    def mediana(self):
+        """Retorna a mediana (média dos dois valores centrais com n par), como np.median."""
+        n = len(self)
+        if not n:
+            return float("nan")
+        acumulado = np.cumsum(self.contagens)
+        centrais = np.searchsorted(acumulado, [(n - 1) // 2 + 1, n // 2 + 1])
+        return centrais.mean() if n % 2 == 0 else float(centrais[0])
+
+    def modas(self):
+        """
+        Retorna as modas em ordem crescente e o número de ocorrências de cada uma.
+
+        Returns:
+            tuple: (modas, ocorrências), listas de inteiros.
+        """
+        if not len(self):
+            return [], []
+        maximo = self.contagens.max()
+        modas = np.flatnonzero(self.contagens == maximo)
+        return modas.tolist(), [int(maximo)] * len(modas)
+
+    def possui_moda(self):
+        """Indica se algum valor aparece mais vezes que outro (False quando todos têm a mesma frequência)."""
+        return len(np.unique(self.contagens[self.contagens > 0])) > 1
+
+    def proporcao_abaixo(self, x):
+        """Retorna a proporção de jogos com valor menor que x."""
+        return contagens_abaixo(self.contagens[None, :], [x])[0][0, 0] / len(self) if len(self) else float("nan")
+
+    def proporcao_menor_igual(self, x):
+        """Retorna a proporção de jogos com valor menor ou igual a x."""
+        return contagens_abaixo(self.contagens[None, :], [x])[1][0, 0] / len(self) if len(self) else float("nan")
+
+    def para_dict(self):
+        return {"contagens": self.contagens.tolist()}
+
+    @classmethod
+    def de_dict(cls, dados):
+        return cls(dados["contagens"])
+
+
+def histogramas_por_grupo(valores, codigos, n_grupos):
+    """
+    Monta os histogramas de vários grupos de uma vez.
+
+    Args:
+        valores (np.ndarray): Valores inteiros e não negativos de todos os grupos.
+        codigos (np.ndarray): Código do grupo (0 a n_grupos - 1) de cada valor.
+        n_grupos (int): Quantidade de grupos.
+
+    Returns:
+        np.ndarray: Matriz (grupos x valores) com as contagens.
+    """
+    valores = _inteiros(valores)
+    largura = int(valores.max()) + 1 if valores.size else 1
+    return np.bincount(np.asarray(codigos) * largura + valores, minlength=n_grupos * largura).reshape(n_grupos, largura)
+
+
+def contagens_abaixo(histogramas, limiares):
+    """
+    Conta, em cada histograma, os valores menores e os menores ou iguais a cada limiar.
+
+    Args:
+        histogramas (np.ndarray): Matriz (grupos x valores) de histogramas_por_grupo().
+        limiares (array): Limiares avaliados (podem ser fracionários).
+
+    Returns:
+        tuple: (menores, menores_iguais), matrizes (grupos x limiares).
+    """
+    limiares = np.asarray(limiares, dtype=np.float64)
+    # Contagens acumuladas com um zero na frente: acumulado[:, k] é o número de valores menores que k
+    acumulado = np.concatenate([np.zeros((len(histogramas), 1), dtype=np.int64), np.cumsum(histogramas, axis=1)], axis=1)
+    largura = histogramas.shape[1]
+    menores = acumulado[:, np.clip(np.ceil(limiares), 0, largura).astype(np.int64)]
+    menores_iguais = acumulado[:, np.clip(np.floor(limiares) + 1, 0, largura).astype(np.int64)]
+    return menores, menores_iguais
+
+
+def menores_por_grupo(histogramas, limiares):
+    """
+    Conta, em cada histograma, os valores menores que o limiar do próprio grupo.
+
+    Args:
+        histogramas (np.ndarray): Matriz (grupos x valores) de histogramas_por_grupo().
+        limiares (array): Um limiar por grupo (pode ser fracionário).
+
+    Returns:
+        np.ndarray: Quantidade de valores menores que o limiar, por grupo.
+    """
+    acumulado = np.concatenate([np.zeros((len(histogramas), 1), dtype=np.int64), np.cumsum(histogramas, axis=1)], axis=1)
+    indices = np.clip(np.ceil(np.asarray(limiares, dtype=np.float64)), 0, histogramas.shape[1]).astype(np.int64)
+    return acumulado[np.arange(len(histogramas)), indices]
@@ -0,0 +1,371 @@
+import os
+import json
+import heapq
+import threading
+from collections import Counter
+
+import numpy as np
+
+# Estimadores de quantis atualizados jogo a jogo, um por jogador e métrica.
+# Até LIMITE_EXATO jogos, a mediana é exata e mantida em duas pilhas (heaps): a de baixo com a metade
+# menor dos valores e a de cima com a metade maior, então cada jogo novo custa O(log n) e a mediana e a
+# porcentagem de jogos abaixo dela são lidas em O(1). Acima do limite (ex.: várias temporadas unidas),
+# os valores são resumidos em um t-digest, com memória limitada e quantis aproximados.
+# Os estimadores podem ser unidos (temporadas ou times diferentes) e salvos em JSON.
+
+# Número de valores até o qual os quantis são exatos
+LIMITE_EXATO = int(os.getenv("NBA_QUANTIS_LIMITE_EXATO", "1000"))
+
+# Compressão do t-digest: mais centróides, quantis mais precisos
+COMPRESSAO = int(os.getenv("NBA_QUANTIS_COMPRESSAO", "100"))
+
+_BUFFER_TDIGEST = 500
+
+
+class MedianaDuasPilhas:
+    """
+    Mediana exata de uma sequência de valores, atualizada em O(log n) a cada valor.
+
+    A pilha de baixo (max-heap, guardada com o sinal trocado) tem a metade menor dos valores e, com n
+    ímpar, um valor a mais; a de cima (min-heap) tem a metade maior. A mediana está no topo das pilhas.
+    """
+
+    def __init__(self, valores=()):
+        self._baixo = []
+        self._alto = []
+        # Ocorrências de cada valor na pilha de baixo, para contar os valores menores que a mediana
+        self._contagem_baixo = Counter()
+        for valor in valores:
+            self.adicionar(valor)
+
+    def __len__(self):
+        return len(self._baixo) + len(self._alto)
+
+    def adicionar(self, valor):
+        """Acrescenta um valor."""
+        if not self._baixo or valor <= -self._baixo[0]:
+            heapq.heappush(self._baixo, -valor)
+            self._contagem_baixo[valor] += 1
+        else:
+            heapq.heappush(self._alto, valor)
+
+        if len(self._baixo) > len(self._alto) + 1:
+            movido = -heapq.heappop(self._baixo)
+            self._contagem_baixo[movido] -= 1
+            heapq.heappush(self._alto, movido)
+        elif len(self._alto) > len(self._baixo):
+            movido = heapq.heappop(self._alto)
+            heapq.heappush(self._baixo, -movido)
+            self._contagem_baixo[movido] += 1
+
+    def mediana(self):
+        """Retorna a mediana (média dos dois valores centrais com n par), ou NaN sem valores."""
+        if not self._baixo:
+            return float("nan")
+        if len(self._baixo) > len(self._alto):
+            return -self._baixo[0]
+        return (-self._baixo[0] + self._alto[0]) / 2
+
+    def menores_que_mediana(self):
+        """Retorna quantos valores são menores que a mediana."""
+        # Nenhum valor da pilha de cima é menor que a mediana, e os da pilha de baixo são todos menores
+        # ou iguais a ela
+        return len(self._baixo) - self._contagem_baixo.get(self.mediana(), 0) if self._baixo else 0
+
+    def valores(self):
+        """Retorna os valores em ordem crescente."""
+        return sorted([-valor for valor in self._baixo] + self._alto)
+
+    def para_dict(self):
+        # As pilhas são salvas como estão (listas já na ordem de heap), para serem lidas sem reordenar
+        return {"baixo": list(self._baixo), "alto": list(self._alto)}
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Restaura as pilhas salvas por para_dict() em O(n), sem inserir os valores de novo."""
+        pilhas = cls()
+        pilhas._baixo, pilhas._alto = list(dados["baixo"]), list(dados["alto"])
+        pilhas._contagem_baixo = Counter(-valor for valor in pilhas._baixo)
+        return pilhas
+
+
+def _limite_escala(q, compressao):
+    # Escala k1 do t-digest: k(q) = δ/(2π)·asen(2q - 1). Um centróide iniciado no quantil q pode crescer
+    # até o quantil em que k aumenta 1, o que deixa os centróides menores nas caudas
+    k = compressao / (2 * np.pi) * np.arcsin(2 * q - 1) + 1
+    return (np.sin(min(k, compressao / 4) * 2 * np.pi / compressao) + 1) / 2
+
+
+class TDigest:
+    """
+    Resumo de uma distribuição em centróides (média e peso), no formato t-digest.
+
+    Os valores novos ficam em um buffer e são incorporados aos centróides em lote. Dois resumos são
+    unidos juntando os centróides e comprimindo de novo.
+    """
+
+    def __init__(self, compressao=None):
+        self.compressao = compressao or COMPRESSAO
+        self._medias = np.empty(0)
+        self._pesos = np.empty(0)
+        self._buffer = []
+        self.minimo = float("inf")
+        self.maximo = float("-inf")
+
+    def __len__(self):
+        return int(self._pesos.sum()) + len(self._buffer)
+
+    def adicionar(self, valor):
+        """Acrescenta um valor."""
+        self._buffer.append(float(valor))
+        self.minimo = min(self.minimo, valor)
+        self.maximo = max(self.maximo, valor)
+        if len(self._buffer) >= _BUFFER_TDIGEST:
+            self._comprimir()
+
+    def unir(self, outro):
+        """Incorpora os centróides de outro t-digest."""
+        outro._comprimir()
+        self._comprimir(outro._medias, outro._pesos)
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+
+    def _comprimir(self, medias=(), pesos=()):
+        medias = np.concatenate([self._medias, self._buffer, np.asarray(medias, dtype=np.float64)])
+        pesos = np.concatenate([self._pesos, np.ones(len(self._buffer)), np.asarray(pesos, dtype=np.float64)])
+        self._buffer = []
+        if len(medias) == 0:
+            return
+        ordem = np.argsort(medias, kind="stable")
+        medias, pesos = medias[ordem], pesos[ordem]
+
+        total = pesos.sum()
+        novas_medias, novos_pesos = [medias[0]], [pesos[0]]
+        acumulado = 0.0
+        limite = _limite_escala(0.0, self.compressao)
+        for media, peso in zip(medias[1:], pesos[1:]):
+            if (acumulado + novos_pesos[-1] + peso) / total <= limite:
+                novos_pesos[-1] += peso
+                novas_medias[-1] += (media - novas_medias[-1]) * peso / novos_pesos[-1]
+            else:
+                acumulado += novos_pesos[-1]
+                limite = _limite_escala(acumulado / total, self.compressao)
+                novas_medias.append(media)
+                novos_pesos.append(peso)
+        self._medias, self._pesos = np.array(novas_medias), np.array(novos_pesos)
+
+    def _pontos(self):
+        # Posição (em número de valores) do centro de cada centróide, com o mínimo e o máximo nas pontas
+        self._comprimir()
+        centros = np.cumsum(self._pesos) - self._pesos / 2
+        return (np.concatenate([[self.minimo], self._medias, [self.maximo]]),
+                np.concatenate([[0.0], centros, [self._pesos.sum()]]))
+
+    def quantil(self, q):
+        """Retorna o quantil q (0 a 1), interpolado entre os centros dos centróides."""
+        if len(self) == 0:
+            return float("nan")
+        valores, posicoes = self._pontos()
+        return float(np.interp(q * posicoes[-1], posicoes, valores))
+
+    def proporcao_abaixo(self, x):
+        """Retorna a proporção aproximada de valores menores que x."""
+        if len(self) == 0:
+            return float("nan")
+        valores, posicoes = self._pontos()
+        abaixo = np.interp(x, valores, posicoes, left=0.0, right=posicoes[-1])
+        # Um centróide com média igual a x reúne valores iguais a x, que não contam como menores
+        abaixo -= self._pesos[self._medias == x].sum() / 2
+        return float(max(abaixo, 0.0) / posicoes[-1])
+
+    def para_dict(self):
+        self._comprimir()
+        return {"compressao": self.compressao, "medias": self._medias.tolist(), "pesos": self._pesos.tolist(),
+                "minimo": self.minimo, "maximo": self.maximo}
+
+    @classmethod
+    def de_dict(cls, dados):
+        digest = cls(dados["compressao"])
+        digest._medias = np.array(dados["medias"], dtype=np.float64)
+        digest._pesos = np.array(dados["pesos"], dtype=np.float64)
+        digest.minimo, digest.maximo = dados["minimo"], dados["maximo"]
+        return digest
+
+
+class EstimadorQuantis:
+    """
+    Mediana e quantis de um jogador e métrica, atualizados a cada jogo novo.
+
+    Começa exato (MedianaDuasPilhas) e passa a um TDigest quando o número de valores ultrapassa
+    `limite_exato`. Guarda também a soma e a soma dos quadrados dos valores, que permitem conferir se
+    os jogos já incorporados continuam iguais aos da tabela de agregados.
+    """
+
+    def __init__(self, limite_exato=None, compressao=None):
+        self.limite_exato = limite_exato or LIMITE_EXATO
+        self.compressao = compressao or COMPRESSAO
+        self.exato = MedianaDuasPilhas()
+        self.digest = None
+        self.soma = 0.0
+        self.soma2 = 0.0
+
+    def __len__(self):
+        return len(self.exato) if self.digest is None else len(self.digest)
+
+    def _resumir(self):
+        # Passa os valores exatos para um t-digest quando o limite é ultrapassado
+        if self.digest is None and len(self.exato) > self.limite_exato:
+            self.digest = TDigest(self.compressao)
+            for valor in self.exato.valores():
+                self.digest.adicionar(valor)
+            self.exato = None
+
+    def adicionar(self, valor):
+        """Acrescenta o valor de um jogo."""
+        (self.exato if self.digest is None else self.digest).adicionar(valor)
+        self.soma += valor
+        self.soma2 += valor * valor
+        self._resumir()
+
+    def mediana(self):
+        """Retorna a mediana: exata até o limite, aproximada pelo t-digest acima dele."""
+        return float(self.exato.mediana()) if self.digest is None else self.digest.quantil(0.5)
+
+    def quantil(self, q):
+        """Retorna o quantil q (0 a 1), com interpolação linear como np.quantile."""
+        if self.digest is not None:
+            return self.digest.quantil(q)
+        return float(np.quantile(self.exato.valores(), q)) if len(self.exato) else float("nan")
+
+    def proporcao_abaixo(self, x):
+        """Retorna a proporção de jogos com valor menor que x."""
+        if self.digest is not None:
+            return self.digest.proporcao_abaixo(x)
+        valores = self.exato.valores()
+        return float(np.searchsorted(valores, x, side="left") / len(valores)) if valores else float("nan")
+
+    def proporcao_abaixo_mediana(self):
+        """Retorna a proporção de jogos com valor menor que a mediana."""
+        if self.digest is not None:
+            return self.digest.proporcao_abaixo(self.digest.quantil(0.5))
+        return self.exato.menores_que_mediana() / len(self.exato) if len(self.exato) else float("nan")
+
+    def unir(self, outro):
+        """Incorpora os valores de outro estimador (ex.: de outra temporada ou de outro time)."""
+        if self.digest is None and outro.digest is None:
+            for valor in outro.exato.valores():
+                self.exato.adicionar(valor)
+        else:
+            if self.digest is None:
+                self.digest = TDigest(self.compressao)
+                for valor in self.exato.valores():
+                    self.digest.adicionar(valor)
+                self.exato = None
+            if outro.digest is None:
+                for valor in outro.exato.valores():
+                    self.digest.adicionar(valor)
+            else:
+                self.digest.unir(TDigest.de_dict(outro.digest.para_dict()))
+        self.soma += outro.soma
+        self.soma2 += outro.soma2
+        self._resumir()
+        return self
+
+    def para_dict(self):
+        dados = {"limite_exato": self.limite_exato, "compressao": self.compressao, "soma": self.soma, "soma2": self.soma2}
+        if self.digest is None:
+            dados["pilhas"] = self.exato.para_dict()
+        else:
+            dados["digest"] = self.digest.para_dict()
+        return dados
+
+    @classmethod
+    def de_dict(cls, dados):
+        estimador = cls(dados["limite_exato"], dados["compressao"])
+        if "digest" in dados:
+            estimador.exato = None
+            estimador.digest = TDigest.de_dict(dados["digest"])
+        elif "pilhas" in dados:
+            estimador.exato = MedianaDuasPilhas.de_dict(dados["pilhas"])
+        else:
+            # Formato anterior, com os valores em ordem: refaz as pilhas
+            estimador.exato = MedianaDuasPilhas(dados["valores"])
+        estimador.soma, estimador.soma2 = dados["soma"], dados["soma2"]
+        return estimador
+
+
+def atualizar_estimadores(por_jogo, metricas, estimadores=None, por="PLAYER_ID", classe=None):
+    """
+    Atualiza os estimadores de cada jogador e métrica com os jogos novos da tabela de agregados.
+
+    Um estimador com n jogos recebe só as linhas com 'jogos_acum' maior que n. Se a soma e a soma dos
+    quadrados acumuladas até o n-ésimo jogo não conferem com as do estimador (jogo corrigido ou
+    removido), ele é refeito com todos os jogos do jogador.
+
+    Args:
+        por_jogo (pd.DataFrame): Tabela de acumular_jogos(), em ordem cronológica por jogador.
+        metricas (tuple): Métricas acompanhadas.
+        estimadores (dict, opcional): (jogador, métrica) -> EstimadorQuantis de uma atualização anterior.
+        por (str): Coluna que identifica o jogador (padrão: 'PLAYER_ID').
+        classe (type, opcional): Classe dos estimadores novos (padrão: EstimadorQuantis). Qualquer classe
+            com adicionar(), len(), soma e soma2 serve, como o Histograma de src/analytics/histogramas.py.
+
+    Returns:
+        tuple: (estimadores, alterado). Os jogadores que não estão em `por_jogo` são mantidos.
+    """
+    classe = classe or EstimadorQuantis
+    estimadores = dict(estimadores or {})
+    alterado = False
+    for jogador, jogos in por_jogo.groupby(por, sort=False):
+        jogador = int(jogador)
+        n_acum = jogos["jogos_acum"].to_numpy()
+        for metrica in metricas:
+            estimador = estimadores.get((jogador, metrica))
+            n = len(estimador) if estimador is not None else 0
+            if n:
+                linha = jogos[n_acum == n]
+                confere = len(linha) == 1 and np.isclose(linha[f"{metrica}_soma_acum"].iloc[0], estimador.soma) \
+                    and np.isclose(linha[f"{metrica}_soma2_acum"].iloc[0], estimador.soma2)
+                if not confere:
+                    estimador, n = None, 0
+            if estimador is not None and n == n_acum.max():
+                continue
+            if estimador is None:
+                estimador = classe()
+            for valor in jogos.loc[n_acum > n, metrica].to_numpy():
+                estimador.adicionar(valor.item())
+            estimadores[(jogador, metrica)] = estimador
+            alterado = True
+    return estimadores, alterado
+
+
+def carregar_estimadores(caminho, classe=None):
+    """
+    Lê os estimadores salvos por salvar_estimadores() (dicionário vazio se o arquivo não existir).
+
+    `classe` é a classe dos estimadores salvos (padrão: EstimadorQuantis).
+    """
+    classe = classe or EstimadorQuantis
+    if not os.path.exists(caminho):
+        return {}
+    try:
+        with open(caminho, encoding="utf-8") as f:
+            dados = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Estimadores em {caminho} não puderam ser lidos e serão refeitos: {e}")
+        return {}
+    estimadores = {}
+    for chave, estimador in dados.items():
+        jogador, metrica = chave.split(":", 1)
+        estimadores[(int(jogador), metrica)] = classe.de_dict(estimador)
+    return estimadores
+
+
+def salvar_estimadores(estimadores, caminho):
+    """Grava os estimadores em JSON, com a chave '<jogador>:<métrica>'."""
+    dados = {f"{jogador}:{metrica}": estimador.para_dict() for (jogador, metrica), estimador in estimadores.items()}
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(dados, f)
+    os.replace(caminho_tmp, caminho)
@@ -0,0 +1,123 @@
+from functools import cached_property
+
+import numpy as np
+
+from src.analytics.histogramas import Histograma
+
+# Resumo de uma distribuição (média, mediana, modas, mínimo, máximo, desvio e proporções abaixo de um
+# valor) usado pelas estatísticas descritivas da Parte 2 e pelos valores de referência da Parte 3.
+# Cada campo é calculado só quando lido, uma única vez. Valores inteiros e não negativos (PTS, REB, AST
+# de um jogo) são resumidos em um Histograma; os demais (médias por jogo da temporada, por exemplo), em
+# um vetor ordenado. Os resumos dos game logs não são recalculados a cada etapa: saem dos histogramas
+# salvos com os agregados (resumos_distribuicao() em src/analytics/agregados.py).
+
+# Maior valor resumido em histograma; acima disso o vetor ordenado ocupa menos memória
+_MAXIMO_HISTOGRAMA = 10_000
+
+
+class ResumoDistribuicao:
+    """
+    Resumo de uma amostra, com os campos calculados sob demanda.
+
+    Args:
+        valores (array, opcional): Valores da amostra.
+        histograma (Histograma, opcional): Histograma já montado (ex.: o salvo com os agregados), usado
+            no lugar dos valores.
+    """
+
+    def __init__(self, valores=None, histograma=None):
+        self._valores = None if valores is None else np.array(valores)
+        self._histograma = histograma
+
+    @cached_property
+    def histograma(self):
+        """Histograma dos valores, ou None se não forem inteiros não negativos."""
+        if self._histograma is not None:
+            return self._histograma
+        valores = self._valores
+        if valores.size and valores.min() >= 0 and valores.max() <= _MAXIMO_HISTOGRAMA \
+                and np.array_equal(valores, np.round(valores)):
+            return Histograma.de_valores(valores)
+        return None
+
+    @cached_property
+    def _ordenados(self):
+        return np.sort(self._valores)
+
+    @cached_property
+    def _unicos(self):
+        # Valores distintos e suas ocorrências (sem histograma)
+        return np.unique(self._ordenados, return_counts=True)
+
+    @cached_property
+    def n(self):
+        return len(self.histograma) if self.histograma is not None else len(self._valores)
+
+    @cached_property
+    def media(self):
+        if self.histograma is not None:
+            return self.histograma.media
+        return float(self._valores.sum() / self.n) if self.n else float("nan")
+
+    @cached_property
+    def mediana(self):
+        if self.histograma is not None:
+            return self.histograma.mediana()
+        return float(np.median(self._ordenados)) if self.n else float("nan")
+
+    @cached_property
+    def desvio(self):
+        """Desvio padrão amostral (ddof=1)."""
+        if self.n < 2:
+            return float("nan")
+        if self.histograma is not None:
+            # Somas inteiras: a variância sai sem o cancelamento de soma2 - soma·média em ponto flutuante
+            soma, soma2 = self.histograma.soma, self.histograma.soma2
+            return float(np.sqrt((self.n * soma2 - soma * soma) / (self.n * (self.n - 1))))
+        return float(np.std(self._valores, ddof=1))
+
+    @cached_property
+    def minimo(self):
+        return self.histograma.minimo if self.histograma is not None else self._ordenados[0]
+
+    @cached_property
+    def maximo(self):
+        return self.histograma.maximo if self.histograma is not None else self._ordenados[-1]
+
+    @cached_property
+    def _modas(self):
+        if self.histograma is not None:
+            return self.histograma.modas()
+        valores, contagens = self._unicos
+        if not len(contagens):
+            return [], []
+        maximo = contagens.max()
+        return valores[contagens == maximo].tolist(), contagens[contagens == maximo].tolist()
+
+    @property
+    def modas(self):
+        """Modas em ordem crescente."""
+        return self._modas[0]
+
+    @property
+    def ocorrencias_moda(self):
+        """Ocorrências de cada moda."""
+        return self._modas[1]
+
+    @property
+    def moda(self):
+        """Menor moda (como pd.Series.mode().iloc[0] e scipy.stats.mode), ou NaN sem valores."""
+        return self.modas[0] if self.modas else float("nan")
+
+    @cached_property
+    def possui_moda(self):
+        """False quando todos os valores aparecem o mesmo número de vezes."""
+        if self.histograma is not None:
+            return self.histograma.possui_moda()
+        return len(np.unique(self._unicos[1])) > 1
+
+    def proporcao_abaixo(self, x):
+        """Proporção de valores menores que x."""
+        if self.histograma is not None:
+            return self.histograma.proporcao_abaixo(x)
+        return np.searchsorted(self._ordenados, x, side="left") / self.n if self.n else float("nan")
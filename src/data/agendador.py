@@ -0,0 +1,186 @@
+import os
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.data.transporte_gravado import RespostaNaoGravada
+from src.utils.travas import travar_arquivo
+
+# Taxa máxima de requisições por segundo aceita pela API (NBA_API_TAXA no .env)
+TAXA_PADRAO = float(os.getenv("NBA_API_TAXA", "2.0"))
+
+# Quantidade de requisições que podem sair de uma vez após um período ocioso
+RAJADA_PADRAO = int(os.getenv("NBA_API_RAJADA", "3"))
+
+# Tamanho do pool de threads usado para as requisições concorrentes
+WORKERS_PADRAO = int(os.getenv("NBA_API_WORKERS", "4"))
+
+# Número máximo de tentativas por requisição e base do backoff exponencial (em segundos)
+TENTATIVAS_PADRAO = int(os.getenv("NBA_API_TENTATIVAS", "4"))
+BACKOFF_BASE = 1.0
+BACKOFF_MAXIMO = 30.0
+
+# Limite de requisições simultâneas por endpoint (endpoints pesados da liga inteira ficam em série)
+LIMITES_POR_ENDPOINT = {
+    "leaguegamelog": 1,
+    "leaguedashplayerstats": 1,
+    "leaguestandingsv3": 1,
+}
+
+# Taxa (requisições por segundo) de outros sites consultados por raspagem, cada um com o seu próprio
+# agendador. O Basketball Reference bloqueia por uma hora quem passa de 20 requisições por minuto.
+TAXAS_POR_HOST = {
+    "www.basketball-reference.com": float(os.getenv("NBA_BREF_TAXA", "0.3")),
+}
+
+# Diretório com o estado dos limitadores por host, compartilhado pelos processos do pipeline
+AGENDADOR_DIR = os.getenv("NBA_AGENDADOR_DIR", "data/cache/agendador")
+
+
+class BaldeDeTokens:
+    """
+    Limitador de taxa no formato token bucket.
+
+    O balde recebe `taxa` tokens por segundo até o limite de `capacidade`; cada requisição consome um
+    token e espera quando o balde está vazio.
+    """
+
+    def __init__(self, taxa, capacidade):
+        self.taxa = taxa
+        self.capacidade = capacidade
+        self._tokens = float(capacidade)
+        self._ultima_recarga = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _recarregar(self):
+        agora = time.monotonic()
+        self._tokens = min(self.capacidade, self._tokens + (agora - self._ultima_recarga) * self.taxa)
+        self._ultima_recarga = agora
+
+    def consumir(self):
+        """Bloqueia até que um token esteja disponível e o consome."""
+        while True:
+            with self._lock:
+                self._recarregar()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                espera = (1 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+
+class IntervaloEntreProcessos:
+    """
+    Limitador de taxa compartilhado por todos os processos que usam o mesmo arquivo de estado.
+
+    O arquivo guarda o horário liberado para a próxima requisição. Cada chamada reserva esse horário sob
+    uma trava de arquivo, adianta-o em 1/taxa segundos e espera fora da trava até a sua vez. Usado para
+    os sites raspados, em que as etapas dos times (em processos separados) somam as suas requisições.
+    """
+
+    def __init__(self, taxa, caminho):
+        self.taxa = taxa
+        self.caminho = caminho
+
+    def consumir(self):
+        """Bloqueia até a vez desta requisição."""
+        with travar_arquivo(f"{self.caminho}.lock"):
+            try:
+                with open(self.caminho, encoding="utf-8") as f:
+                    proximo = float(f.read() or 0)
+            except (OSError, ValueError):
+                proximo = 0.0
+            agora = time.time()
+            vez = max(agora, proximo)
+            with open(self.caminho, "w", encoding="utf-8") as f:
+                f.write(repr(vez + 1 / self.taxa))
+        time.sleep(vez - agora)
+
+
+class Agendador:
+    """
+    Agendador central das requisições à API.
+
+    Toda requisição passa pelo balde de tokens, respeita o limite de concorrência do endpoint e é
+    repetida com backoff exponencial e jitter em caso de falha. O método submeter() executa a chamada
+    em um pool de threads limitado, permitindo buscar vários recursos em paralelo.
+    """
+
+    def __init__(self, taxa=None, rajada=None, workers=None, tentativas=None, balde=None):
+        self.balde = balde or BaldeDeTokens(taxa or TAXA_PADRAO, rajada or RAJADA_PADRAO)
+        self.workers = workers or WORKERS_PADRAO
+        self.tentativas = tentativas or TENTATIVAS_PADRAO
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="nba_api")
+        self._semaforos = {}
+        self._lock = threading.Lock()
+
+    def _semaforo(self, nome_endpoint):
+        with self._lock:
+            if nome_endpoint not in self._semaforos:
+                limite = LIMITES_POR_ENDPOINT.get(nome_endpoint, self.workers)
+                self._semaforos[nome_endpoint] = threading.BoundedSemaphore(limite)
+            return self._semaforos[nome_endpoint]
+
+    def executar(self, nome_endpoint, funcao, *args, **kwargs):
+        """
+        Executa uma requisição na thread atual, respeitando a taxa, o limite do endpoint e as tentativas.
+
+        Args:
+            nome_endpoint (str): Nome do endpoint (usado para o limite de concorrência).
+            funcao (callable): Função que realiza a requisição.
+
+        Returns:
+            Any: Retorno de `funcao`.
+        """
+        for tentativa in range(1, self.tentativas + 1):
+            with self._semaforo(nome_endpoint):
+                self.balde.consumir()
+                try:
+                    return funcao(*args, **kwargs)
+                except Exception as e:
+                    # Sem resposta gravada, repetir a requisição na reprodução não adianta
+                    if tentativa == self.tentativas or isinstance(e, RespostaNaoGravada):
+                        raise
+                    erro = e
+
+            # Backoff exponencial com "full jitter": espera aleatória entre 0 e base * 2^tentativa
+            espera = random.uniform(0, min(BACKOFF_MAXIMO, BACKOFF_BASE * 2 ** tentativa))
+            print(f"Falha na requisição ao endpoint {nome_endpoint} ({erro}). "
+                  f"Nova tentativa em {espera:.1f}s ({tentativa}/{self.tentativas}).")
+            time.sleep(espera)
+
+    def submeter(self, funcao, *args, **kwargs):
+        """
+        Agenda uma função no pool de threads.
+
+        A função submetida deve fazer suas requisições por executar() (como consultar_endpoint faz),
+        para que a taxa e as tentativas continuem valendo.
+
+        Returns:
+            concurrent.futures.Future: Resultado futuro da chamada.
+        """
+        return self._pool.submit(funcao, *args, **kwargs)
+
+
+_agendadores = {}
+_agendador_lock = threading.Lock()
+
+
+def obter_agendador(host=None):
+    """
+    Retorna o agendador compartilhado pelo processo, criando-o na primeira chamada.
+
+    Args:
+        host (str, opcional): Site consultado fora da API da NBA (ex.: 'www.basketball-reference.com').
+            Cada host tem o seu agendador, com a taxa de TAXAS_POR_HOST valendo para todos os processos
+            somados (IntervaloEntreProcessos).
+    """
+    with _agendador_lock:
+        if host not in _agendadores:
+            if host is None:
+                _agendadores[host] = Agendador()
+            else:
+                balde = IntervaloEntreProcessos(TAXAS_POR_HOST.get(host, TAXA_PADRAO), os.path.join(AGENDADOR_DIR, host))
+                _agendadores[host] = Agendador(balde=balde)
+        return _agendadores[host]
@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import hashlib
+from datetime import datetime
+
+from nba_api.stats.library.http import NBAStatsResponse
+
+from src.data.agendador import obter_agendador
+from src.utils.instrumentacao import span
+
+# Diretório padrão do cache em disco (pode ser alterado pela variável de ambiente NBA_CACHE_DIR)
+CACHE_DIR = os.getenv("NBA_CACHE_DIR", "data/cache/api")
+
+# TTL (em segundos) das respostas da temporada atual. Respostas gravadas depois do fim da temporada nunca expiram.
+TTL_TEMPORADA_ATUAL = 6 * 60 * 60
+
+# TTL específico por endpoint (nome do endpoint em minúsculas). None = nunca expira.
+TTL_POR_ENDPOINT = {
+    "leaguestandingsv3": 60 * 60,
+    "commonteamroster": 24 * 60 * 60,
+    "commonplayerinfo": 7 * 24 * 60 * 60,
+    "playercareerstats": 24 * 60 * 60,
+    "boxscoretraditionalv2": None,
+}
+
+# Parâmetros que identificam a temporada nos endpoints da nba_api
+_PARAMETROS_TEMPORADA = ("Season", "SeasonYear")
+
+# Parâmetros da requisição registrados nos spans de busca (ver src/utils/instrumentacao.py)
+_PARAMETROS_SPAN = {"Season": "season", "PlayerID": "player_id", "TeamID": "team_id"}
+
+
+def temporada_atual(data=None):
+    """
+    Retorna a temporada corrente da NBA no formato 'YYYY-YY'.
+
+    A temporada começa em outubro; antes disso, a temporada corrente é a que começou no ano anterior.
+
+    Args:
+        data (datetime, opcional): Data de referência (padrão: agora).
+
+    Returns:
+        str: Temporada no formato 'YYYY-YY'.
+    """
+    data = data or datetime.now()
+    ano_inicio = data.year if data.month >= 10 else data.year - 1
+    return f"{ano_inicio}-{str(ano_inicio + 1)[-2:]}"
+
+
+def fim_da_temporada(temporada):
+    """
+    Retorna o instante em que a temporada deixa de ser a corrente (1º de outubro do ano seguinte ao início).
+
+    Args:
+        temporada (str): Temporada no formato 'YYYY-YY'.
+
+    Returns:
+        float: Timestamp do fim da temporada.
+    """
+    return datetime(int(temporada[:4]) + 1, 10, 1).timestamp()
+
+
+def calcular_ttl(nome_endpoint, parametros, criado_em=None):
+    """
+    Define por quanto tempo uma resposta em cache continua válida.
+
+    Args:
+        nome_endpoint (str): Nome do endpoint da nba_api (ex.: 'playergamelog').
+        parametros (dict): Parâmetros completos da requisição.
+        criado_em (float, opcional): Quando a resposta foi gravada (timestamp; padrão: agora). Só as
+            respostas gravadas depois do fim da temporada são definitivas; uma gravada no meio dela
+            continua expirando depois da virada, até ser buscada de novo.
+
+    Returns:
+        float | None: TTL em segundos, ou None se a resposta nunca expira.
+    """
+    temporada = next((parametros[p] for p in _PARAMETROS_TEMPORADA if parametros.get(p)), None)
+
+    # Temporadas encerradas não mudam mais, desde que os dados tenham sido obtidos depois do encerramento
+    criado_em = time.time() if criado_em is None else criado_em
+    if temporada is not None and criado_em >= fim_da_temporada(temporada):
+        return None
+
+    if nome_endpoint in TTL_POR_ENDPOINT:
+        return TTL_POR_ENDPOINT[nome_endpoint]
+
+    return TTL_TEMPORADA_ATUAL
+
+
+def chave_cache(nome_endpoint, parametros):
+    """
+    Gera a chave do cache a partir do endpoint e dos parâmetros da requisição.
+
+    Args:
+        nome_endpoint (str): Nome do endpoint da nba_api.
+        parametros (dict): Parâmetros completos da requisição.
+
+    Returns:
+        str: Hash SHA-256 que identifica a requisição.
+    """
+    conteudo = json.dumps({"endpoint": nome_endpoint, "parametros": parametros}, sort_keys=True, default=str)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def _caminho_cache(nome_endpoint, chave, cache_dir):
+    return os.path.join(cache_dir, nome_endpoint, f"{chave}.json")
+
+
+def _ler_cache(caminho, nome_endpoint, parametros, ttl=None):
+    if not os.path.exists(caminho):
+        return None
+
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            registro = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Cache corrompido em {caminho}, ignorando: {e}")
+        return None
+
+    # A validade depende de quando a resposta foi gravada (antes ou depois do fim da temporada)
+    ttl = ttl if ttl is not None else calcular_ttl(nome_endpoint, parametros, registro["criado_em"])
+    if ttl is not None and time.time() - registro["criado_em"] > ttl:
+        return None
+
+    return registro
+
+
+def _gravar_cache(caminho, registro):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+
+    # Grava em arquivo temporário e substitui, para que leitores concorrentes nunca vejam um JSON parcial
+    caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(registro, f)
+    os.replace(caminho_tmp, caminho)
+
+
+def consultar_endpoint(endpoint, cache_dir=None, ttl=None, **kwargs):
+    """
+    Executa um endpoint da nba_api passando pelo cache em disco.
+
+    O endpoint é instanciado sem requisição; se houver uma resposta válida em cache para o mesmo
+    endpoint e parâmetros ela é carregada, caso contrário a requisição é feita e armazenada.
+    O objeto retornado é o próprio endpoint, então get_data_frames() e get_dict() continuam funcionando.
+
+    Args:
+        endpoint (type): Classe do endpoint (ex.: playergamelog.PlayerGameLog).
+        cache_dir (str, opcional): Diretório do cache (padrão: CACHE_DIR).
+        ttl (float, opcional): TTL em segundos para esta chamada, sobrepondo a regra padrão.
+        **kwargs: Parâmetros repassados ao construtor do endpoint.
+
+    Returns:
+        Endpoint: Instância do endpoint com a resposta carregada.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    instancia = endpoint(**kwargs, get_request=False)
+    nome_endpoint = instancia.endpoint
+    parametros = instancia.parameters
+
+    chave = chave_cache(nome_endpoint, parametros)
+    caminho = _caminho_cache(nome_endpoint, chave, cache_dir)
+
+    atributos = {nome: parametros[p] for p, nome in _PARAMETROS_SPAN.items() if parametros.get(p)}
+    registro = _ler_cache(caminho, nome_endpoint, parametros, ttl)
+    if registro is not None:
+        with span("busca", nome_endpoint, origem="cache", **atributos):
+            instancia.nba_response = NBAStatsResponse(
+                response=registro["resposta"], status_code=200, url=registro["url"]
+            )
+            instancia.load_response()
+        return instancia
+
+    with span("busca", nome_endpoint, origem="api", **atributos):
+        obter_agendador().executar(nome_endpoint, instancia.get_request)
+
+    _gravar_cache(caminho, {
+        "endpoint": nome_endpoint,
+        "parametros": parametros,
+        "url": instancia.nba_response.get_url(),
+        "criado_em": time.time(),
+        "resposta": instancia.nba_response.get_response(),
+    })
+
+    return instancia
+
+
+def consultar_endpoints_em_lote(chamadas, cache_dir=None):
+    """
+    Executa várias consultas em paralelo pelo agendador, cada uma passando pelo cache.
+
+    Args:
+        chamadas (list): Lista de tuplas (endpoint, kwargs).
+        cache_dir (str, opcional): Diretório do cache (padrão: CACHE_DIR).
+
+    Returns:
+        list: Para cada chamada, na mesma ordem, a instância do endpoint ou a exceção ocorrida.
+    """
+    agendador = obter_agendador()
+    futuros = [
+        agendador.submeter(consultar_endpoint, endpoint, cache_dir=cache_dir, **kwargs)
+        for endpoint, kwargs in chamadas
+    ]
+
+    resultados = []
+    for futuro in futuros:
+        try:
+            resultados.append(futuro.result())
+        except Exception as e:
+            resultados.append(e)
+
+    return resultados
+
+
+def limpar_cache(cache_dir=None, nome_endpoint=None):
+    """
+    Remove respostas armazenadas no cache.
+
+    Args:
+        cache_dir (str, opcional): Diretório do cache (padrão: CACHE_DIR).
+        nome_endpoint (str, opcional): Remove apenas as respostas deste endpoint.
+
+    Returns:
+        int: Quantidade de arquivos removidos.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    if not os.path.exists(cache_dir):
+        return 0
+
+    removidos = 0
+    for raiz, _, arquivos in os.walk(cache_dir):
+        if nome_endpoint and os.path.basename(raiz) != nome_endpoint:
+            continue
+        for arquivo in arquivos:
+            if arquivo.endswith(".json"):
+                os.remove(os.path.join(raiz, arquivo))
+                removidos += 1
+
+    return removidos
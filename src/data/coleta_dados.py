@@ -1,5 +1,5 @@
-from nba_api.stats.endpoints import TeamGameLog
 import pandas as pd
+from src.data.repositorio_gamelogs import carregar_gamelog_time, carregar_gamelog_liga
 
 def coletar_dados_time(team_id, season):
     """
@@ -12,10 +12,41 @@ def coletar_dados_time(team_id, season):
     """
     print(f"Enviando solicitação para a temporada {season}...")
     try:
-        gamelog = TeamGameLog(team_id=team_id, season=season)
-        data = gamelog.get_data_frames()[0]
+        data = carregar_gamelog_time(team_id, season)
     except Exception as e:
         print(f"Erro ao coletar dados: {e}")
         raise
 
     return data
+
+
+def coletar_totais_adversarios(team_id, season, season_type="Regular Season"):
+    """
+    Coleta, em uma única requisição, os totais dos adversários de um time em todos os jogos da temporada.
+
+    Usa o LeagueGameLog (uma linha por time por jogo) e cruza as linhas pelo GAME_ID, evitando
+    uma chamada ao boxscore para cada partida.
+
+    Args:
+        team_id (int): ID do time.
+        season (str): Temporada no formato 'YYYY-YY'.
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+
+    Returns:
+        pd.DataFrame: Uma linha por jogo do time, com a coluna GAME_ID e as estatísticas do
+        adversário prefixadas com 'OPP_' (ex.: OPP_TEAM_ID, OPP_TEAM_ABBREVIATION, OPP_PTS).
+    """
+    print(f"Coletando totais dos adversários para a temporada {season}...")
+    try:
+        league_log = carregar_gamelog_liga(season, season_type=season_type)
+    except Exception as e:
+        print(f"Erro ao coletar o game log da liga: {e}")
+        raise
+
+    jogos_time = league_log.loc[league_log["TEAM_ID"] == team_id, "GAME_ID"]
+    adversarios = league_log[league_log["GAME_ID"].isin(jogos_time) & (league_log["TEAM_ID"] != team_id)]
+
+    colunas_adversario = [col for col in adversarios.columns if col != "GAME_ID"]
+    adversarios = adversarios.rename(columns={col: f"OPP_{col}" for col in colunas_adversario})
+
+    return adversarios.reset_index(drop=True)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.instrumentacao import instrumentar
+
+# Esquema dos game logs (TeamGameLog, PlayerGameLog e LeagueGameLog) depois de normalizados.
+# Os endpoints devolvem quase tudo como texto ou int64; aqui cada coluna recebe o menor tipo adequado.
+
+# Textos com poucos valores distintos (temporada, times, adversários, resultado), guardados como categorias
+COLUNAS_CATEGORICAS = ["SEASON", "SEASON_ID", "TEAM_ABBREVIATION", "TEAM_NAME", "PLAYER_NAME", "MATCHUP", "WL"]
+
+# Identificadores numéricos de times e jogadores
+COLUNAS_IDS = ["TEAM_ID", "PLAYER_ID"]
+
+# Estatísticas de contagem de um jogo (e o registro de vitórias e derrotas do TeamGameLog)
+COLUNAS_CONTAGEM = [
+    "W", "L", "MIN", "FGM", "FGA", "FG3M", "FG3A", "FTM", "FTA", "OREB", "DREB", "REB", "AST", "STL", "BLK",
+    "TOV", "PF", "PTS", "PLUS_MINUS", "VIDEO_AVAILABLE",
+]
+
+# Percentuais e demais estatísticas com casas decimais
+COLUNAS_DECIMAIS = ["W_PCT", "FG_PCT", "FG3_PCT", "FT_PCT", "FANTASY_PTS"]
+
+# Formato de data do TeamGameLog e do PlayerGameLog (ex.: APR 13, 2025); o LeagueGameLog usa 2025-04-13
+FORMATO_DATA_ENDPOINT = "%b %d, %Y"
+
+
+def converter_datas(datas):
+    """
+    Converte a coluna GAME_DATE para datetime64, aceitando os formatos dos endpoints de time, jogador e liga.
+
+    Args:
+        datas (pd.Series): Datas como texto ("APR 13, 2025" ou "2025-04-13") ou já convertidas.
+
+    Returns:
+        pd.Series: Datas em datetime64 (NaT quando não for possível converter).
+    """
+    if pd.api.types.is_datetime64_any_dtype(datas):
+        return datas
+    convertidas = pd.to_datetime(datas, format=FORMATO_DATA_ENDPOINT, errors="coerce")
+    faltantes = convertidas.isna() & datas.notna()
+    if faltantes.any():
+        convertidas[faltantes] = pd.to_datetime(datas[faltantes], format="ISO8601", errors="coerce")
+    return convertidas
+
+
+def _inteiros(serie, tipo):
+    numeros = pd.to_numeric(serie, errors="coerce")
+    # Com valores ausentes ou fracionários, a coluna fica em float32
+    if numeros.isna().any() or not np.array_equal(numeros, np.round(numeros)):
+        return numeros.astype("float32")
+    limites = np.iinfo(tipo)
+    if len(numeros) and (numeros.min() < limites.min or numeros.max() > limites.max):
+        return numeros.astype("int64")
+    return numeros.astype(tipo)
+
+
+@instrumentar("transformacao")
+def normalizar_gamelog(df):
+    """
+    Normaliza um game log logo após a busca: nomes de colunas em maiúsculas, GAME_DATE em datetime64,
+    textos repetidos como categorias, identificadores em int32, contagens em int16 e percentuais em float32.
+
+    Pode ser aplicada mais de uma vez ao mesmo DataFrame; categorias sem uso são descartadas, o que mantém
+    pequenos os pedaços de um log da liga dividido por time ou jogador.
+
+    Args:
+        df (pd.DataFrame): Game log no formato de qualquer um dos endpoints.
+
+    Returns:
+        pd.DataFrame: Novo DataFrame com as mesmas linhas e o esquema normalizado.
+    """
+    df = df.rename(columns=str.upper)
+
+    if "GAME_DATE" in df.columns:
+        df["GAME_DATE"] = converter_datas(df["GAME_DATE"])
+    if "GAME_ID" in df.columns:
+        df["GAME_ID"] = df["GAME_ID"].astype(str)
+
+    for coluna in df.columns.intersection(COLUNAS_CATEGORICAS):
+        if isinstance(df[coluna].dtype, pd.CategoricalDtype):
+            df[coluna] = df[coluna].cat.remove_unused_categories()
+        else:
+            df[coluna] = df[coluna].astype("category")
+    for coluna in df.columns.intersection(COLUNAS_IDS):
+        df[coluna] = _inteiros(df[coluna], "int32")
+    for coluna in df.columns.intersection(COLUNAS_CONTAGEM):
+        df[coluna] = _inteiros(df[coluna], "int16")
+    for coluna in df.columns.intersection(COLUNAS_DECIMAIS):
+        df[coluna] = pd.to_numeric(df[coluna], errors="coerce").astype("float32")
+
+    return df
@@ -1,7 +1,9 @@
-from nba_api.stats.endpoints import playercareerstats, teamgamelog, scoreboardv2
+from nba_api.stats.endpoints import playercareerstats, scoreboardv2
 from nba_api.stats.static import players, teams
 import pandas as pd
 import datetime
+from src.data.cache_api import consultar_endpoint
+from src.data.repositorio_gamelogs import carregar_gamelog_time
 
 
 def extrair_dados_time(time_nome, temporada):
@@ -18,8 +20,7 @@ def extrair_dados_time(time_nome, temporada):
     time = [t for t in teams.get_teams() if t['full_name'] == time_nome][0]
     team_id = time['id']
 
-    gamelog = teamgamelog.TeamGameLog(team_id=team_id, season=temporada)
-    return gamelog.get_data_frames()[0]
+    return carregar_gamelog_time(team_id, temporada)
 
 
 def extrair_dados_jogadores(jogadores_ids):
@@ -34,7 +35,7 @@ def extrair_dados_jogadores(jogadores_ids):
     """
     jogadores_dados = []
     for player_id in jogadores_ids:
-        stats = playercareerstats.PlayerCareerStats(player_id=player_id)
+        stats = consultar_endpoint(playercareerstats.PlayerCareerStats, player_id=player_id)
         jogadores_dados.append(stats.get_data_frames()[0])
 
     return pd.concat(jogadores_dados, ignore_index=True)
@@ -51,6 +52,6 @@ def preencher_placares_faltantes(data_inicio, data_fim):
     Returns:
         pd.DataFrame: Dados de placares dos jogos.
     """
-    placares = scoreboardv2.ScoreboardV2(game_date=data_inicio, day_offset=0)
+    placares = consultar_endpoint(scoreboardv2.ScoreboardV2, game_date=data_inicio, day_offset=0)
     df_placares = placares.get_data_frames()[0]
     return df_placares
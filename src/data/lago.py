@@ -0,0 +1,84 @@
+import os
+import glob
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from src.data.repositorio_gamelogs import GAMELOGS_DIR, TIPOS_GAMELOG
+from src.data.esquema import normalizar_gamelog
+from src.utils.instrumentacao import span
+
+# Leitura dos game logs do repositório como um único conjunto de dados (data lake em Parquet).
+# As partições seguem o formato do Hive (season=2024-25/player_id=1630560/), então filtros pela temporada
+# ou pelo identificador descartam pastas inteiras sem abri-las, e os demais filtros são aplicados pelo
+# Arrow por grupo de linhas antes de os dados virarem DataFrame.
+
+# Nome da coluna com a temporada da partição no DataFrame retornado
+COLUNA_TEMPORADA = "SEASON"
+
+
+def _arquivos(tipo, season_type, diretorio):
+    arquivo = season_type.lower().replace(" ", "_") + ".parquet"
+    base = os.path.join(diretorio, tipo)
+    niveis = ["season=*"] + (["*=*"] if TIPOS_GAMELOG[tipo]["parametro"] else [])
+    return base, sorted(glob.glob(os.path.join(base, *niveis, arquivo)))
+
+
+def _campo(nome, tipo):
+    # Temporada e identificador são filtrados pela partição; as demais colunas, pelo conteúdo do arquivo
+    parametro = TIPOS_GAMELOG[tipo]["parametro"]
+    if nome.upper() == COLUNA_TEMPORADA:
+        return ds.field("season")
+    if parametro and nome.upper() == parametro.upper():
+        return ds.field(parametro)
+    return ds.field(nome.upper())
+
+
+def _expressao(filtros, tipo):
+    expressao = None
+    for nome, valor in filtros.items():
+        campo = _campo(nome, tipo)
+        if isinstance(valor, (list, tuple, set)):
+            condicao = campo.isin(list(valor))
+        else:
+            condicao = campo == valor
+        expressao = condicao if expressao is None else expressao & condicao
+    return expressao
+
+
+def ler_gamelogs(tipo="jogadores", colunas=None, filtros=None, season_type="Regular Season", diretorio=None):
+    """
+    Lê os game logs armazenados no repositório, com seleção de colunas e filtros aplicados na leitura.
+
+    Apenas lê os arquivos já gravados (por carregar_gamelog(), precarregar_repositorio() ou
+    distribuir_gamelogs_liga()); nada é buscado na API.
+
+    Args:
+        tipo (str): Tipo de game log ('jogadores', 'times', 'liga' ou 'liga_jogadores').
+        colunas (list, opcional): Colunas a ler (padrão: todas). SEASON é a temporada da partição.
+        filtros (dict, opcional): Coluna -> valor ou lista de valores aceitos
+            (ex.: {"SEASON": "2024-25", "PLAYER_ID": [1630560, 1629661], "WL": "W"}).
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+        diretorio (str, opcional): Diretório do repositório (padrão: GAMELOGS_DIR).
+
+    Returns:
+        pd.DataFrame: Linhas que atendem aos filtros, no esquema de normalizar_gamelog(), com a coluna
+        SEASON quando as colunas não forem informadas ou a incluírem.
+    """
+    base, arquivos = _arquivos(tipo, season_type, diretorio or GAMELOGS_DIR)
+    parametro = TIPOS_GAMELOG[tipo]["parametro"]
+    colunas = [coluna.upper() for coluna in colunas] if colunas else None
+
+    if not arquivos:
+        print(f"Nenhum game log do tipo '{tipo}' ({season_type}) em {base}.")
+        return pd.DataFrame(columns=colunas or [])
+
+    dataset = ds.dataset(arquivos, format="parquet", partitioning="hive", partition_base_dir=base)
+    # A coluna de identificador da partição repete a que já existe nos arquivos (PLAYER_ID, TEAM_ID)
+    projecao = [nome for nome in dataset.schema.names if nome != parametro]
+    if colunas is not None:
+        projecao = [nome for nome in projecao if nome in colunas or (nome == "season" and COLUNA_TEMPORADA in colunas)]
+
+    with span("busca", f"lago_{tipo}", arquivos=len(arquivos)):
+        tabela = dataset.to_table(columns=projecao, filter=_expressao(filtros or {}, tipo) if filtros else None)
+    return normalizar_gamelog(tabela.to_pandas().rename(columns={"season": COLUNA_TEMPORADA}))
@@ -0,0 +1,102 @@
+import os
+
+from nba_api.stats.static import teams
+from nba_api.stats.endpoints import leaguedashplayerstats
+
+from src.data.cache_api import consultar_endpoint
+from src.data.agendador import obter_agendador
+from src.data.repositorio_gamelogs import distribuir_gamelogs_liga
+
+# Quantidade de jogadores de cada elenco analisados no modo liga (os de mais minutos na temporada)
+JOGADORES_POR_TIME = int(os.getenv("NBA_LIGA_JOGADORES_POR_TIME", "3"))
+
+# Siglas do Basketball Reference que diferem das usadas pela nba_api (Parte 1 RF7)
+SIGLAS_BASKETBALL_REFERENCE = {"BKN": "BRK", "CHA": "CHO", "PHX": "PHO"}
+
+
+def listar_times():
+    """Retorna os 30 times da liga (id, abbreviation, full_name...), em ordem alfabética de sigla."""
+    return sorted(teams.get_teams(), key=lambda time: time["abbreviation"])
+
+
+def estatisticas_jogadores_liga(season, season_type="Regular Season"):
+    """
+    Retorna as estatísticas da temporada de todos os jogadores da liga (LeagueDashPlayerStats).
+
+    É uma única requisição por temporada, compartilhada por todos os times pelo cache em disco.
+    """
+    return consultar_endpoint(
+        leaguedashplayerstats.LeagueDashPlayerStats,
+        season=season,
+        season_type_all_star=season_type,
+    ).get_data_frames()[0]
+
+
+def estatisticas_jogadores_time(team_id, season, season_type="Regular Season"):
+    """
+    Retorna as estatísticas da temporada dos jogadores de um time (LeagueDashPlayerStats por time).
+
+    Não é um filtro do LeagueDashPlayerStats da liga: nele, um jogador trocado no meio da temporada aparece
+    só no último time, com os números das duas equipes somados, e some do time que deixou. A consulta por
+    time (team_id_nullable) traz os números de cada jogador por aquele time. A resposta fica no cache em disco.
+    """
+    return consultar_endpoint(
+        leaguedashplayerstats.LeagueDashPlayerStats,
+        season=season,
+        season_type_all_star=season_type,
+        team_id_nullable=team_id,
+    ).get_data_frames()[0]
+
+
+def elenco_do_time(estatisticas, team_id, quantidade=None):
+    """
+    Seleciona os jogadores de um time com mais minutos na temporada.
+
+    Args:
+        estatisticas (pd.DataFrame): LeagueDashPlayerStats da liga.
+        team_id (int): ID do time.
+        quantidade (int, opcional): Quantidade de jogadores (padrão: JOGADORES_POR_TIME).
+
+    Returns:
+        list: Dicionários com 'PLAYER' e 'PLAYER_ID', no formato usado pelos RFs.
+    """
+    elenco = estatisticas[estatisticas["TEAM_ID"] == team_id].nlargest(quantidade or JOGADORES_POR_TIME, "MIN")
+    return [{"PLAYER": nome, "PLAYER_ID": int(pid)} for nome, pid in zip(elenco["PLAYER_NAME"], elenco["PLAYER_ID"])]
+
+
+def preparar_dados_liga(seasons, season_type="Regular Season", jogadores_por_time=None, diretorio=None):
+    """
+    Busca os dados da liga inteira uma única vez e monta a configuração de cada time.
+
+    Para cada temporada, são três requisições (LeagueGameLog por time e por jogador e LeagueDashPlayerStats),
+    feitas em paralelo e guardadas no cache. Os game logs são divididos no repositório por time e por jogador,
+    então os RFs de cada time leem tudo localmente. O elenco de cada time vem da última temporada informada.
+
+    Args:
+        seasons (list): Temporadas no formato 'YYYY-YY'.
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+        jogadores_por_time (int, opcional): Jogadores analisados por time (padrão: JOGADORES_POR_TIME).
+        diretorio (str, opcional): Diretório do repositório de game logs.
+
+    Returns:
+        dict: Sigla do time -> dicionário com team_id, team_abbr, team_name e players.
+    """
+    agendador = obter_agendador()
+    distribuicoes = {season: agendador.submeter(distribuir_gamelogs_liga, season, season_type, diretorio) for season in seasons}
+    # As estatísticas de todas as temporadas ficam no cache antes de os times serem processados em paralelo
+    estatisticas = {season: agendador.submeter(estatisticas_jogadores_liga, season, season_type) for season in seasons}
+    estatisticas = {season: futuro.result() for season, futuro in estatisticas.items()}[seasons[-1]]
+
+    for season, futuro in distribuicoes.items():
+        total_times, total_jogadores = futuro.result()
+        print(f"Temporada {season}: game logs de {total_times} times e {total_jogadores} jogadores no repositório.")
+
+    return {
+        time["abbreviation"]: {
+            "team_id": time["id"],
+            "team_abbr": time["abbreviation"],
+            "team_name": time["full_name"],
+            "players": elenco_do_time(estatisticas, time["id"], jogadores_por_time),
+        }
+        for time in listar_times()
+    }
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+from src.data.transformacoes import saldo_pontos
 
 def adicionar_informacoes_placar(data):
     """
@@ -14,16 +16,15 @@ def adicionar_informacoes_placar(data):
         raise KeyError("As colunas 'PTS' (pontos do time) e 'PTS_Opp' (pontos do adversário) são necessárias no dataset.")
 
     # Preencher valores nulos com 0
-    data['PTS'].fillna(0, inplace=True)
-    data['PTS_Opp'].fillna(0, inplace=True)
+    data['PTS'] = data['PTS'].fillna(0)
+    data['PTS_Opp'] = data['PTS_Opp'].fillna(0)
 
     # Adicionar coluna Resultado
-    data['Resultado'] = data.apply(
-        lambda row: 'Vitória' if row['PTS'] > row['PTS_Opp'] else 'Derrota', axis=1
-    )
+    diferenca = saldo_pontos(data['PTS'], data['PTS_Opp'])
+    data['Resultado'] = np.where(diferenca > 0, 'Vitória', 'Derrota')
 
     # Adicionar coluna Diferença de Pontos
-    data['Diferenca_Pontos'] = data['PTS'] - data['PTS_Opp']
+    data['Diferenca_Pontos'] = diferenca
 
     # Adicionar coluna Total de Pontos
     data['Total_Pontos'] = data['PTS'] + data['PTS_Opp']
@@ -0,0 +1,372 @@
+import os
+import json
+import time
+import threading
+
+import pandas as pd
+from nba_api.stats.endpoints import playergamelog, teamgamelog, LeagueGameLog
+
+from src.data.cache_api import consultar_endpoint, calcular_ttl
+from src.data.agendador import obter_agendador
+from src.data.esquema import normalizar_gamelog
+from src.utils.instrumentacao import span
+from src.utils.travas import travar_arquivo
+
+# Diretório do repositório de game logs em Parquet (pode ser alterado pela variável NBA_GAMELOGS_DIR)
+GAMELOGS_DIR = os.getenv("NBA_GAMELOGS_DIR", "data/gamelogs")
+
+# Nome do manifesto com a marca d'água (último jogo armazenado) de cada game log
+ARQUIVO_MANIFESTO = "manifesto.json"
+
+# Sincronização incremental: busca apenas os jogos após o último armazenado (NBA_SYNC_INCREMENTAL=0 desativa)
+SYNC_INCREMENTAL = os.getenv("NBA_SYNC_INCREMENTAL", "1") != "0"
+
+# Tipos de game log armazenados: endpoint, parâmetro do identificador e colunas que identificam uma linha
+# (já no esquema normalizado, com os nomes em maiúsculas).
+# Os logs da liga não têm identificador; 'abreviacao' escolhe entre as linhas por time (T) ou por jogador (P).
+TIPOS_GAMELOG = {
+    "jogadores": {"endpoint": playergamelog.PlayerGameLog, "parametro": "player_id", "chaves": ["GAME_ID"]},
+    "times": {"endpoint": teamgamelog.TeamGameLog, "parametro": "team_id", "chaves": ["GAME_ID"]},
+    "liga": {"endpoint": LeagueGameLog, "parametro": None, "abreviacao": "T", "chaves": ["GAME_ID", "TEAM_ID"]},
+    "liga_jogadores": {"endpoint": LeagueGameLog, "parametro": None, "abreviacao": "P", "chaves": ["GAME_ID", "PLAYER_ID"]},
+}
+
+# Colunas dos endpoints TeamGameLog e PlayerGameLog, usadas ao dividir os logs da liga por time e por jogador
+COLUNAS_GAMELOG_TIME = [
+    "TEAM_ID", "GAME_ID", "GAME_DATE", "MATCHUP", "WL", "W", "L", "W_PCT", "MIN", "FGM", "FGA", "FG_PCT", "FG3M",
+    "FG3A", "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS",
+]
+COLUNAS_GAMELOG_JOGADOR = [
+    "SEASON_ID", "PLAYER_ID", "GAME_ID", "GAME_DATE", "MATCHUP", "WL", "MIN", "FGM", "FGA", "FG_PCT", "FG3M", "FG3A",
+    "FG3_PCT", "FTM", "FTA", "FT_PCT", "OREB", "DREB", "REB", "AST", "STL", "BLK", "TOV", "PF", "PTS", "PLUS_MINUS",
+    "VIDEO_AVAILABLE",
+]
+
+# Cópia em memória dos logs já carregados neste processo, indexada pelo caminho do arquivo
+_memoria = {}
+_memoria_lock = threading.Lock()
+_manifesto_lock = threading.Lock()
+
+
+def caminho_gamelog(player_id, season, season_type="Regular Season", diretorio=None, tipo="jogadores"):
+    """
+    Retorna o arquivo Parquet de um game log.
+
+    Os arquivos ficam particionados por tipo, temporada e identificador
+    (ex.: data/gamelogs/jogadores/season=2024-25/player_id=1630560/regular_season.parquet).
+    O game log da liga não tem identificador e fica direto na pasta da temporada.
+    """
+    diretorio = diretorio or GAMELOGS_DIR
+    arquivo = season_type.lower().replace(" ", "_") + ".parquet"
+    partes = [diretorio, tipo, f"season={season}"]
+    parametro = TIPOS_GAMELOG[tipo]["parametro"]
+    if parametro:
+        partes.append(f"{parametro}={player_id}")
+    return os.path.join(*partes, arquivo)
+
+
+def _arquivo_valido(caminho, season):
+    if not os.path.exists(caminho):
+        return False
+
+    # A temporada só é definitiva para o arquivo gravado depois do fim dela: o último game log sincronizado
+    # no meio da temporada ainda expira depois da virada, e a sincronização seguinte o completa
+    gravado_em = os.path.getmtime(caminho)
+    ttl = calcular_ttl("playergamelog", {"Season": season}, criado_em=gravado_em)
+    return ttl is None or time.time() - gravado_em <= ttl
+
+
+def _gravar_parquet(df, caminho):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_parquet(caminho_tmp, index=False)
+    os.replace(caminho_tmp, caminho)
+
+
+def _ler_parquet(caminho):
+    with span("busca", "leitura_parquet", arquivo=os.path.relpath(caminho, GAMELOGS_DIR)):
+        df = pd.read_parquet(caminho)
+    # Arquivos gravados antes do esquema normalizado são convertidos na leitura
+    return normalizar_gamelog(df)
+
+
+def ler_manifesto(diretorio=None):
+    """
+    Lê o manifesto do repositório.
+
+    Returns:
+        dict: Para cada game log (caminho relativo), a data e o ID do último jogo armazenado,
+        a quantidade de jogos e o horário da última sincronização.
+    """
+    caminho = os.path.join(diretorio or GAMELOGS_DIR, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {}
+
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Manifesto corrompido em {caminho}, ignorando: {e}")
+        return {}
+
+
+def _marca(df):
+    marca = {"ultima_data": None, "ultimo_game_id": None, "jogos": 0, "atualizado_em": time.time()}
+    if not df.empty:
+        ultimo = df["GAME_DATE"].idxmax()
+        marca.update({
+            "ultima_data": df.loc[ultimo, "GAME_DATE"].strftime("%Y-%m-%d"),
+            "ultimo_game_id": str(df.loc[ultimo, "GAME_ID"]),
+            "jogos": int(df["GAME_ID"].nunique()),
+        })
+    return marca
+
+
+def _atualizar_manifesto(caminho_log, df, diretorio):
+    _gravar_marcas({caminho_log: _marca(df)}, diretorio)
+
+
+def _gravar_marcas(marcas, diretorio):
+    diretorio = diretorio or GAMELOGS_DIR
+
+    # As etapas do pipeline carregam game logs em processos separados: a leitura, a alteração e a
+    # gravação do manifesto ficam sob uma trava de arquivo, para nenhuma etapa apagar as marcas de outra
+    with _manifesto_lock, travar_arquivo(os.path.join(diretorio, f"{ARQUIVO_MANIFESTO}.lock")):
+        manifesto = ler_manifesto(diretorio)
+        for caminho_log, marca in marcas.items():
+            manifesto[os.path.relpath(caminho_log, diretorio)] = marca
+        os.makedirs(diretorio, exist_ok=True)
+        caminho = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+        caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(caminho_tmp, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, indent=2, sort_keys=True)
+        os.replace(caminho_tmp, caminho)
+
+
+def _buscar(tipo, identificador, season, season_type, data_inicial=None):
+    config = TIPOS_GAMELOG[tipo]
+    parametros = {"season": season, "season_type_all_star": season_type, "timeout": 30}
+    if config["parametro"]:
+        parametros[config["parametro"]] = identificador
+    else:
+        parametros["player_or_team_abbreviation"] = config["abreviacao"]
+    if data_inicial is not None:
+        parametros["date_from_nullable"] = data_inicial.strftime("%m/%d/%Y")
+
+    return normalizar_gamelog(consultar_endpoint(config["endpoint"], **parametros).get_data_frames()[0])
+
+
+def _sincronizar(tipo, identificador, season, season_type, caminho, diretorio):
+    """Atualiza um game log existente buscando apenas os jogos a partir do último armazenado."""
+    armazenado = _ler_parquet(caminho)
+    if armazenado.empty:
+        return _buscar(tipo, identificador, season, season_type)
+
+    # A data do último jogo entra na busca (pode haver mais de um jogo no mesmo dia na liga);
+    # as linhas repetidas são descartadas pelas colunas-chave
+    ultima_data = armazenado["GAME_DATE"].max()
+    novos = _buscar(tipo, identificador, season, season_type, data_inicial=ultima_data)
+
+    chaves = TIPOS_GAMELOG[tipo]["chaves"]
+    novos = novos[~novos.set_index(chaves).index.isin(armazenado.set_index(chaves).index)]
+    if novos.empty:
+        return armazenado
+
+    print(f"{len(novos)} novo(s) registro(s) em {os.path.relpath(caminho, diretorio or GAMELOGS_DIR)}.")
+    # Categorias diferentes nos dois pedaços viram texto no concat; a normalização as refaz
+    df = normalizar_gamelog(pd.concat([novos, armazenado], ignore_index=True))
+
+    # Mantém a ordem devolvida pela API (jogos mais recentes primeiro nos logs de jogador e de time)
+    ascendente = tipo.startswith("liga")
+    return df.sort_values("GAME_DATE", ascending=ascendente, kind="stable").reset_index(drop=True)
+
+
+def _carregar(tipo, identificador, season, season_type, diretorio):
+    caminho = caminho_gamelog(identificador, season, season_type, diretorio, tipo)
+    valido = _arquivo_valido(caminho, season)
+
+    with _memoria_lock:
+        if valido and caminho in _memoria:
+            return _memoria[caminho].copy()
+
+    if valido:
+        df = _ler_parquet(caminho)
+    else:
+        if SYNC_INCREMENTAL and os.path.exists(caminho):
+            df = _sincronizar(tipo, identificador, season, season_type, caminho, diretorio)
+        else:
+            df = _buscar(tipo, identificador, season, season_type)
+        _gravar_parquet(df, caminho)
+        _atualizar_manifesto(caminho, df, diretorio)
+
+    with _memoria_lock:
+        _memoria[caminho] = df
+
+    return df.copy()
+
+
+def carregar_gamelog(player_id, season="2024-25", season_type="Regular Season", diretorio=None):
+    """
+    Retorna o game log de um jogador em uma temporada, buscando na API apenas o que ainda não foi armazenado.
+
+    A ordem de consulta é: memória do processo, arquivo Parquet do repositório e, por último, a nba_api
+    (pelo cache em disco). Temporadas encerradas nunca são buscadas de novo; na temporada atual, quando
+    o arquivo expira, só os jogos após o último armazenado são buscados e acrescentados.
+    O DataFrame retornado é uma cópia, então pode ser alterado livremente.
+
+    Args:
+        player_id (int): ID do jogador na NBA API.
+        season (str): Temporada no formato 'YYYY-YY'.
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+        diretorio (str, opcional): Diretório do repositório (padrão: GAMELOGS_DIR).
+
+    Returns:
+        pd.DataFrame: Game log com as colunas do endpoint PlayerGameLog, no esquema de normalizar_gamelog()
+        (colunas em maiúsculas, GAME_DATE em datetime64, categorias e tipos numéricos reduzidos).
+    """
+    return _carregar("jogadores", int(player_id), season, season_type, diretorio)
+
+
+def carregar_gamelog_time(team_id, season="2024-25", season_type="Regular Season", diretorio=None):
+    """
+    Retorna o game log de um time em uma temporada (colunas do endpoint TeamGameLog, esquema normalizado).
+
+    Segue as mesmas regras de armazenamento e sincronização incremental de carregar_gamelog().
+    """
+    return _carregar("times", int(team_id), season, season_type, diretorio)
+
+
+def carregar_gamelog_liga(season="2024-25", season_type="Regular Season", diretorio=None):
+    """
+    Retorna o game log de todos os times da liga em uma temporada (colunas do endpoint LeagueGameLog, esquema normalizado).
+
+    Segue as mesmas regras de armazenamento e sincronização incremental de carregar_gamelog().
+    """
+    return _carregar("liga", None, season, season_type, diretorio)
+
+
+def carregar_gamelog_jogadores_liga(season="2024-25", season_type="Regular Season", diretorio=None):
+    """
+    Retorna o game log de todos os jogadores da liga em uma temporada (LeagueGameLog com uma linha por jogador).
+
+    Segue as mesmas regras de armazenamento e sincronização incremental de carregar_gamelog().
+    """
+    return _carregar("liga_jogadores", None, season, season_type, diretorio)
+
+
+def _formato_endpoint(df, colunas):
+    # Colunas dos endpoints por time e por jogador, com os jogos mais recentes primeiro; a normalização
+    # descarta as categorias dos demais times e jogadores da liga
+    df = df.sort_values("GAME_DATE", ascending=False, kind="stable")
+    return normalizar_gamelog(df[[coluna for coluna in colunas if coluna in df.columns]].reset_index(drop=True))
+
+
+def distribuir_gamelogs_liga(season="2024-25", season_type="Regular Season", diretorio=None):
+    """
+    Preenche o repositório com os game logs de todos os times e jogadores a partir dos logs da liga.
+
+    São duas requisições por temporada (LeagueGameLog por time e por jogador), em vez de uma por time
+    e uma por jogador. Depois desta chamada, carregar_gamelog_time() e carregar_gamelog() para qualquer
+    time ou jogador da temporada são apenas leituras locais.
+
+    Args:
+        season (str): Temporada no formato 'YYYY-YY'.
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+        diretorio (str, opcional): Diretório do repositório (padrão: GAMELOGS_DIR).
+
+    Returns:
+        tuple: (quantidade de times, quantidade de jogadores) gravados.
+    """
+    log_times = carregar_gamelog_liga(season, season_type, diretorio)
+    log_jogadores = carregar_gamelog_jogadores_liga(season, season_type, diretorio)
+    marcas = {}
+
+    # Vitórias e derrotas acumuladas, como no TeamGameLog
+    log_times = log_times.sort_values("GAME_DATE", kind="stable")
+    log_times = log_times.assign(
+        W=(log_times["WL"] == "W").astype(int).groupby(log_times["TEAM_ID"]).cumsum(),
+        L=(log_times["WL"] == "L").astype(int).groupby(log_times["TEAM_ID"]).cumsum(),
+    )
+    log_times["W_PCT"] = (log_times["W"] / (log_times["W"] + log_times["L"])).round(3)
+    log_times = normalizar_gamelog(log_times)
+
+    for team_id, df in log_times.groupby("TEAM_ID"):
+        caminho = caminho_gamelog(team_id, season, season_type, diretorio, "times")
+        df = _formato_endpoint(df, COLUNAS_GAMELOG_TIME)
+        _gravar_parquet(df, caminho)
+        marcas[caminho] = _marca(df)
+
+    for player_id, df in log_jogadores.groupby("PLAYER_ID"):
+        caminho = caminho_gamelog(player_id, season, season_type, diretorio, "jogadores")
+        df = _formato_endpoint(df, COLUNAS_GAMELOG_JOGADOR)
+        _gravar_parquet(df, caminho)
+        marcas[caminho] = _marca(df)
+
+    _gravar_marcas(marcas, diretorio)
+    with _memoria_lock:
+        for caminho in marcas:
+            _memoria.pop(caminho, None)
+
+    return log_times["TEAM_ID"].nunique(), log_jogadores["PLAYER_ID"].nunique()
+
+
+def precarregar_gamelogs(player_ids, seasons, season_type="Regular Season", diretorio=None):
+    """
+    Carrega no repositório, em paralelo, os game logs de vários jogadores e temporadas.
+
+    Depois desta chamada, carregar_gamelog() para as mesmas combinações é apenas uma leitura local.
+    Falhas são impressas e não interrompem as demais buscas.
+
+    Args:
+        player_ids (list): IDs dos jogadores.
+        seasons (list): Temporadas no formato 'YYYY-YY'.
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+        diretorio (str, opcional): Diretório do repositório (padrão: GAMELOGS_DIR).
+    """
+    agendador = obter_agendador()
+    combinacoes = [(pid, season) for season in seasons for pid in player_ids]
+    futuros = [
+        agendador.submeter(carregar_gamelog, pid, season, season_type, diretorio)
+        for pid, season in combinacoes
+    ]
+
+    for (pid, season), futuro in zip(combinacoes, futuros):
+        try:
+            futuro.result()
+        except Exception as e:
+            print(f"Erro ao carregar o game log do jogador {pid} na temporada {season}: {e}")
+
+
+def precarregar_repositorio(player_ids, team_ids, seasons, season_type="Regular Season", diretorio=None):
+    """
+    Carrega (ou sincroniza) em paralelo os game logs dos jogadores, dos times e da liga nas temporadas.
+
+    Args:
+        player_ids (list): IDs dos jogadores.
+        team_ids (list): IDs dos times.
+        seasons (list): Temporadas no formato 'YYYY-YY'.
+        season_type (str): Tipo de temporada (padrão: 'Regular Season').
+        diretorio (str, opcional): Diretório do repositório (padrão: GAMELOGS_DIR).
+    """
+    agendador = obter_agendador()
+    futuros = {}
+    for season in seasons:
+        futuros[f"liga na temporada {season}"] = agendador.submeter(carregar_gamelog_liga, season, season_type, diretorio)
+        for team_id in team_ids:
+            futuros[f"time {team_id} na temporada {season}"] = agendador.submeter(
+                carregar_gamelog_time, team_id, season, season_type, diretorio
+            )
+
+    precarregar_gamelogs(player_ids, seasons, season_type, diretorio)
+
+    for descricao, futuro in futuros.items():
+        try:
+            futuro.result()
+        except Exception as e:
+            print(f"Erro ao carregar o game log do {descricao}: {e}")
+
+
+def limpar_memoria():
+    """Descarta os game logs mantidos em memória (os arquivos Parquet continuam no disco)."""
+    with _memoria_lock:
+        _memoria.clear()
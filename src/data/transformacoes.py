@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.instrumentacao import instrumentar
+
+# Sigla do adversário no MATCHUP: "BKN vs. LAL" ou "BKN @ LAL"
+_PADRAO_ADVERSARIO = r"(?:vs\.|@)\s*([A-Za-z]+)"
+
+
+def _coluna(df, nome):
+    # Os game logs do repositório têm as colunas em maiúsculas, mas DataFrames montados de outra forma
+    # podem ter 'Game_ID'
+    for coluna in df.columns:
+        if coluna.upper() == nome.upper():
+            return df[coluna]
+    raise KeyError(f"Coluna {nome} não encontrada no game log.")
+
+
+def jogo_em_casa(matchup):
+    """
+    Indica os jogos em casa a partir do MATCHUP ("vs." em casa, "@" fora).
+
+    Args:
+        matchup (pd.Series): Coluna MATCHUP do game log.
+
+    Returns:
+        pd.Series: True para jogos em casa.
+    """
+    return matchup.str.contains("vs.", case=False, regex=False).fillna(False).astype(bool)
+
+
+def local_do_jogo(matchup):
+    """Rótulo 'Casa' ou 'Fora' de cada jogo, a partir do MATCHUP."""
+    return pd.Series(np.where(jogo_em_casa(matchup), "Casa", "Fora"), index=matchup.index)
+
+
+def sigla_adversario(matchup):
+    """
+    Extrai a sigla do adversário do MATCHUP.
+
+    Args:
+        matchup (pd.Series): Coluna MATCHUP do game log.
+
+    Returns:
+        pd.Series: Sigla do adversário em maiúsculas, ou "" se o MATCHUP não tiver "vs." nem "@".
+    """
+    return matchup.str.extract(_PADRAO_ADVERSARIO, expand=False).str.upper().fillna("")
+
+
+def indicadores_resultado(wl):
+    """
+    Converte a coluna WL em indicadores de vitória e derrota.
+
+    Returns:
+        tuple: (vitórias, derrotas), Series com 1 ou 0.
+    """
+    return (wl == "W").astype(int), (wl == "L").astype(int)
+
+
+def resultado_por_local(em_casa, vitoria):
+    """
+    Resultado com sinal separado por local: 1 para vitória, -1 para derrota e 0 quando o jogo foi no outro local.
+
+    Args:
+        em_casa (pd.Series): True para jogos em casa.
+        vitoria (pd.Series): True para vitórias.
+
+    Returns:
+        tuple: (resultado em casa, resultado fora), Series de inteiros.
+    """
+    sinal = np.where(vitoria, 1, -1)
+    casa = pd.Series(np.where(em_casa, sinal, 0), index=em_casa.index)
+    fora = pd.Series(np.where(em_casa, 0, sinal), index=em_casa.index)
+    return casa, fora
+
+
+def saldo_pontos(pts, pts_adversario):
+    """Diferença de pontos do jogo (positiva em vitórias)."""
+    return pts - pts_adversario
+
+
+@instrumentar("transformacao")
+def enriquecer_gamelog(df, pontos_adversarios=None):
+    """
+    Adiciona ao game log as colunas derivadas do MATCHUP e do resultado, com operações sobre colunas inteiras.
+
+    Colunas adicionadas: EM_CASA, ADVERSARIO, VITORIA, DERROTA, RESULTADO_CASA e RESULTADO_FORA. Com os
+    pontos dos adversários, também PTS_OPP e SALDO.
+
+    Args:
+        df (pd.DataFrame): Game log com as colunas MATCHUP e WL (maiúsculas ou não).
+        pontos_adversarios (dict, opcional): GAME_ID -> pontos do adversário.
+
+    Returns:
+        pd.DataFrame: Cópia do game log com as novas colunas.
+    """
+    df = df.copy()
+    matchup = _coluna(df, "MATCHUP")
+
+    df["EM_CASA"] = jogo_em_casa(matchup)
+    df["ADVERSARIO"] = sigla_adversario(matchup)
+    df["VITORIA"], df["DERROTA"] = indicadores_resultado(_coluna(df, "WL"))
+    df["RESULTADO_CASA"], df["RESULTADO_FORA"] = resultado_por_local(df["EM_CASA"], df["VITORIA"] == 1)
+
+    if pontos_adversarios is not None:
+        df["PTS_OPP"] = _coluna(df, "GAME_ID").map(pontos_adversarios)
+        df["SALDO"] = saldo_pontos(_coluna(df, "PTS"), df["PTS_OPP"])
+
+    return df
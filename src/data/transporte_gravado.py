@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Gravação e reprodução das respostas HTTP (nba_api, Basketball Reference e HoopsHype).
+# No modo 'gravar', toda resposta recebida é salva em FIXTURES_DIR; no modo 'reproduzir', as requisições
+# não saem da máquina e são respondidas pelos arquivos gravados, o que permite rodar o pipeline e os
+# testes sem rede e com tempos previsíveis. No modo 'direto', as requisições são feitas normalmente e
+# apenas contadas (ver estatisticas_http()).
+MODO = os.getenv("NBA_HTTP_MODO", "")
+
+# Diretório das respostas gravadas (data/fixtures/http/<host>/<hash>.json)
+FIXTURES_DIR = os.getenv("NBA_HTTP_FIXTURES_DIR", "data/fixtures/http")
+
+# Latência simulada na reprodução: segundos por resposta ou 'gravada' para repetir a duração original
+LATENCIA = os.getenv("NBA_HTTP_LATENCIA", "0")
+
+MODOS = ("direto", "gravar", "reproduzir")
+
+_request_original = requests.sessions.Session.request
+_configuracao = None
+_lock = threading.Lock()
+_estatisticas = {"requisicoes": 0, "bytes": 0}
+
+
+class RespostaNaoGravada(requests.ConnectionError):
+    """Requisição sem resposta gravada no modo de reprodução."""
+
+
+def chave_requisicao(metodo, url, params=None, data=None):
+    """
+    Gera a chave de uma requisição a partir do método, da URL, dos parâmetros e do corpo.
+
+    Os cabeçalhos ficam de fora, então a mesma requisição feita com outro User-Agent ou Referer
+    continua encontrando a resposta gravada.
+
+    Returns:
+        str: Hash SHA-256 que identifica a requisição.
+    """
+    conteudo = json.dumps(
+        {"metodo": metodo.upper(), "url": url, "params": params or {}, "data": data or None},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+def caminho_fixture(metodo, url, params=None, data=None, diretorio=None):
+    """Retorna o arquivo da resposta gravada de uma requisição, separado pelo host da URL."""
+    host = urlsplit(url).netloc or "local"
+    return os.path.join(diretorio or FIXTURES_DIR, host, f"{chave_requisicao(metodo, url, params, data)}.json")
+
+
+def gravar_fixture(caminho, metodo, url, params, status_code, conteudo, headers=None, encoding=None, duracao=0.0):
+    """
+    Grava a resposta de uma requisição no formato lido pela reprodução.
+
+    Também pode ser usada para criar respostas à mão (em testes, por exemplo).
+
+    Args:
+        caminho (str): Arquivo da resposta (ver caminho_fixture()).
+        metodo (str): Método HTTP.
+        url (str): URL requisitada, sem os parâmetros.
+        params (dict): Parâmetros da requisição.
+        status_code (int): Status HTTP da resposta.
+        conteudo (bytes | str): Corpo da resposta.
+        headers (dict, opcional): Cabeçalhos da resposta.
+        encoding (str, opcional): Codificação do corpo.
+        duracao (float): Tempo da requisição original, em segundos.
+    """
+    if isinstance(conteudo, str):
+        conteudo = conteudo.encode(encoding or "utf-8")
+    registro = {
+        "metodo": metodo.upper(),
+        "url": url,
+        "params": params or {},
+        "status_code": status_code,
+        "headers": dict(headers or {}),
+        "encoding": encoding,
+        "duracao": duracao,
+        "gravado_em": time.time(),
+        "conteudo": base64.b64encode(conteudo).decode("ascii"),
+    }
+
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(caminho_tmp, "w", encoding="utf-8") as f:
+        json.dump(registro, f, default=str)
+    os.replace(caminho_tmp, caminho)
+
+
+def _resposta_gravada(caminho, requisicao):
+    with open(caminho, "r", encoding="utf-8") as f:
+        registro = json.load(f)
+
+    resposta = requests.Response()
+    resposta.status_code = registro["status_code"]
+    resposta._content = base64.b64decode(registro["conteudo"])
+    # O corpo já foi gravado descompactado
+    resposta.headers = CaseInsensitiveDict(
+        {k: v for k, v in registro["headers"].items() if k.lower() not in ("content-encoding", "transfer-encoding")}
+    )
+    resposta.encoding = registro["encoding"]
+    resposta.url = requisicao.url
+    resposta.request = requisicao
+    return resposta, registro.get("duracao", 0.0)
+
+
+def _enviar(sessao, method, url, params=None, data=None, **kwargs):
+    # Requisição real, feita pelo requests
+    return _request_original(sessao, method, url, params=params, data=data, **kwargs)
+
+
+def _contar(resposta):
+    with _lock:
+        _estatisticas["requisicoes"] += 1
+        _estatisticas["bytes"] += len(resposta.content or b"")
+    return resposta
+
+
+def _request(sessao, method, url, params=None, data=None, **kwargs):
+    configuracao = _configuracao
+    if configuracao is None:
+        return _enviar(sessao, method, url, params=params, data=data, **kwargs)
+    if configuracao["modo"] == "direto":
+        return _contar(_enviar(sessao, method, url, params=params, data=data, **kwargs))
+
+    caminho = caminho_fixture(method, url, params, data, configuracao["diretorio"])
+
+    if configuracao["modo"] == "reproduzir":
+        if not os.path.exists(caminho):
+            raise RespostaNaoGravada(f"Nenhuma resposta gravada para {method.upper()} {url} (params={params}).")
+        requisicao = requests.Request(method.upper(), url, params=params, data=data).prepare()
+        resposta, duracao = _resposta_gravada(caminho, requisicao)
+        latencia = duracao if configuracao["latencia"] == "gravada" else float(configuracao["latencia"])
+        if latencia > 0:
+            time.sleep(latencia)
+        return _contar(resposta)
+
+    inicio = time.monotonic()
+    resposta = _enviar(sessao, method, url, params=params, data=data, **kwargs)
+    gravar_fixture(caminho, method, url, params, resposta.status_code, resposta.content, resposta.headers,
+                   resposta.encoding, time.monotonic() - inicio)
+    return _contar(resposta)
+
+
+def ativar_transporte(modo=None, diretorio=None, latencia=None):
+    """
+    Ativa a gravação ou a reprodução das requisições HTTP feitas pelo requests neste processo.
+
+    Todas as sessões do requests passam a usar o transporte, inclusive a da nba_api e as chamadas
+    requests.get() diretas. Sem modo (nem NBA_HTTP_MODO), nada é alterado.
+
+    Args:
+        modo (str, opcional): 'direto', 'gravar' ou 'reproduzir' (padrão: NBA_HTTP_MODO).
+        diretorio (str, opcional): Diretório das respostas gravadas (padrão: FIXTURES_DIR).
+        latencia (float | str, opcional): Latência simulada na reprodução (padrão: NBA_HTTP_LATENCIA).
+
+    Returns:
+        dict | None: Configuração ativa, que pode ser repassada a outros processos.
+    """
+    global _configuracao
+    modo = modo if modo is not None else MODO
+    if not modo:
+        return None
+    if modo not in MODOS:
+        raise ValueError(f"Modo de transporte desconhecido: {modo} (use {', '.join(MODOS)}).")
+
+    with _lock:
+        _configuracao = {
+            "modo": modo,
+            "diretorio": diretorio or FIXTURES_DIR,
+            "latencia": latencia if latencia is not None else LATENCIA,
+        }
+        requests.sessions.Session.request = _request
+    return dict(_configuracao)
+
+
+def desativar_transporte():
+    """Volta a fazer as requisições HTTP normalmente."""
+    global _configuracao
+    with _lock:
+        _configuracao = None
+        requests.sessions.Session.request = _request_original
+
+
+def configuracao_transporte():
+    """Retorna a configuração ativa do transporte (ou None), para ser reaplicada em outro processo."""
+    return dict(_configuracao) if _configuracao else None
+
+
+def estatisticas_http():
+    """
+    Retorna a quantidade de requisições e de bytes recebidos (ou reproduzidos) desde a última contagem zerada.
+
+    Só são contadas as requisições feitas com o transporte ativo.
+    """
+    with _lock:
+        return dict(_estatisticas)
+
+
+def zerar_estatisticas_http():
+    """Zera a contagem de requisições e bytes."""
+    with _lock:
+        _estatisticas.update(requisicoes=0, bytes=0)
@@ -0,0 +1,177 @@
+# Monkey patch para corrigir a ausência da propriedade "A" em matrizes esparsas (usada pelo pygam)
+import scipy.sparse
+if not hasattr(scipy.sparse.csr_matrix, 'A'):
+    scipy.sparse.csr_matrix.A = property(lambda self: self.toarray())
+
+# Patch para evitar o erro de deprecated do np.int (se necessário)
+import numpy as np
+np.int = int
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from pygam import PoissonGAM, LinearGAM, s
+
+from src.data.repositorio_gamelogs import carregar_gamelog, precarregar_gamelogs
+from src.models.registro import consultar_modelo, registrar_modelo
+from src.utils.instrumentacao import span
+from src.utils.paralelismo import processos_disponiveis
+
+# Processos usados para ajustar os modelos em paralelo (0 = número de CPUs)
+WORKERS_MODELOS = int(os.getenv("NBA_MODELOS_WORKERS", "0"))
+
+# Estatísticas modeladas para cada jogador
+ESTATISTICAS = ['points', 'rebounds', 'assists']
+
+# Coluna dos game logs (e métrica dos agregados) de cada estatística modelada
+METRICAS_ESTATISTICAS = {'points': 'PTS', 'rebounds': 'REB', 'assists': 'AST'}
+
+# GAMs ajustados para cada série, pelo tipo usado no registro de modelos
+MODELOS_GAM = {"gam_poisson": PoissonGAM, "gam_linear": LinearGAM}
+
+# Fatores aplicados à suavização anterior na busca em grade de um ajuste aquecido
+GRADE_AQUECIDA = np.logspace(-1, 1, 3)
+
+
+def carregar_dados_jogadores(players, team_abbr="BKN", seasons=["2023-24", "2024-25"]):
+    """
+    Monta os dados dos jogos de cada jogador pelo time, numerados em ordem cronológica em cada temporada.
+
+    Args:
+        players (dict): ID do jogador -> nome.
+        team_abbr (str): Sigla do time (padrão: "BKN").
+        seasons (list): Temporadas no formato 'YYYY-YY'.
+
+    Returns:
+        pd.DataFrame | None: Colunas team, player_id, game, points, rebounds e assists, ou None sem dados.
+    """
+    data_list = []
+    # Os logs de todos os jogadores e temporadas são carregados no repositório em paralelo
+    precarregar_gamelogs(list(players), seasons)
+
+    for season in seasons:
+        for pid, player_name in players.items():
+            print(f"Buscando dados para {player_name} na temporada {season}...")
+            try:
+                df = carregar_gamelog(pid, season)
+                # Filtrar jogos do time usando a coluna "MATCHUP"
+                df = df[df["MATCHUP"].str.contains(team_abbr)]
+                if df.empty:
+                    print(f"Não há dados para {player_name} na temporada {season}.")
+                    continue
+                df = df.sort_values("GAME_DATE")
+                df["game"] = range(1, len(df) + 1)
+                df["player_id"] = pid
+                df["team"] = team_abbr
+                df = df.rename(columns={metrica: stat for stat, metrica in METRICAS_ESTATISTICAS.items()})
+                df = df[["team", "player_id", "game", "points", "rebounds", "assists"]]
+                data_list.append(df)
+            except Exception as e:
+                print(f"Erro ao buscar dados para {player_name} na temporada {season}: {e}")
+
+    if not data_list:
+        print("Nenhum dado foi recuperado da API nba_api.")
+        return None
+
+    return pd.concat(data_list, ignore_index=True)
+
+
+def ajustar_gam(tipo, X, y, lam=None, **atributos):
+    """
+    Ajusta um GAM de uma série, com a busca em grade da suavização.
+
+    Args:
+        tipo (str): 'gam_poisson' ou 'gam_linear'.
+        X (np.ndarray): Número do jogo, com formato (n, 1).
+        y (np.ndarray): Estatística em cada jogo.
+        lam (float, opcional): Suavização do ajuste anterior. Quando informada, a busca fica restrita a
+            GRADE_AQUECIDA em torno dela (warm start) em vez da grade completa do pygam.
+        **atributos: Informações do span da instrumentação (ex.: player_name e stat).
+
+    Returns:
+        Modelo ajustado.
+    """
+    modelo = MODELOS_GAM[tipo](s(0))
+    grade = {} if lam is None else {"lam": lam * GRADE_AQUECIDA}
+    with span("ajuste", tipo, aquecido=lam is not None, **atributos):
+        modelo.gridsearch(X, y, progress=False, **grade)
+    return modelo
+
+
+def ajustar_gams_jogadores(data, players, stats=None, workers=None, diretorio=None):
+    """
+    Ajusta (ou carrega do registro) os GAMs de cada jogador e estatística.
+
+    Os modelos ficam no registro (src/models/registro.py), identificados pelo jogador, time e estatística.
+    Se os dados da série não mudaram, por esta ou por outra etapa (a Parte 3 RF7 e a RF8 usam os mesmos
+    modelos), o modelo salvo é usado. Se só foram acrescentados jogos, o novo ajuste parte da suavização
+    do anterior. Os ajustes que faltam rodam em paralelo, um processo por modelo.
+
+    Args:
+        data (pd.DataFrame): Dados de carregar_dados_jogadores().
+        players (dict): ID do jogador -> nome.
+        stats (list, opcional): Estatísticas modeladas (padrão: ESTATISTICAS).
+        workers (int, opcional): Processos em paralelo (padrão: WORKERS_MODELOS ou o número de CPUs),
+            limitados, dentro do pipeline, ao orçamento da etapa (src/utils/paralelismo.py).
+        diretorio (str, opcional): Pasta do registro (padrão: REGISTRO_DIR).
+
+    Returns:
+        dict: modelos[nome][stat] = {'X', 'y', 'poisson', 'linear'}, na ordem dos jogadores e estatísticas.
+        Jogadores sem dados ficam de fora.
+    """
+    stats = stats or ESTATISTICAS
+    series = {}
+    for pid, player_name in players.items():
+        player_data = data[data['player_id'] == pid]
+        if player_data.empty:
+            continue
+        for stat in stats:
+            X = player_data['game'].values.reshape(-1, 1)
+            y = player_data[stat].values
+            series[(player_name, stat)] = (X, y, {"player_id": pid, "team": player_data['team'].iloc[0], "stat": stat})
+
+    ajustes = {}
+    pendentes = {}
+    for (player_name, stat), (X, y, identificacao) in series.items():
+        for tipo in MODELOS_GAM:
+            situacao, anterior = consultar_modelo(tipo, identificacao, X, y, diretorio)
+            if situacao == "atual":
+                ajustes[(player_name, stat, tipo)] = anterior
+            else:
+                # Com jogos novos no fim da série, a busca parte da suavização escolhida antes
+                lam = float(np.ravel(anterior.lam)[0]) if situacao == "ampliado" else None
+                pendentes[(player_name, stat, tipo)] = lam
+
+    if pendentes:
+        workers = min(processos_disponiveis(workers or WORKERS_MODELOS), len(pendentes))
+        aquecidos = sum(lam is not None for lam in pendentes.values())
+        print(f"Ajustando {len(pendentes)} GAM(s) ({aquecidos} a partir do ajuste anterior, "
+              f"{len(ajustes)} carregado(s) do registro) com {workers} processo(s)...")
+        argumentos = {
+            chave: (chave[2], *series[chave[:2]][:2], lam) for chave, lam in pendentes.items()
+        }
+        with span("ajuste", "gams_jogadores", ajustes=len(pendentes), workers=workers):
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futuros = {
+                        chave: pool.submit(ajustar_gam, *args, player_name=chave[0], stat=chave[1])
+                        for chave, args in argumentos.items()
+                    }
+                    novos = {chave: futuro.result() for chave, futuro in futuros.items()}
+            else:
+                novos = {chave: ajustar_gam(*args, player_name=chave[0], stat=chave[1]) for chave, args in argumentos.items()}
+        for (player_name, stat, tipo), modelo in novos.items():
+            X, y, identificacao = series[(player_name, stat)]
+            registrar_modelo(tipo, identificacao, X, y, modelo, diretorio)
+        ajustes.update(novos)
+
+    modelos = {}
+    for (player_name, stat), (X, y, _) in series.items():
+        modelos.setdefault(player_name, {})[stat] = {
+            'X': X,
+            'y': y,
+            'poisson': ajustes[(player_name, stat, 'gam_poisson')],
+            'linear': ajustes[(player_name, stat, 'gam_linear')],
+        }
+    return modelos
@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import time
+import pickle
+import hashlib
+
+import numpy as np
+
+from src.utils.instrumentacao import span
+
+# Registro dos modelos ajustados da Parte 3 (regressões e GAMs).
+# Cada modelo é identificado pelo tipo e por um dicionário de identificação (features, target, jogador,
+# time, temporada...) e fica salvo em REGISTRO_DIR/<tipo>/<hash da identificação>.pkl junto com a
+# impressão digital dos dados usados no ajuste. Na consulta, o modelo é:
+#   - 'atual': ajustado com os mesmos dados, e é devolvido sem novo ajuste;
+#   - 'ampliado': ajustado com as primeiras linhas dos dados atuais (jogos novos no fim), e pode servir
+#     de ponto de partida para o novo ajuste;
+#   - 'alterado': ajustado com outros dados da mesma identificação;
+#   - 'ausente': nunca ajustado (ou salvo com outra versão da biblioteca).
+REGISTRO_DIR = os.getenv("NBA_MODELOS_DIR", "data/modelos")
+
+SITUACOES = ("atual", "ampliado", "alterado", "ausente")
+
+
+def impressao_dados(X, y):
+    """
+    Calcula a impressão digital (SHA-256) dos dados de um ajuste.
+
+    Considera os nomes das colunas (DataFrames), o formato e os valores como float64, então a mesma
+    tabela com outro índice ou outro tipo inteiro tem a mesma impressão.
+    """
+    h = hashlib.sha256()
+    for parte in (X, y):
+        if hasattr(parte, "columns"):
+            h.update(json.dumps([str(coluna) for coluna in parte.columns]).encode("utf-8"))
+        valores = np.ascontiguousarray(np.asarray(parte, dtype=np.float64))
+        h.update(str(valores.shape).encode("utf-8"))
+        h.update(valores.tobytes())
+    return h.hexdigest()
+
+
+def _primeiras_linhas(dados, n):
+    return dados.iloc[:n] if hasattr(dados, "iloc") else dados[:n]
+
+
+def _versao_biblioteca(modelo):
+    # Versão do pacote do modelo (sklearn, pygam...); um modelo salvo com outra versão é descartado
+    pacote = type(modelo).__module__.split(".")[0]
+    return getattr(sys.modules.get(pacote), "__version__", None)
+
+
+def caminho_modelo(tipo, identificacao, diretorio=None):
+    """Retorna o arquivo do modelo de um tipo e identificação no registro."""
+    chave = hashlib.sha256(json.dumps(identificacao, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return os.path.join(diretorio or REGISTRO_DIR, tipo, f"{chave[:32]}.pkl")
+
+
+def _ler_registro(caminho):
+    try:
+        with open(caminho, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Modelo salvo em {caminho} não pôde ser lido e será ajustado de novo: {e}")
+        return None
+
+
+def consultar_modelo(tipo, identificacao, X, y, diretorio=None):
+    """
+    Consulta o registro para os dados de um ajuste.
+
+    Args:
+        tipo (str): Tipo do modelo (ex.: 'regressao_linear', 'gam_poisson').
+        identificacao (dict): Features, target, jogador, time, temporada etc.
+        X: Dados de entrada (DataFrame ou array).
+        y: Valores observados.
+        diretorio (str, opcional): Pasta do registro (padrão: REGISTRO_DIR).
+
+    Returns:
+        tuple: (situação, modelo). A situação é uma das SITUACOES; o modelo é o salvo no registro
+        (None quando 'ausente').
+    """
+    caminho = caminho_modelo(tipo, identificacao, diretorio)
+    registro = _ler_registro(caminho) if os.path.exists(caminho) else None
+    if registro is None or registro.get("versao") != _versao_biblioteca(registro["modelo"]):
+        return "ausente", None
+
+    linhas = len(y)
+    if registro["linhas"] == linhas and registro["impressao"] == impressao_dados(X, y):
+        return "atual", registro["modelo"]
+    if registro["linhas"] < linhas and registro["impressao"] == impressao_dados(
+            _primeiras_linhas(X, registro["linhas"]), _primeiras_linhas(y, registro["linhas"])):
+        return "ampliado", registro["modelo"]
+    return "alterado", registro["modelo"]
+
+
+def registrar_modelo(tipo, identificacao, X, y, modelo, diretorio=None):
+    """Salva no registro um modelo ajustado com os dados X e y."""
+    caminho = caminho_modelo(tipo, identificacao, diretorio)
+    registro = {
+        "tipo": tipo,
+        "identificacao": identificacao,
+        "impressao": impressao_dados(X, y),
+        "linhas": len(y),
+        "versao": _versao_biblioteca(modelo),
+        "atualizado_em": time.time(),
+        "modelo": modelo,
+    }
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(caminho_tmp, "wb") as f:
+        pickle.dump(registro, f)
+    os.replace(caminho_tmp, caminho)
+
+
+def obter_modelo(tipo, identificacao, X, y, ajustar, aquecer=None, diretorio=None):
+    """
+    Retorna o modelo de um ajuste, usando o registro sempre que possível.
+
+    Se os dados não mudaram, o modelo salvo é devolvido sem novo ajuste. Se mudaram e houver um modelo
+    anterior da mesma identificação, `aquecer` pode reaproveitá-lo no novo ajuste (warm start). Nos
+    demais casos, o modelo é ajustado do zero com `ajustar`. O modelo novo é salvo no registro.
+
+    Args:
+        tipo (str): Tipo do modelo (ex.: 'regressao_linear').
+        identificacao (dict): Features, target, jogador, time, temporada etc.
+        X: Dados de entrada (DataFrame ou array).
+        y: Valores observados.
+        ajustar (callable): ajustar(X, y) -> modelo ajustado do zero.
+        aquecer (callable, opcional): aquecer(anterior, X, y, ampliado) -> modelo ajustado a partir do
+            anterior, ou None para ajustar do zero. `ampliado` indica que só foram acrescentadas linhas.
+        diretorio (str, opcional): Pasta do registro (padrão: REGISTRO_DIR).
+
+    Returns:
+        Modelo ajustado.
+    """
+    situacao, anterior = consultar_modelo(tipo, identificacao, X, y, diretorio)
+    if situacao == "atual":
+        return anterior
+
+    modelo = None
+    with span("ajuste", tipo, situacao=situacao, **identificacao):
+        if anterior is not None and aquecer is not None:
+            modelo = aquecer(anterior, X, y, situacao == "ampliado")
+        if modelo is None:
+            modelo = ajustar(X, y)
+    registrar_modelo(tipo, identificacao, X, y, modelo, diretorio)
+    return modelo
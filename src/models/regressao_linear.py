@@ -1,6 +1,77 @@
+import numpy as np
+import pandas as pd
 from sklearn.linear_model import LinearRegression
 
 def aplicar_regressao(X, y):
     model = LinearRegression()
     model.fit(X, y)
     return model
+
+def _prever_sem_linha(X, Y, i):
+    # Ajuste de mínimos quadrados (com intercepto e solução de norma mínima, como o LinearRegression)
+    # sem a linha i, avaliado nela
+    manter = np.arange(len(X)) != i
+    media_x, media_y = X[manter].mean(axis=0), Y[manter].mean(axis=0)
+    coef = np.linalg.lstsq(X[manter] - media_x, Y[manter] - media_y, rcond=None)[0]
+    return media_y + (X[i] - media_x) @ coef
+
+def previsoes_loocv(X, Y, tolerancia=1e-10):
+    """
+    Previsões da validação cruzada leave-one-out da regressão linear, sem um ajuste por linha.
+
+    Para mínimos quadrados, a previsão da linha i pelo modelo ajustado sem ela é y_i - e_i / (1 - h_i),
+    onde e_i é o resíduo do ajuste com todas as linhas e h_i a diagonal da matriz chapéu. Uma única SVD
+    resolve todos os targets de uma vez. Linhas com h_i = 1 (sem ela o posto do problema cai, como em
+    amostras com menos linhas que coeficientes) são ajustadas sem a linha, como no LeaveOneOut do sklearn.
+
+    Args:
+        X (array): Features, com formato (n, p).
+        Y (array): Um target (n,) ou vários (n, k).
+        tolerancia (float): Margem abaixo de 1 para a fórmula da matriz chapéu ser usada.
+
+    Returns:
+        np.ndarray: Previsões com o mesmo formato de Y (NaN com menos de duas linhas).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    Y = np.asarray(Y, dtype=np.float64)
+    um_target = Y.ndim == 1
+    Y = Y.reshape(len(Y), -1)
+    n = len(X)
+    previsoes = np.full(Y.shape, np.nan)
+
+    if n >= 2:
+        media_x, media_y = X.mean(axis=0), Y.mean(axis=0)
+        U, valores_singulares, _ = np.linalg.svd(X - media_x, full_matrices=False)
+        posto = valores_singulares > valores_singulares.max(initial=0) * max(X.shape) * np.finfo(np.float64).eps
+        U = U[:, posto]
+        alavancagem = 1 / n + (U ** 2).sum(axis=1)
+        residuos = (Y - media_y) - U @ (U.T @ (Y - media_y))
+
+        regulares = alavancagem < 1 - tolerancia
+        previsoes[regulares] = Y[regulares] - residuos[regulares] / (1 - alavancagem[regulares])[:, None]
+        for i in np.flatnonzero(~regulares):
+            previsoes[i] = _prever_sem_linha(X, Y, i)
+
+    return previsoes[:, 0] if um_target else previsoes
+
+def press(Y, previsoes):
+    """Soma dos quadrados dos erros de previsão leave-one-out (PRESS) de cada target."""
+    erros = np.asarray(Y, dtype=np.float64) - np.asarray(previsoes, dtype=np.float64)
+    return (erros ** 2).sum(axis=0)
+
+def agrupar_targets(df, features, targets):
+    """
+    Agrupa os targets que têm as mesmas linhas válidas, para ajustá-los juntos (multi-output).
+
+    Cada target usa as linhas sem valores ausentes nas features e nele mesmo, como em um dropna() por
+    target. Os targets com o mesmo conjunto de linhas formam um grupo; quase sempre há um só.
+
+    Returns:
+        list: Pares (linhas, targets do grupo), na ordem dos targets. `linhas` é o índice das linhas válidas.
+    """
+    features_validas = df[features].notna().all(axis=1)
+    grupos = {}
+    for target in targets:
+        linhas = tuple(df.index[features_validas & df[target].notna()])
+        grupos.setdefault(linhas, []).append(target)
+    return [(pd.Index(linhas, dtype=df.index.dtype), alvos) for linhas, alvos in grupos.items()]
@@ -1,6 +1,69 @@
+import numpy as np
 from sklearn.linear_model import LogisticRegression
 
+# Iterações e tolerância (no gradiente) do ajuste em lote
+ITERACOES_LOTE = 50
+TOLERANCIA_LOTE = 1e-8
+
 def regressao_logistica(X, y):
     model = LogisticRegression()
     model.fit(X, y)
     return model
+
+def _objetivo(coef, X1, Y, pesos, C):
+    z = X1 @ coef.T
+    perda = np.where(pesos > 0, np.logaddexp(0, z) - Y * z, 0).sum(axis=0)
+    return C * perda + 0.5 * (coef[:, :-1] ** 2).sum(axis=1)
+
+def ajustar_logisticas(X, Y, C=1.0, inicial=None):
+    """
+    Ajusta várias regressões logísticas binárias com as mesmas features de uma vez (método de Newton).
+
+    Minimiza o mesmo objetivo do LogisticRegression padrão do sklearn (penalidade L2 com C, intercepto
+    sem penalidade) para cada coluna de Y, com gradientes e hessianas de todos os problemas calculados
+    juntos.
+
+    Args:
+        X (array): Features, com formato (n, p).
+        Y (array): Classes (0 ou 1) de cada problema, com formato (n, k). Linhas com -1 ficam fora do
+            ajuste daquele problema (ex.: as de teste).
+        C (float): Inverso da força da regularização, como no sklearn.
+        inicial (array, opcional): Coeficientes iniciais (k, p + 1), por exemplo os de um ajuste anterior
+            ou de um limiar vizinho (warm start).
+
+    Returns:
+        np.ndarray: Coeficientes (k, p + 1), com o intercepto na última coluna.
+    """
+    X1 = np.column_stack([np.asarray(X, dtype=np.float64), np.ones(len(X))])
+    Y = np.asarray(Y, dtype=np.float64).reshape(len(X1), -1)
+    pesos = (Y >= 0).astype(np.float64)
+    Y = np.where(pesos > 0, Y, 0)
+    k, d = Y.shape[1], X1.shape[1]
+    penalidade = np.diag(np.r_[np.ones(d - 1), 0.0])
+
+    coef = np.zeros((k, d)) if inicial is None else np.array(inicial, dtype=np.float64).reshape(k, d)
+    objetivo = _objetivo(coef, X1, Y, pesos, C)
+    for _ in range(ITERACOES_LOTE):
+        P = 1 / (1 + np.exp(-(X1 @ coef.T)))
+        gradiente = C * ((pesos * (P - Y)).T @ X1) + coef @ penalidade
+        if np.abs(gradiente).max() <= TOLERANCIA_LOTE:
+            break
+        hessiana = C * np.einsum("nd,nk,ne->kde", X1, pesos * P * (1 - P), X1) + penalidade
+        passo = np.linalg.solve(hessiana, gradiente[..., None])[..., 0]
+
+        # Passo de Newton com busca linear: o passo é reduzido à metade nos problemas em que o objetivo não cai
+        fator = np.ones(k)
+        for _ in range(30):
+            novo = coef - fator[:, None] * passo
+            novo_objetivo = _objetivo(novo, X1, Y, pesos, C)
+            piorou = novo_objetivo > objetivo + 1e-12
+            if not piorou.any():
+                break
+            fator = np.where(piorou, fator / 2, fator)
+        coef, objetivo = np.where(piorou[:, None], coef, novo), np.where(piorou, objetivo, novo_objetivo)
+    return coef
+
+def probabilidades_logisticas(coef, X):
+    """Probabilidade da classe 1 de cada linha de X em cada problema: formato (n, k)."""
+    X1 = np.column_stack([np.asarray(X, dtype=np.float64), np.ones(len(X))])
+    return 1 / (1 + np.exp(-(X1 @ np.asarray(coef).T)))
@@ -0,0 +1,305 @@
+import os
+
+from src.rf.parte1.parte1_rf1 import listar_times_conferencia
+from src.rf.parte1.parte1_rf2 import apresentar_classificacao_atual
+from src.rf.parte1.parte1_rf3 import processar_temporadas
+from src.rf.parte1.parte1_rf4 import calcular_e_salvar_rf4
+from src.rf.parte1.parte1_rf5 import apresentar_dados_divididos
+from src.rf.parte1.parte1_rf6 import apresentar_performance_defensiva
+from src.rf.parte1.parte1_rf7 import apresentar_jogos_do_time
+from src.rf.parte1.parte1_rf8 import rf_graficos_desempenho_brooklyn_nets
+from src.rf.parte2.parte2_rf1 import apresentar_dados_jogadores
+from src.rf.parte2.parte2_rf2 import apresentar_dados_partidas_time_por_id
+from src.rf.parte2.parte2_rf3 import apresentar_dados_partidas_contra_time
+from src.rf.parte2.parte2_rf4 import apresentar_dados_jogos_casa_fora
+from src.analytics.agregados import AGREGADOS_DIR, TEMPORADA_PADRAO, atualizar_agregados, caminho_agregados
+from src.rf.parte2.parte2_rf5 import calcular_e_apresentar_medias
+from src.rf.parte2.parte2_rf6 import calcular_e_apresentar_medianas
+from src.rf.parte2.parte2_rf7 import calcular_e_apresentar_modas
+from src.rf.parte2.parte2_rf8 import calcular_e_apresentar_desvios
+from src.rf.parte2.parte2_rf9 import apresentar_totais_carreira
+from src.rf.parte2.parte2_rf10 import comparar_estatisticas
+from src.rf.parte3.parte3_rf1 import aplicar_metodo_gumbel_jogadores, gumbel_liga
+from src.rf.parte3.parte3_rf2 import visualizar_resultados_gumbel
+from src.rf.parte3.parte3_rf3 import analisar_regressao_linear
+from src.rf.parte3.parte3_rf4 import graficos_regressao_linear
+from src.rf.parte3.parte3_rf5_rf6 import analisar_regressao_logistica_graficos
+from src.rf.parte3.parte3_rf7 import gamlss_brooklyn_nets
+from src.rf.parte3.parte3_rf8 import graficos_gamglss_nets
+from src.data.cache_api import calcular_ttl, TTL_POR_ENDPOINT
+from src.data.repositorio_gamelogs import precarregar_repositorio, caminho_gamelog
+from src.data.liga import SIGLAS_BASKETBALL_REFERENCE
+from src.utils.copiar_pasta import copiar_pastas, PASTAS_DASHBOARD
+from src.utils.pipeline import INTERMEDIARIOS_DIR
+
+# Configurações do projeto
+team_id = 1610612751  # ID do Brooklyn Nets
+seasons = ["2023-24", "2024-25"]
+
+player_names = ["Cam Thomas", "Cameron Johnson", "D'Angelo Russell"]
+
+players = [
+    {'PLAYER': 'Cam Thomas', 'PLAYER_ID': 1630560},
+    {'PLAYER': 'Cameron Johnson', 'PLAYER_ID': 1629661},
+    {'PLAYER': 'D\'Angelo Russell', 'PLAYER_ID': 1626156}
+]
+
+# Valores de X usados no método de Gumbel (Parte 3 RF1) para cada jogador
+valores_gumbel = {
+    "Cam Thomas": {'PTS': 20, 'REB': 15, 'AST': 10},
+    "Cameron Johnson": {'PTS': 15, 'REB': 10, 'AST': 5},
+    "D'Angelo Russell": {'PTS': 25, 'REB': 20, 'AST': 15},
+}
+
+# Time analisado quando o pipeline roda para um único time.
+# 'elenco_completo' faz a Parte 2 RF2 usar o elenco atual inteiro, buscado na API, em vez de 'players'.
+time_padrao = {
+    "team_id": team_id,
+    "team_abbr": "BKN",
+    "team_name": "Brooklyn Nets",
+    "players": players,
+    "valores_gumbel": valores_gumbel,
+    "elenco_completo": True,
+}
+
+# Valores de X do método de Gumbel para os jogadores do modo liga, que não têm valores próprios
+VALORES_GUMBEL_PADRAO = {'PTS': 20, 'REB': 10, 'AST': 5}
+
+# Adversários da Parte 2 RF3 e RF4; o reserva é usado quando o adversário é o próprio time
+ADVERSARIO_RF3 = "LAL"
+ADVERSARIO_RF4 = "PHI"
+ADVERSARIO_RESERVA = "BOS"
+
+# Locais do repositório de game logs lidos pelas etapas
+GAMELOGS_JOGADORES = ["data/gamelogs/jogadores"]
+GAMELOGS_TIME = ["data/gamelogs/times", "data/gamelogs/liga"]
+
+# Pasta dos relatórios do modo liga: reports/liga/<sigla do time>/...
+RELATORIOS_LIGA_DIR = "reports/liga"
+
+
+def _validade(endpoint=None, temporadas=None):
+    # Por quanto tempo o resultado de uma etapa que consulta a API continua válido (None = não expira)
+    ttls = [calcular_ttl("", {"Season": season}) for season in temporadas or seasons]
+    if all(ttl is None for ttl in ttls):
+        return None
+    return TTL_POR_ENDPOINT.get(endpoint) or min(ttl for ttl in ttls if ttl is not None)
+
+
+def _etapa(parte, funcao, kwargs=None, depende_de=(), saidas=(), entradas=(), intermediarios=None, validade=None):
+    return {
+        "parte": parte,
+        "funcao": funcao,
+        "kwargs": kwargs or {},
+        "depende_de": list(depende_de),
+        "saidas": list(saidas),
+        "entradas": list(entradas),
+        "intermediarios": intermediarios or {},
+        "validade": validade,
+    }
+
+
+def _kwargs_parte2(rf, base="reports", **kwargs):
+    return dict(kwargs, output_dir=f"{base}/arquivos_csv/parte2/parte2-{rf}",
+                html_dir=f"{base}/html/parte2/parte2-{rf}", img_dir=f"{base}/imagens/parte2/parte2-{rf}")
+
+
+def _saidas_parte2(rf, base="reports"):
+    return [f"{base}/arquivos_csv/parte2/parte2-{rf}", f"{base}/html/parte2/parte2-{rf}", f"{base}/imagens/parte2/parte2-{rf}"]
+
+
+def _saidas_parte(parte, base="reports"):
+    return [f"{base}/arquivos_csv/{parte}", f"{base}/html/{parte}", f"{base}/imagens/{parte}"]
+
+
+def _adversario(sigla, time):
+    return ADVERSARIO_RESERVA if sigla == time["team_abbr"] else sigla
+
+
+def _entradas_gamelogs(time, temporadas):
+    # Apenas os arquivos do time, da liga e dos jogadores analisados, para que a impressão digital
+    # de cada etapa não percorra os game logs de todos os times
+    entradas_time = [caminho_gamelog(time["team_id"], season, tipo="times") for season in temporadas]
+    entradas_time += [caminho_gamelog(None, season, tipo="liga") for season in temporadas]
+    entradas_jogadores = [caminho_gamelog(p["PLAYER_ID"], season) for season in temporadas for p in time["players"]]
+    return entradas_time, entradas_jogadores
+
+
+def _etapas_gerais(base="reports"):
+    # Etapas que cobrem a liga inteira e não dependem do time analisado
+    kwargs = {"output_dir": f"{base}/imagens/parte1/parte1", "html_dir": f"{base}/html/parte1", "img_dir": f"{base}/imagens/parte1"}
+    return {
+        "P1-RF1": _etapa("parte1", listar_times_conferencia, kwargs, saidas=_saidas_parte("parte1", base)),
+        "P1-RF2": _etapa("parte1", apresentar_classificacao_atual, kwargs,
+                         saidas=_saidas_parte("parte1", base), validade=TTL_POR_ENDPOINT["leaguestandingsv3"]),
+    }
+
+
+def montar_etapas_time(time, temporadas, base="reports", prefixo="", dados=(), entradas_time=None, entradas_jogadores=None):
+    """
+    Monta as etapas dos RFs de um time (as das Partes 1, 2 e 3 que dependem do time analisado).
+
+    Args:
+        time (dict): team_id, team_abbr (sigla da nba_api), team_name e players e, opcionalmente,
+            valores_gumbel e elenco_completo.
+        temporadas (list): Temporadas no formato 'YYYY-YY'.
+        base (str): Pasta base dos relatórios.
+        prefixo (str): Prefixo dos nomes das etapas (ex.: 'BKN/').
+        dados (tuple): Etapas que carregam os game logs, das quais dependem as etapas que os leem.
+        entradas_time (list, opcional): Game logs de time que entram na impressão digital (padrão: GAMELOGS_TIME).
+        entradas_jogadores (list, opcional): Game logs de jogadores que entram na impressão digital
+            (padrão: GAMELOGS_JOGADORES).
+
+    Returns:
+        dict: Etapas do time, na ordem do main.
+    """
+    entradas_time = entradas_time or GAMELOGS_TIME
+    entradas_jogadores = entradas_jogadores or GAMELOGS_JOGADORES
+    elenco = time["players"]
+    nomes = [player['PLAYER'] for player in elenco]
+    gumbel = time.get("valores_gumbel") or {nome: VALORES_GUMBEL_PADRAO for nome in nomes}
+
+    parte1 = {"output_dir": f"{base}/arquivos_csv/parte1", "html_dir": f"{base}/html/parte1", "img_dir": f"{base}/imagens/parte1"}
+    parte3 = {"output_dir": f"{base}/arquivos_csv/parte3", "html_dir": f"{base}/html/parte3", "img_dir": f"{base}/imagens/parte3"}
+    saidas_parte1 = _saidas_parte("parte1", base)
+    saidas_parte3 = _saidas_parte("parte3", base)
+    saidas_rf8 = [f"{base}/html/parte1", f"{base}/arquivos_csv/parte1/parte1-rf8", f"{base}/imagens/parte1/parte1-rf8"]
+    saidas_rf5_rf6 = [f"{base}/arquivos_csv/parte3/parte3-rf5-rf6", f"{base}/html/parte3/parte3-rf5-rf6",
+                      f"{base}/imagens/parte3/parte3-rf5-rf6"]
+    regressao = dict(parte3, team_id=time["team_id"], seasons=temporadas, team_name=time["team_name"])
+    gamlss = {"players": elenco, "team_abbr": time["team_abbr"], "seasons": temporadas, "csv_dir": parte3["output_dir"],
+              "html_dir": parte3["html_dir"], "img_dir": parte3["img_dir"]}
+    histogramas = [caminho_agregados(season, time["team_abbr"], sufixo="_histogramas.json") for season in temporadas]
+    kwargs_rf2 = {"team_id": time["team_id"], "team_abbr": time["team_abbr"]}
+    if not time.get("elenco_completo"):
+        kwargs_rf2["players"] = elenco
+
+    etapas = {
+        "P1-RF3": _etapa("parte1", processar_temporadas,
+                         {"team_id": time["team_id"], "seasons": temporadas, "output_dir": f"{base}/imagens/parte1/parte1",
+                          "img_dir": f"{base}/imagens/parte1", "html_dir": f"{base}/html/parte1", "team_name": time["team_name"]},
+                         depende_de=dados, saidas=saidas_parte1, entradas=entradas_time),
+        "P1-RF4": _etapa("parte1", calcular_e_salvar_rf4, dict(parte1, team_id=time["team_id"], temporadas=temporadas),
+                         depende_de=dados, saidas=saidas_parte1, entradas=entradas_time),
+        "P1-RF5": _etapa("parte1", apresentar_dados_divididos,
+                         dict(parte1, team_id=time["team_id"], seasons=temporadas, team_name=time["team_name"]),
+                         depende_de=dados, saidas=saidas_parte1, entradas=entradas_time),
+        "P1-RF6": _etapa("parte1", apresentar_performance_defensiva,
+                         dict(parte1, team_id=time["team_id"], temporadas=temporadas, team_name=time["team_name"]),
+                         depende_de=dados, saidas=saidas_parte1, entradas=entradas_time),
+        "P1-RF7": _etapa("parte1", apresentar_jogos_do_time,
+                         dict(parte1, team_abbr=SIGLAS_BASKETBALL_REFERENCE.get(time["team_abbr"], time["team_abbr"]),
+                              seasons=temporadas),
+                         saidas=saidas_parte1, validade=_validade(temporadas=temporadas)),
+        "P1-RF8": _etapa("parte1", rf_graficos_desempenho_brooklyn_nets,
+                         {"team_id": time["team_id"], "seasons": temporadas, "html_output_dir": saidas_rf8[0],
+                          "csv_output_dir": saidas_rf8[1], "img_output_dir": saidas_rf8[2], "team_name": time["team_name"]},
+                         depende_de=dados, entradas=entradas_time, saidas=saidas_rf8),
+        "P2-RF1": _etapa("parte2", apresentar_dados_jogadores, _kwargs_parte2("rf1", base, player_names=nomes),
+                         saidas=_saidas_parte2("rf1", base), validade=TTL_POR_ENDPOINT["commonplayerinfo"]),
+        "P2-RF2": _etapa("parte2", apresentar_dados_partidas_time_por_id, _kwargs_parte2("rf2", base, **kwargs_rf2),
+                         depende_de=dados, saidas=_saidas_parte2("rf2", base), entradas=entradas_jogadores,
+                         validade=TTL_POR_ENDPOINT["commonteamroster"] if time.get("elenco_completo") else None),
+        "P2-RF3": _etapa("parte2", apresentar_dados_partidas_contra_time,
+                         _kwargs_parte2("rf3", base, opponent_abbr=_adversario(ADVERSARIO_RF3, time),
+                                        team_abbr=time["team_abbr"], players=elenco),
+                         depende_de=dados, saidas=_saidas_parte2("rf3", base), entradas=entradas_jogadores),
+        "P2-RF4": _etapa("parte2", apresentar_dados_jogos_casa_fora,
+                         _kwargs_parte2("rf4", base, opponent_abbr=_adversario(ADVERSARIO_RF4, time),
+                                        team_abbr=time["team_abbr"], players=elenco),
+                         depende_de=dados, saidas=_saidas_parte2("rf4", base), entradas=entradas_jogadores),
+    }
+    # Os agregados e o resumo da temporada são atualizados uma vez, e os RF5 a RF8 só leem o resumo; os
+    # histogramas de todas as temporadas também dão os valores de referência da Parte 3 RF7 e RF8
+    etapas["P2-AGREGADOS"] = _etapa("parte2", atualizar_agregados,
+                                    {"players": elenco, "team_abbr": time["team_abbr"],
+                                     "seasons": list(dict.fromkeys([*temporadas, TEMPORADA_PADRAO]))},
+                                    depende_de=dados, saidas=[AGREGADOS_DIR], entradas=entradas_jogadores)
+    for rf, funcao in [("rf5", calcular_e_apresentar_medias), ("rf6", calcular_e_apresentar_medianas),
+                       ("rf7", calcular_e_apresentar_modas), ("rf8", calcular_e_apresentar_desvios)]:
+        etapas[f"P2-{rf.upper()}"] = _etapa("parte2", funcao,
+                                            _kwargs_parte2(rf, base, players=elenco, team_abbr=time["team_abbr"]),
+                                            depende_de=[f"{prefixo}P2-AGREGADOS"], saidas=_saidas_parte2(rf, base),
+                                            entradas=[caminho_agregados(TEMPORADA_PADRAO, time["team_abbr"],
+                                                                        sufixo="_resumo.parquet")])
+    etapas.update({
+        "P2-RF9": _etapa("parte2", apresentar_totais_carreira, _kwargs_parte2("rf9", base, players=elenco),
+                         saidas=_saidas_parte2("rf9", base), validade=TTL_POR_ENDPOINT["playercareerstats"]),
+        "P2-RF10": _etapa("parte2", comparar_estatisticas,
+                          _kwargs_parte2("rf10", base, players=elenco, team_abbr=time["team_abbr"]),
+                          depende_de=dados, saidas=_saidas_parte2("rf10", base), entradas=entradas_jogadores,
+                          validade=TTL_POR_ENDPOINT["playercareerstats"]),
+        "P3-RF1": _etapa("parte3", aplicar_metodo_gumbel_jogadores,
+                         {"players": elenco, "valores_x_por_jogador": gumbel, "team_abbr": time["team_abbr"]},
+                         depende_de=dados, entradas=entradas_jogadores,
+                         saidas=[os.path.join(INTERMEDIARIOS_DIR, f"{prefixo}P3-RF1.pkl")]),
+        "P3-RF2": _etapa("parte3", visualizar_resultados_gumbel, {"output_dir": f"./{base}/graficos/parte3/parte3-rf2"},
+                         depende_de=[f"{prefixo}P3-RF1"], saidas=[f"{base}/graficos/parte3/parte3-rf2"],
+                         intermediarios={"resultados": f"{prefixo}P3-RF1"}),
+        "P3-RF3": _etapa("parte3", analisar_regressao_linear,
+                         dict(regressao, player_ids=[player['PLAYER_ID'] for player in elenco]),
+                         saidas=saidas_parte3, validade=_validade(temporadas=temporadas)),
+        # A RF4 vem depois da RF3 para carregar do registro as regressões que ela já ajustou (src/models/registro.py)
+        "P3-RF4": _etapa("parte3", graficos_regressao_linear,
+                         dict(regressao, player_ids=[player['PLAYER_ID'] for player in elenco]),
+                         depende_de=[f"{prefixo}P3-RF3"], saidas=saidas_parte3, validade=_validade(temporadas=temporadas)),
+        "P3-RF5-RF6": _etapa("parte3", analisar_regressao_logistica_graficos,
+                             dict(regressao, players=elenco, output_dir=saidas_rf5_rf6[0], html_dir=saidas_rf5_rf6[1],
+                                  img_dir=saidas_rf5_rf6[2]),
+                             saidas=saidas_rf5_rf6, validade=_validade(temporadas=temporadas)),
+        "P3-RF7": _etapa("parte3", gamlss_brooklyn_nets, gamlss,
+                         depende_de=[*dados, f"{prefixo}P2-AGREGADOS"], saidas=saidas_parte3,
+                         entradas=entradas_jogadores + histogramas),
+        # A RF8 vem depois da RF7 para carregar do registro os GAMs que ela já ajustou
+        "P3-RF8": _etapa("parte3", graficos_gamglss_nets, gamlss,
+                         depende_de=[*dados, f"{prefixo}P2-AGREGADOS", f"{prefixo}P3-RF7"], saidas=saidas_parte3,
+                         entradas=entradas_jogadores + histogramas),
+    })
+    return {f"{prefixo}{nome}": etapa for nome, etapa in etapas.items()}
+
+
+def montar_etapas_liga(times, temporadas):
+    """
+    Monta o grafo de etapas do modo liga: as etapas gerais uma vez e os RFs de cada time.
+
+    Os game logs e as estatísticas da liga devem ter sido carregados antes (preparar_dados_liga), então
+    as etapas dos times só leem arquivos locais e rodam em paralelo. As etapas de cada time se chamam
+    '<sigla>/<etapa>' (ex.: 'BKN/P2-RF5') e gravam em reports/liga/<sigla>/.
+
+    Args:
+        times (dict): Sigla -> configuração do time, como retornado por preparar_dados_liga().
+        temporadas (list): Temporadas no formato 'YYYY-YY'.
+
+    Returns:
+        dict: Grafo de etapas.
+    """
+    etapas = _etapas_gerais(RELATORIOS_LIGA_DIR)
+    # Método de Gumbel para todos os jogadores da liga, com os limiares de 0 a 60
+    saidas_gumbel = [f"{RELATORIOS_LIGA_DIR}/arquivos_csv/parte3"]
+    for season in temporadas:
+        etapas[f"P3-RF1-LIGA-{season}"] = _etapa("parte3", gumbel_liga, {"season": season, "output_dir": saidas_gumbel[0]},
+                                                 saidas=saidas_gumbel, entradas=GAMELOGS_JOGADORES)
+    for sigla, time in times.items():
+        entradas_time, entradas_jogadores = _entradas_gamelogs(time, temporadas)
+        etapas_time = montar_etapas_time(time, temporadas, base=f"{RELATORIOS_LIGA_DIR}/{sigla}", prefixo=f"{sigla}/",
+                                         entradas_time=entradas_time, entradas_jogadores=entradas_jogadores)
+        for etapa in etapas_time.values():
+            etapa["time"] = sigla
+        etapas.update(etapas_time)
+    return etapas
+
+
+# Grafo de etapas do projeto, na ordem em que eram executadas pelo main.py.
+# 'depende_de' lista apenas as dependências de dados; as demais etapas podem rodar em paralelo.
+# 'entradas' são os arquivos cujo conteúdo entra na impressão digital da etapa, e 'validade' é o tempo
+# máximo de reaproveitamento das etapas que consultam a API diretamente.
+ETAPAS = {
+    "DADOS-GAMELOGS": _etapa("dados", precarregar_repositorio,
+                             {"player_ids": [player['PLAYER_ID'] for player in players], "team_ids": [team_id], "seasons": seasons},
+                             saidas=["data/gamelogs"], validade=_validade()),
+    **_etapas_gerais(),
+    **montar_etapas_time(time_padrao, seasons, dados=["DADOS-GAMELOGS"]),
+    "DASHBOARD": _etapa("dashboard", copiar_pastas, {"caminhos": PASTAS_DASHBOARD}, depende_de=["P1-RF8", "P2-RF10"],
+                        saidas=[destino for _, destino in PASTAS_DASHBOARD],
+                        entradas=[origem for origem, _ in PASTAS_DASHBOARD]),
+}
@@ -1,6 +1,6 @@
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
+from src.visualizations.tabelas import salvar_tabelas_em_lote
 
 def listar_times_conferencia(output_dir="reports/arquivos_csv/parte1", html_dir="reports/html/parte1", img_dir="reports/imagens/parte1"):
     """
@@ -72,24 +72,12 @@ def listar_times_conferencia(output_dir="reports/arquivos_csv/parte1", html_dir=
     unificada.to_html(unificada_html_path, index=False)
     print(f"Tabelas HTML salvas em: {leste_html_path}, {oeste_html_path} e {unificada_html_path}")
 
-    # Função para salvar como imagem
-    def salvar_tabela_como_imagem(df, img_path, title):
-        fig, ax = plt.subplots(figsize=(10, len(df) * 0.5))  # Ajustar tamanho baseado no número de linhas
-        ax.axis("off")
-        ax.axis("tight")
-        ax.set_title(title, fontsize=16, weight="bold")
-        table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
-        table.auto_set_font_size(False)
-        table.set_fontsize(10)
-        table.auto_set_column_width(col=list(range(len(df.columns))))
-        plt.savefig(img_path, bbox_inches="tight", dpi=300)
-        plt.close()
-        print(f"Tabela salva como imagem em: {img_path}")
-
-    # Salvar tabelas como imagens
-    salvar_tabela_como_imagem(leste, leste_img_path, "Times da Conferência Leste")
-    salvar_tabela_como_imagem(oeste, oeste_img_path, "Times da Conferência Oeste")
-    salvar_tabela_como_imagem(unificada, unificada_img_path, "Times Unificados")
+    # Salvar tabelas como imagens, em paralelo
+    salvar_tabelas_em_lote([
+        (leste, leste_img_path, "Times da Conferência Leste"),
+        (oeste, oeste_img_path, "Times da Conferência Oeste"),
+        (unificada, unificada_img_path, "Times Unificados"),
+    ])
 
     print("Processamento do RF1 concluído.")
     return leste, oeste, unificada
@@ -1,35 +1,27 @@
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
 from datetime import datetime
-from nba_api.stats.endpoints import TeamGameLog
+from src.data.repositorio_gamelogs import carregar_gamelog_time
+from src.visualizations.tabelas import salvar_tabela_como_imagem
+from src.data.transformacoes import jogo_em_casa, local_do_jogo, sigla_adversario, resultado_por_local
 
-# Função para salvar a tabela como imagem
-def salvar_tabela_como_imagem(df, img_path, title):
-    fig, ax = plt.subplots(figsize=(8, len(df) * 0.8))
-    ax.axis("off")
-    ax.axis("tight")
-    ax.set_title(title, fontsize=14, weight="bold")
-    table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.auto_set_column_width(col=list(range(len(df.columns))))
-    plt.savefig(img_path, bbox_inches="tight", dpi=300)
-    plt.close()
 
 # Função principal para processar as temporadas
-def processar_temporadas(team_id=1610612751, seasons=["2023-24", "2024-25"], output_dir="reports/arquivos_csv/parte1", img_dir="reports/imagens/parte1", html_dir="reports/html/parte1"):
+def processar_temporadas(team_id=1610612751, seasons=["2023-24", "2024-25"], output_dir="reports/arquivos_csv/parte1", img_dir="reports/imagens/parte1", html_dir="reports/html/parte1", team_name="Brooklyn Nets"):
     # Garantir que os diretórios existem
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(img_dir, exist_ok=True)
     os.makedirs(html_dir, exist_ok=True)
 
+    # Prefixo dos arquivos a partir do nome do time (ex.: brooklyn_nets)
+    prefixo_time = team_name.lower().replace(" ", "_")
+
     # Processar cada temporada
     for season in seasons:
         print(f"Processando a temporada {season}...")
 
         try:
-            game_log = TeamGameLog(team_id=team_id, season=season).get_data_frames()[0]
+            game_log = carregar_gamelog_time(team_id, season)
         except Exception as e:
             print(f"Erro ao acessar a API para a temporada {season}: {e}")
             continue
@@ -39,8 +31,10 @@ def processar_temporadas(team_id=1610612751, seasons=["2023-24", "2024-25"], out
             continue
 
         # Adicionar colunas de resultado e local do jogo
-        game_log["Resultado"] = game_log["WL"].apply(lambda x: "Vitória" if x == "W" else "Derrota")
-        game_log["Local"] = game_log["MATCHUP"].apply(lambda x: "Casa" if "vs." in x else "Fora")
+        em_casa = jogo_em_casa(game_log["MATCHUP"])
+        vitoria = game_log["WL"] == "W"
+        game_log["Resultado"] = vitoria.map({True: "Vitória", False: "Derrota"})
+        game_log["Local"] = local_do_jogo(game_log["MATCHUP"])
 
         # Calcular totais
         total_vitorias = len(game_log[game_log["Resultado"] == "Vitória"])
@@ -61,32 +55,30 @@ def processar_temporadas(team_id=1610612751, seasons=["2023-24", "2024-25"], out
         })
 
         # Salvar relatório resumo em CSV, HTML e JPG
-        resumo_csv_path = os.path.join(output_dir, f"rf3_resumo_brooklyn_nets_{season}.csv")
-        resumo_html_path = os.path.join(html_dir, f"rf3_resumo_brooklyn_nets_{season}.html")
-        resumo_img_path = os.path.join(img_dir, f"rf3_resumo_brooklyn_nets_{season}.jpg")
+        resumo_csv_path = os.path.join(output_dir, f"rf3_resumo_{prefixo_time}_{season}.csv")
+        resumo_html_path = os.path.join(html_dir, f"rf3_resumo_{prefixo_time}_{season}.html")
+        resumo_img_path = os.path.join(img_dir, f"rf3_resumo_{prefixo_time}_{season}.jpg")
 
         df_resumo.to_csv(resumo_csv_path, index=False, encoding="utf-8-sig")
         df_resumo.to_html(resumo_html_path, index=False)
-        salvar_tabela_como_imagem(df_resumo, resumo_img_path, f"Vitórias e Derrotas - Brooklyn Nets ({season})")
+        salvar_tabela_como_imagem(df_resumo, resumo_img_path, f"Vitórias e Derrotas - {team_name} ({season})", largura=8, altura_linha=0.8, tamanho_titulo=14)
 
         # Criar DataFrame do relatório detalhado por adversário
+        resultado_casa, resultado_fora = resultado_por_local(em_casa, vitoria)
         df_detalhado = pd.DataFrame({
-            "Adversário": game_log["MATCHUP"].str.split(" ").str[-1],
+            "Adversário": sigla_adversario(game_log["MATCHUP"]),
             "Data": game_log["GAME_DATE"],
-            "Casa": game_log.apply(lambda x: 1 if (x["Local"] == "Casa" and x["Resultado"] == "Vitória") else (-1 if (x["Local"] == "Casa" and x["Resultado"] == "Derrota") else 0), axis=1),
-            "Fora": game_log.apply(lambda x: 1 if (x["Local"] == "Fora" and x["Resultado"] == "Vitória") else (-1 if (x["Local"] == "Fora" and x["Resultado"] == "Derrota") else 0), axis=1)
+            "Casa": resultado_casa,
+            "Fora": resultado_fora
         })
 
         # Salvar relatório detalhado em CSV, HTML e JPG
-        detalhado_csv_path = os.path.join(output_dir, f"rf3_detalhado_brooklyn_nets_{season}.csv")
-        detalhado_html_path = os.path.join(html_dir, f"rf3_detalhado_brooklyn_nets_{season}.html")
-        detalhado_img_path = os.path.join(img_dir, f"rf3_detalhado_brooklyn_nets_{season}.jpg")
+        detalhado_csv_path = os.path.join(output_dir, f"rf3_detalhado_{prefixo_time}_{season}.csv")
+        detalhado_html_path = os.path.join(html_dir, f"rf3_detalhado_{prefixo_time}_{season}.html")
+        detalhado_img_path = os.path.join(img_dir, f"rf3_detalhado_{prefixo_time}_{season}.jpg")
 
         df_detalhado.to_csv(detalhado_csv_path, index=False, encoding="utf-8-sig")
         df_detalhado.to_html(detalhado_html_path, index=False)
-        salvar_tabela_como_imagem(df_detalhado, detalhado_img_path, f"Resultados por Adversário - Brooklyn Nets ({season})")
+        salvar_tabela_como_imagem(df_detalhado, detalhado_img_path, f"Resultados por Adversário - {team_name} ({season})", largura=8, altura_linha=0.8, tamanho_titulo=14)
 
         print(f"Temporada {season} processada com sucesso.")
-
-# Chamar a função principal
-processar_temporadas()
@@ -1,19 +1,20 @@
 import os
-import time
 import pandas as pd
 import matplotlib.pyplot as plt
-from nba_api.stats.endpoints import teamgamelog, boxscoretraditionalv2
 from nba_api.stats.static import teams
+from src.data.repositorio_gamelogs import carregar_gamelog_time
+from src.data.coleta_dados import coletar_totais_adversarios
+from src.data.transformacoes import jogo_em_casa, sigla_adversario, resultado_por_local, saldo_pontos
 
-def calcular_detalhes_jogos():
+def calcular_detalhes_jogos(team_id=1610612751, temporadas=['2023-24', '2024-25']):
     """
-    Coleta informações dos jogos do Brooklyn Nets para as temporadas 2023-24 e 2024-25,
-    retornando um dicionário de DataFrames, onde cada chave é a temporada.
+    Coleta informações dos jogos de um time (padrão: Brooklyn Nets) nas temporadas informadas
+    (padrão: 2023-24 e 2024-25), retornando um dicionário de DataFrames, onde cada chave é a temporada.
 
     Cada DataFrame conterá as colunas:
       - Adversário (nome completo)
       - Data do Jogo (garantindo que não haja NaN)
-      - Pontos a Favor (pontos do Brooklyn Nets)
+      - Pontos a Favor (pontos do time)
       - Pontos Contra (pontos do adversário)
       - Assistências
       - Rebotes
@@ -21,9 +22,6 @@ def calcular_detalhes_jogos():
       - Jogo em Casa (se o jogo foi em casa: 1 se venceu, -1 se perdeu; se não, 0)
       - Jogo Fora (se o jogo foi fora: 1 se venceu, -1 se perdeu; se não, 0)
     """
-    temporadas = ['2023-24', '2024-25']
-    nets_team_id = 1610612751
-
     # Cria um mapeamento de sigla para nome completo das equipes
     lista_times = teams.get_teams()
     mapa_times = {time_info['abbreviation'].upper(): time_info['full_name'] for time_info in lista_times}
@@ -31,105 +29,61 @@ def calcular_detalhes_jogos():
     resultados_por_temporada = {}
 
     for temporada in temporadas:
-        detalhes_jogos = []
         try:
-            # Obtém o game log do Brooklyn Nets para a temporada
-            game_log = teamgamelog.TeamGameLog(team_id=nets_team_id, season=temporada)
-            df_game_log = game_log.get_data_frames()[0]
-            # Normaliza os nomes das colunas para maiúsculas
-            df_game_log.columns = [col.upper() for col in df_game_log.columns]
+            # Obtém o game log do time para a temporada
+            # O repositório já entrega as colunas em maiúsculas (esquema de src/data/esquema.py)
+            df_game_log = carregar_gamelog_time(team_id, temporada)
         except Exception as e:
             print(f"Erro ao obter game log para a temporada {temporada}: {e}")
             continue
 
-        # Processa cada jogo da temporada
-        for _, row in df_game_log.iterrows():
-            if 'GAME_ID' not in row:
-                print("Coluna GAME_ID não encontrada para um jogo, pulando...")
-                continue
-
-            game_id   = row['GAME_ID']
-            game_date = row['GAME_DATE']
-            matchup   = row['MATCHUP']
-            pts_for   = row['PTS']
-            assists   = row['AST']
-            rebounds  = row['REB']
-            three_pm  = row['FG3M']
-
-            # Verifica se a data do jogo é válida
-            if pd.isna(game_date):
-                continue
-
-            # Identifica se o jogo é em casa ou fora
-            # Se o caractere '@' estiver presente, o jogo é fora; caso contrário, se contiver "vs.", é em casa.
-            if '@' in matchup:
-                jogo_em_casa = False
-                adversario_sigla = matchup.split('@')[-1].strip().upper()
-            elif 'vs.' in matchup.lower():
-                jogo_em_casa = True
-                adversario_sigla = matchup.split('vs.')[-1].strip().upper()
-            else:
-                # Caso não seja possível identificar, pula o jogo
-                continue
-
-            adversario_nome = mapa_times.get(adversario_sigla, adversario_sigla)
-
-            # Obtém os pontos do adversário através do boxscore
-            pts_against = None
-            try:
-                boxscore = boxscoretraditionalv2.BoxScoreTraditionalV2(game_id=game_id)
-                df_team_stats = boxscore.get_data_frames()[1]  # DataFrame com estatísticas dos times
-                opp_stats  = df_team_stats[df_team_stats['TEAM_ID'] != nets_team_id]
-                if not opp_stats.empty:
-                    pts_against = opp_stats.iloc[0]['PTS']
-                else:
-                    pts_against = None
-            except Exception as e:
-                print(f"Erro ao obter boxscore para o jogo {game_id}: {e}")
-                pts_against = None
-
-            # Se não foi possível obter os pontos do adversário, pula o jogo
-            if pts_against is None:
-                continue
-
-            # Calcula a diferença para determinar vitória ou derrota
-            diferenca = pts_for - pts_against
-            if jogo_em_casa:
-                jogo_em_casa_valor = 1 if diferenca > 0 else -1
-                jogo_fora_valor   = 0
-            else:
-                jogo_fora_valor   = 1 if diferenca > 0 else -1
-                jogo_em_casa_valor = 0
-
-            detalhes_jogos.append({
-                'Adversário':      adversario_nome,
-                'Data do Jogo':    game_date,
-                'Pontos a Favor':  pts_for,
-                'Pontos Contra':   pts_against,
-                'Assistências':    assists,
-                'Rebotes':         rebounds,
-                '3PT Convertidos': three_pm,
-                'Jogo em Casa':    jogo_em_casa_valor,
-                'Jogo Fora':       jogo_fora_valor
-            })
-
-            # Delay para respeitar os limites de requisições da API
-            time.sleep(0.6)
-
-        resultados_por_temporada[temporada] = pd.DataFrame(detalhes_jogos)
+        # Obtém os pontos dos adversários de toda a temporada em uma única requisição
+        try:
+            df_adversarios = coletar_totais_adversarios(team_id, temporada)
+            pontos_adversarios = dict(zip(df_adversarios['GAME_ID'], df_adversarios['OPP_PTS']))
+        except Exception as e:
+            print(f"Erro ao obter os pontos dos adversários para a temporada {temporada}: {e}")
+            continue
+
+        if 'GAME_ID' not in df_game_log.columns:
+            print(f"Coluna GAME_ID não encontrada no game log da temporada {temporada}, pulando...")
+            continue
+
+        # Jogos com data válida e com o local identificado no MATCHUP ("vs." em casa, "@" fora)
+        jogos = df_game_log[df_game_log['GAME_DATE'].notna()]
+        jogos = jogos.assign(ADVERSARIO=sigla_adversario(jogos['MATCHUP']))
+        jogos = jogos[jogos['ADVERSARIO'] != ""]
+
+        # Pontos do adversário a partir dos totais da temporada; jogos sem eles são descartados
+        jogos = jogos.assign(PTS_CONTRA=jogos['GAME_ID'].map(pontos_adversarios))
+        jogos = jogos[jogos['PTS_CONTRA'].notna()].astype({'PTS_CONTRA': df_adversarios['OPP_PTS'].dtype})
+
+        # Resultado pela diferença de pontos, separado entre jogos em casa e fora
+        diferenca = saldo_pontos(jogos['PTS'], jogos['PTS_CONTRA'])
+        jogo_em_casa_valor, jogo_fora_valor = resultado_por_local(jogo_em_casa(jogos['MATCHUP']), diferenca > 0)
+
+        detalhes_jogos = pd.DataFrame({
+            'Adversário':      jogos['ADVERSARIO'].map(mapa_times).fillna(jogos['ADVERSARIO']),
+            'Data do Jogo':    jogos['GAME_DATE'],
+            'Pontos a Favor':  jogos['PTS'],
+            'Pontos Contra':   jogos['PTS_CONTRA'],
+            'Assistências':    jogos['AST'],
+            'Rebotes':         jogos['REB'],
+            '3PT Convertidos': jogos['FG3M'],
+            'Jogo em Casa':    jogo_em_casa_valor,
+            'Jogo Fora':       jogo_fora_valor
+        }).reset_index(drop=True)
+
+        resultados_por_temporada[temporada] = detalhes_jogos
 
     return resultados_por_temporada
 
-def salvar_resultados_rf4(df, temporada):
+def salvar_resultados_rf4(df, temporada, output_dir="reports/arquivos_csv/parte1", html_dir="reports/html/parte1",
+                          img_dir="reports/imagens/parte1"):
     """
     Salva o DataFrame gerado nos formatos CSV, HTML e JPG nas pastas solicitadas,
     utilizando o prefixo rf4_ e incluindo a temporada no nome dos arquivos.
     """
-    # Diretórios de saída
-    output_dir = "reports/arquivos_csv/parte1"
-    html_dir   = "reports/html/parte1"
-    img_dir    = "reports/imagens/parte1"
-
     # Cria os diretórios, se não existirem
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(html_dir, exist_ok=True)
@@ -168,3 +122,13 @@ def salvar_resultados_rf4(df, temporada):
         print(f"Arquivo JPG salvo em: {img_file}")
     except Exception as e:
         print(f"Erro ao salvar JPG: {e}")
+
+def calcular_e_salvar_rf4(team_id=1610612751, temporadas=['2023-24', '2024-25'], output_dir="reports/arquivos_csv/parte1",
+                          html_dir="reports/html/parte1", img_dir="reports/imagens/parte1"):
+    """
+    Calcula os detalhes dos jogos por temporada e salva os resultados de cada uma (RF4 completo).
+    """
+    resultados = calcular_detalhes_jogos(team_id, temporadas)
+
+    for temporada, df_jogos in resultados.items():
+        salvar_resultados_rf4(df_jogos, temporada, output_dir, html_dir, img_dir)
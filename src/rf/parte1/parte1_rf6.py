@@ -2,13 +2,16 @@ import os
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from nba_api.stats.endpoints import teamgamelog
 from nba_api.stats.static import teams
+from src.data.repositorio_gamelogs import carregar_gamelog_time
+from src.data.transformacoes import sigla_adversario
 
-def apresentar_performance_defensiva():
+def apresentar_performance_defensiva(team_id=1610612751, temporadas=["2023-24", "2024-25"], team_name="Brooklyn Nets",
+                                     output_dir="reports/arquivos_csv/parte1", html_dir="reports/html/parte1",
+                                     img_dir="reports/imagens/parte1"):
     """
-    Gera relatórios (CSV, HTML e JPG) com a performance defensiva do Brooklyn Nets para as temporadas
-    2023-24 e 2024-25. Cada relatório contém uma tabela com:
+    Gera relatórios (CSV, HTML e JPG) com a performance defensiva de um time (padrão: Brooklyn Nets)
+    para as temporadas informadas (padrão: 2023-24 e 2024-25). Cada relatório contém uma tabela com:
       - Nome do adversário (convertido da sigla para o nome completo)
       - Data do jogo (verificando se a informação está disponível)
       - Total de roubos de bola
@@ -17,7 +20,7 @@ def apresentar_performance_defensiva():
       - Total de erros (turnovers)
       - Total de faltas
 
-    Os arquivos serão salvos nas seguintes pastas:
+    Os arquivos serão salvos nas seguintes pastas (padrão):
       - CSV:    reports/arquivos_csv/parte1
       - HTML:   reports/html/parte1
       - JPG:    reports/imagens/parte1
@@ -29,11 +32,6 @@ def apresentar_performance_defensiva():
       - Pandas: https://pandas.pydata.org/docs/
       - Matplotlib (table): https://matplotlib.org/stable/api/_as_gen/matplotlib.pyplot.table.html
     """
-    # Diretórios de saída
-    output_dir = "reports/arquivos_csv/parte1"
-    html_dir = "reports/html/parte1"
-    img_dir = "reports/imagens/parte1"
-
     # Cria os diretórios, se não existirem
     for directory in [output_dir, html_dir, img_dir]:
         os.makedirs(directory, exist_ok=True)
@@ -42,18 +40,11 @@ def apresentar_performance_defensiva():
     nba_teams = teams.get_teams()
     team_mapping = {team['abbreviation']: team['full_name'] for team in nba_teams}
 
-    # ID do Brooklyn Nets
-    brooklyn_nets_id = 1610612751  # Brooklyn Nets
-
-    # Lista de temporadas a serem processadas
-    temporadas = ["2023-24", "2024-25"]
-
     # Processa cada temporada
     for temporada in temporadas:
         try:
-            # Obter o game log da temporada para o Brooklyn Nets
-            game_log = teamgamelog.TeamGameLog(team_id=brooklyn_nets_id, season=temporada)
-            df = game_log.get_data_frames()[0]
+            # Obter o game log da temporada para o time
+            df = carregar_gamelog_time(team_id, temporada)
         except Exception as e:
             print(f"Erro ao obter dados para a temporada {temporada}: {e}")
             continue
@@ -61,22 +52,10 @@ def apresentar_performance_defensiva():
         # Remove linhas sem informação na data do jogo para evitar NaN
         df = df.dropna(subset=['GAME_DATE'])
 
-        # Função para extrair o adversário a partir da coluna 'MATCHUP'
-        def extrair_oponente(matchup):
-            # Exemplo de matchup: "BKN vs. BOS" ou "BKN @ TOR"
-            if " vs. " in matchup:
-                partes = matchup.split(" vs. ")
-                oponente_sigla = partes[1].strip()
-            elif " @ " in matchup:
-                partes = matchup.split(" @ ")
-                oponente_sigla = partes[1].strip()
-            else:
-                oponente_sigla = ""
-            # Retorna o nome completo do time adversário, se disponível
-            return team_mapping.get(oponente_sigla, oponente_sigla)
-
-        # Aplica a extração do nome do adversário
-        df['Nome do adversário'] = df['MATCHUP'].apply(extrair_oponente)
+        # Extrai o adversário a partir da coluna 'MATCHUP' (ex.: "BKN vs. BOS" ou "BKN @ TOR")
+        # e usa o nome completo do time, se disponível
+        oponente_sigla = sigla_adversario(df['MATCHUP'])
+        df['Nome do adversário'] = oponente_sigla.map(team_mapping).fillna(oponente_sigla)
 
         # Cria a tabela com as informações solicitadas
         tabela = pd.DataFrame({
@@ -90,7 +69,7 @@ def apresentar_performance_defensiva():
         })
 
         # Define o nome base do arquivo com o prefixo rf6_
-        nome_arquivo_base = f"rf6_Brooklyn_Nets_{temporada}_performance"
+        nome_arquivo_base = f"rf6_{team_name.replace(' ', '_')}_{temporada}_performance"
 
         # Salva o arquivo CSV
         caminho_csv = os.path.join(output_dir, nome_arquivo_base + ".csv")
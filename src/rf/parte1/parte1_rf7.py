@@ -1,9 +1,23 @@
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+import numpy as np
 import os
-from pandas.plotting import table
-import matplotlib.pyplot as plt
+from urllib.parse import urlparse
+from src.data.agendador import obter_agendador
+from src.visualizations.tabelas import salvar_tabela_em_paginas
+from src.utils.instrumentacao import span
+
+# Tempo máximo de espera (em segundos) por uma página do Basketball Reference
+TIMEOUT_BREF = float(os.getenv("NBA_BREF_TIMEOUT", "30"))
+
+
+def _baixar_pagina(url):
+    response = requests.get(url, timeout=TIMEOUT_BREF)
+    if response.status_code != 200:
+        raise Exception(f"Falha ao acessar a página: {url} (status {response.status_code})")
+    return response
+
 
 def coletar_jogos_basketball_reference(team_abbr, year):
     """
@@ -19,9 +33,10 @@ def coletar_jogos_basketball_reference(team_abbr, year):
     url = f"https://www.basketball-reference.com/teams/{team_abbr}/{year}_games.html"
     print(f"Coletando dados da URL: {url}")
 
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise Exception(f"Falha ao acessar a página: {url}")
+    # Passa pelo agendador do host, que limita a taxa e repete as falhas com backoff (no modo liga são
+    # dezenas de páginas seguidas)
+    with span("busca", "basketball_reference", team_abbr=team_abbr, season=year):
+        response = obter_agendador(urlparse(url).netloc).executar("basketball_reference", _baixar_pagina, url)
 
     soup = BeautifulSoup(response.text, 'html.parser')
     table = soup.find('table', {'id': 'games'})
@@ -46,54 +61,28 @@ def coletar_jogos_basketball_reference(team_abbr, year):
     df.rename(columns={'Tm': 'PTS', 'Opp': 'PTS_Opp', 'Opponent': 'Adversário', 'Unnamed_5': 'Local'}, inplace=True)
 
     # Adicionar coluna indicando se o jogo foi em casa ou fora
-    df['Casa/Fora'] = df['Local'].apply(lambda x: 'Fora' if '@' in x else 'Casa')
+    fora = df['Local'].str.contains('@', regex=False)
+    df['Casa/Fora'] = np.where(fora, 'Fora', 'Casa')
 
     # Criar a coluna duplicada Casa/Fora_id
-    df['Casa/Fora_id'] = df['Casa/Fora'].apply(lambda x: 1 if x == 'Fora' else 0)
+    df['Casa/Fora_id'] = fora.astype(int)
 
     # Selecionar apenas as colunas desejadas
     df = df[['Date', 'Adversário', 'PTS', 'PTS_Opp', 'W', 'L', 'Streak', 'Casa/Fora', 'Casa/Fora_id']]
 
     return df
 
-def salvar_tabela_em_paginas_jpg(df, img_dir, file_prefix):
-    """
-    Salva a tabela em múltiplas imagens JPEG, caso os dados não caibam em uma única imagem.
-
-    Args:
-        df (pd.DataFrame): DataFrame contendo os dados.
-        img_dir (str): Diretório para salvar as imagens.
-        file_prefix (str): Prefixo para os nomes dos arquivos de imagem.
-    """
-    rows_per_page = 20  # Número de linhas por imagem
-    total_rows = len(df)
-    total_pages = (total_rows // rows_per_page) + int(total_rows % rows_per_page > 0)
-
-    for page in range(total_pages):
-        start_row = page * rows_per_page
-        end_row = start_row + rows_per_page
-        df_page = df.iloc[start_row:end_row]
-
-        img_path = os.path.join(img_dir, f"{file_prefix}_page_{page + 1}.jpg")
-        fig, ax = plt.subplots(figsize=(12, 8))
-        ax.axis('tight')
-        ax.axis('off')
-        tabela = table(ax, df_page, loc='center', colWidths=[0.1] * len(df.columns))
-        tabela.auto_set_font_size(False)
-        tabela.set_fontsize(10)
-        tabela.scale(1.2, 1.2)
-        plt.savefig(img_path, bbox_inches='tight')
-        plt.close()
-        print(f"Tabela salva como imagem em: {img_path}")
-
-def apresentar_jogos_do_time(team_abbr, seasons, output_dir):
+def apresentar_jogos_do_time(team_abbr, seasons, output_dir="reports/arquivos_csv/parte1", html_dir="reports/html/parte1",
+                             img_dir="reports/imagens/parte1"):
     """
     Apresenta os jogos do time e salva os dados em CSV, HTML e como imagens da tabela em JPEG.
 
     Args:
         team_abbr (str): Abreviação do time (ex.: 'BRK' para Brooklyn Nets).
         seasons (list): Lista de temporadas no formato 'YYYY-YY' (ex.: ['2023-24', '2024-25']).
-        output_dir (str): Diretório base para salvar os arquivos.
+        output_dir (str): Diretório do arquivo CSV.
+        html_dir (str): Diretório do arquivo HTML.
+        img_dir (str): Diretório das imagens da tabela.
 
     Returns:
         pd.DataFrame: Dados processados do time.
@@ -108,24 +97,21 @@ def apresentar_jogos_do_time(team_abbr, seasons, output_dir):
         dados_completos = pd.concat([dados_completos, dados], ignore_index=True)
 
     # Diretórios de saída
-    csv_dir = os.path.join("reports/arquivos_csv/parte1")
-    html_dir = os.path.join("reports/html/parte1")
-    img_dir = os.path.join("reports/imagens/parte1")
-    os.makedirs(csv_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
     os.makedirs(html_dir, exist_ok=True)
     os.makedirs(img_dir, exist_ok=True)
 
     # Salvar como CSV
-    csv_path = os.path.join("reports/arquivos_csv/parte1", "rf7_jogos_do_time.csv")
+    csv_path = os.path.join(output_dir, "rf7_jogos_do_time.csv")
     dados_completos.to_csv(csv_path, index=False)
     print(f"Dados salvos como CSV em: {csv_path}")
 
     # Salvar como HTML
-    html_path = os.path.join("reports/html/parte1", "rf7_jogos_do_time.html")
+    html_path = os.path.join(html_dir, "rf7_jogos_do_time.html")
     dados_completos.to_html(html_path, index=False)
     print(f"Dados salvos como HTML em: {html_path}")
 
     # Salvar como múltiplas imagens (JPEG) da tabela
-    salvar_tabela_em_paginas_jpg(dados_completos, "reports/imagens/parte1", "rf7_jogos_do_time")
+    salvar_tabela_em_paginas(dados_completos, img_dir, "rf7_jogos_do_time")
 
     return dados_completos
@@ -1,43 +1,44 @@
 import os
 import plotly.graph_objects as go
 import pandas as pd
-from nba_api.stats.endpoints import teamgamelog
-from dotenv import load_dotenv
-
-load_dotenv()
-engine_image = os.getenv('ENGINE_IMAGE')
+from src.data.repositorio_gamelogs import carregar_gamelog_time
+from src.data.transformacoes import indicadores_resultado, jogo_em_casa, sigla_adversario
+from src.visualizations.exportacao_figuras import FilaExportacao
 
 def rf_graficos_desempenho_brooklyn_nets(
         team_id=1610612751,
         seasons=["2023-24", "2024-25"],
         html_output_dir="reports/html/parte1/parte1-rf8",
         csv_output_dir="reports/arquivos_csv/parte1/parte1-rf8",
-        img_output_dir="reports/imagens/parte1/parte1-rf8"
+        img_output_dir="reports/imagens/parte1/parte1-rf8",
+        team_name="Brooklyn Nets"
 ):
     os.makedirs(html_output_dir, exist_ok=True)
     os.makedirs(csv_output_dir, exist_ok=True)
     os.makedirs(img_output_dir, exist_ok=True)
 
+    # As imagens dos gráficos são exportadas juntas, ao final
+    fila = FilaExportacao()
+
     def coletar_dados_temporada(team_id, season):
         print(f"Coletando dados para a temporada {season}...")
-        game_log = teamgamelog.TeamGameLog(team_id=team_id, season=season).get_data_frames()[0]
+        game_log = carregar_gamelog_time(team_id, season)
         game_log["SEASON"] = season
         return game_log
 
     all_seasons_data = pd.concat([coletar_dados_temporada(team_id, season) for season in seasons], ignore_index=True)
 
-    # Ordena os dados por temporada e Game_ID
-    all_seasons_data = all_seasons_data.sort_values(by=["SEASON", "Game_ID"], ascending=[True, False])
+    # Ordena os dados por temporada e GAME_ID
+    all_seasons_data = all_seasons_data.sort_values(by=["SEASON", "GAME_ID"], ascending=[True, False])
 
     # Calcula a coluna de pontos permitidos (PTS_PA) utilizando o deslocamento dos pontos do jogo seguinte e preenchendo os NaN
     all_seasons_data["PTS_PA"] = all_seasons_data["PTS"].shift(-1)
     all_seasons_data["PTS_PA"] = all_seasons_data["PTS_PA"].fillna(all_seasons_data["PTS"].mean())
 
     # Cria colunas para vitórias e derrotas (utilizadas em outros gráficos)
-    all_seasons_data["WINS"] = all_seasons_data["WL"].apply(lambda x: 1 if x == "W" else 0)
-    all_seasons_data["LOSSES"] = all_seasons_data["WL"].apply(lambda x: 1 if x == "L" else 0)
-    # Identifica se o jogo foi em casa (presença de "vs" no campo MATCHUP)
-    all_seasons_data["HOME_GAME"] = all_seasons_data["MATCHUP"].apply(lambda x: "vs" in x)
+    all_seasons_data["WINS"], all_seasons_data["LOSSES"] = indicadores_resultado(all_seasons_data["WL"])
+    # Identifica se o jogo foi em casa (presença de "vs." no campo MATCHUP)
+    all_seasons_data["HOME_GAME"] = jogo_em_casa(all_seasons_data["MATCHUP"])
 
     # -------------------------------------------------------------------------
     # Tabela Agregada de Totais (por Temporada e Local)
@@ -84,7 +85,7 @@ def rf_graficos_desempenho_brooklyn_nets(
     barras_csv_path = os.path.join(csv_output_dir, "rf8_barras_empilhado_vitorias_derrotas.csv")
 
     fig.write_html(barras_html_path)
-    fig.write_image(barras_img_path, format="jpg", engine=engine_image)
+    fila.adicionar(fig, barras_img_path)
     wins_losses.to_csv(barras_csv_path, index=False)
 
     print(f"Gráficos salvos em {barras_html_path} e {barras_img_path}")
@@ -110,7 +111,7 @@ def rf_graficos_desempenho_brooklyn_nets(
         pizza_csv_path = os.path.join(csv_output_dir, f"rf8_grafico_pizza_{season}.csv")
 
         fig.write_html(pizza_html_path)
-        fig.write_image(pizza_img_path, format="jpg", engine=engine_image)
+        fila.adicionar(fig, pizza_img_path)
         pd.DataFrame({"Categoria": labels, "Frequência": values}).to_csv(pizza_csv_path, index=False)
 
         print(f"Gráficos salvos para {season} em {pizza_html_path} e {pizza_img_path}")
@@ -130,12 +131,12 @@ def rf_graficos_desempenho_brooklyn_nets(
     if not away_media.empty:
         fig_radar_away = go.Figure()
         categories = ["Média Pontos Marcados", "Média Pontos Sofridos", "Média Rebotes"]
-        for _, row in away_media.iterrows():
-            season = row["SEASON"]
+        for row in away_media.itertuples(index=False):
+            season = row.SEASON
             values = [
-                row["media_pontos_marcados"],
-                row["media_pontos_sofridos"],
-                row["media_rebotes"]
+                row.media_pontos_marcados,
+                row.media_pontos_sofridos,
+                row.media_rebotes
             ]
             # Fecha o polígono repetindo o primeiro valor
             values.append(values[0])
@@ -155,7 +156,7 @@ def rf_graficos_desempenho_brooklyn_nets(
         radar_away_csv_path = os.path.join(csv_output_dir, "rf8_radar_fora_media.csv")
 
         fig_radar_away.write_html(radar_away_html_path)
-        fig_radar_away.write_image(radar_away_img_path, format="jpg", engine=engine_image)
+        fila.adicionar(fig_radar_away, radar_away_img_path)
         away_media.to_csv(radar_away_csv_path, index=False)
 
         print(f"Radar (Fora - Média) salvo em {radar_away_html_path} e {radar_away_img_path}")
@@ -166,12 +167,12 @@ def rf_graficos_desempenho_brooklyn_nets(
     if not home_media.empty:
         fig_radar_home = go.Figure()
         categories = ["Média Pontos Marcados", "Média Pontos Sofridos", "Média Rebotes"]
-        for _, row in home_media.iterrows():
-            season = row["SEASON"]
+        for row in home_media.itertuples(index=False):
+            season = row.SEASON
             values = [
-                row["media_pontos_marcados"],
-                row["media_pontos_sofridos"],
-                row["media_rebotes"]
+                row.media_pontos_marcados,
+                row.media_pontos_sofridos,
+                row.media_rebotes
             ]
             values.append(values[0])
             fig_radar_home.add_trace(go.Scatterpolar(
@@ -189,7 +190,7 @@ def rf_graficos_desempenho_brooklyn_nets(
         radar_home_csv_path = os.path.join(csv_output_dir, "rf8_radar_casa_media.csv")
 
         fig_radar_home.write_html(radar_home_html_path)
-        fig_radar_home.write_image(radar_home_img_path, format="jpg", engine=engine_image)
+        fila.adicionar(fig_radar_home, radar_home_img_path)
         home_media.to_csv(radar_home_csv_path, index=False)
 
         print(f"Radar (Casa - Média) salvo em {radar_home_html_path} e {radar_home_img_path}")
@@ -202,12 +203,11 @@ def rf_graficos_desempenho_brooklyn_nets(
     # e a coluna "WL" será exibida como texto ao pairar o mouse.
     for season in seasons:
         season_data = all_seasons_data[all_seasons_data["SEASON"] == season].copy()
-        # Se existir a coluna "GAME_DATE", converte para datetime usando o formato "%b %d, %Y" e ordena; senão, ordena por "Game_ID"
+        # Se existir a coluna "GAME_DATE" (datetime64 no repositório), ordena por ela; senão, ordena por "GAME_ID"
         if "GAME_DATE" in season_data.columns:
-            season_data["GAME_DATE"] = pd.to_datetime(season_data["GAME_DATE"], format="%b %d, %Y")
             season_data = season_data.sort_values("GAME_DATE", ascending=True)
         else:
-            season_data = season_data.sort_values("Game_ID", ascending=True)
+            season_data = season_data.sort_values("GAME_ID", ascending=True)
         season_data = season_data.reset_index(drop=True)
         season_data["Game_Number"] = season_data.index + 1
 
@@ -236,7 +236,7 @@ def rf_graficos_desempenho_brooklyn_nets(
         line_csv_path = os.path.join(csv_output_dir, f"rf8_linha_seq_{season}.csv")
 
         fig_line.write_html(line_html_path)
-        fig_line.write_image(line_img_path, format="jpg", engine=engine_image)
+        fila.adicionar(fig_line, line_img_path)
         season_data.to_csv(line_csv_path, index=False)
         print(f"Gráfico de Linha para {season} salvo em {line_html_path} e {line_img_path}")
 
@@ -250,18 +250,18 @@ def rf_graficos_desempenho_brooklyn_nets(
         media_pontos_sofridos=("PTS_PA", "mean")
     ).reset_index()
 
-    # Tenta obter o nome da equipe a partir dos dados; se não existir, utiliza um rótulo fixo
+    # Tenta obter o nome da equipe a partir dos dados; se não existir, utiliza o nome informado
     if "TEAM_NAME" in all_seasons_data.columns:
         scatter_data["Equipe"] = all_seasons_data["TEAM_NAME"].iloc[0]
     else:
-        scatter_data["Equipe"] = "Brooklyn Nets"
+        scatter_data["Equipe"] = team_name
 
     fig_scatter = go.Figure()
-    for _, row in scatter_data.iterrows():
-        season = row["SEASON"]
-        x = row["media_pontos"]
-        y = row["media_pontos_sofridos"]
-        team = row["Equipe"]
+    for row in scatter_data.itertuples(index=False):
+        season = row.SEASON
+        x = row.media_pontos
+        y = row.media_pontos_sofridos
+        team = row.Equipe
         fig_scatter.add_trace(go.Scatter(
             x=[x],
             y=[y],
@@ -281,7 +281,7 @@ def rf_graficos_desempenho_brooklyn_nets(
     scatter_csv_path = os.path.join(csv_output_dir, "rf8_scatter_media_pontos.csv")
 
     fig_scatter.write_html(scatter_html_path)
-    fig_scatter.write_image(scatter_img_path, format="jpg", engine=engine_image)
+    fila.adicionar(fig_scatter, scatter_img_path)
     scatter_data.to_csv(scatter_csv_path, index=False)
     print(f"Gráfico de Dispersão salvo em {scatter_html_path} e {scatter_img_path}")
 
@@ -331,7 +331,7 @@ def rf_graficos_desempenho_brooklyn_nets(
 
     # Salva o gráfico e os dados
     fig_stats.write_html(stats_html_path)
-    fig_stats.write_image(stats_img_path, format="jpg", engine=engine_image)
+    fila.adicionar(fig_stats, stats_img_path)
     stats_aggregated.to_csv(stats_csv_path, index=False)
 
     print(f"Gráfico de Barras para Estatísticas Específicas salvo em {stats_html_path} e {stats_img_path}")
@@ -340,15 +340,15 @@ def rf_graficos_desempenho_brooklyn_nets(
     # 7. Gráfico de Dispersão Interativo para Detalhes dos Jogos com Legenda Personalizada
     print("Gerando Gráfico de Dispersão Interativo para Detalhes dos Jogos...")
     # Cria colunas adicionais para extrair o adversário e identificar se o jogo foi em casa ou fora
-    all_seasons_data["OPPONENT"] = all_seasons_data["MATCHUP"].apply(lambda x: x.split(" ")[-1])
+    all_seasons_data["OPPONENT"] = sigla_adversario(all_seasons_data["MATCHUP"])
     all_seasons_data["Local_Str"] = all_seasons_data["HOME_GAME"].map({True: "Casa", False: "Fora"})
 
-    # Converte a coluna de data para datetime (assumindo o formato '%b %d, %Y')
+    # Coluna de data em datetime (o repositório já entrega GAME_DATE em datetime64)
     if "GAME_DATE" in all_seasons_data.columns:
-        all_seasons_data["GAME_DATE_DT"] = pd.to_datetime(all_seasons_data["GAME_DATE"], format="%b %d, %Y")
+        all_seasons_data["GAME_DATE_DT"] = pd.to_datetime(all_seasons_data["GAME_DATE"])
     else:
         # Caso não exista a coluna GAME_DATE, tenta outro método (ajuste conforme necessário)
-        all_seasons_data["GAME_DATE_DT"] = pd.to_datetime(all_seasons_data["Game_ID"], errors='coerce')
+        all_seasons_data["GAME_DATE_DT"] = pd.to_datetime(all_seasons_data["GAME_ID"], errors='coerce')
 
     # Calcula a margem de vitória/derrota (diferença de pontos)
     all_seasons_data["MARGIN"] = all_seasons_data["PTS"] - all_seasons_data["PTS_PA"]
@@ -375,11 +375,11 @@ def rf_graficos_desempenho_brooklyn_nets(
                     size=10,
                     line=dict(width=1, color='DarkSlateGrey')
                 ),
-                text=df_grupo.apply(lambda row: f"Data: {row['GAME_DATE']}<br>"
-                                                f"Adversário: {row['OPPONENT']}<br>"
-                                                f"Resultado: {row['WL']}<br>"
-                                                f"Local: {row['Local_Str']}<br>"
-                                                f"Placar: {row['PTS']} - {row['PTS_PA']}", axis=1),
+                text=("Data: " + df_grupo["GAME_DATE"].astype(str) + "<br>"
+                      + "Adversário: " + df_grupo["OPPONENT"] + "<br>"
+                      + "Resultado: " + df_grupo["WL"] + "<br>"
+                      + "Local: " + df_grupo["Local_Str"] + "<br>"
+                      + "Placar: " + df_grupo["PTS"].astype(str) + " - " + df_grupo["PTS_PA"].astype(str)),
                 hoverinfo="text",
                 showlegend=False  # Esses traces não aparecerão na legenda
             ))
@@ -428,9 +428,9 @@ def rf_graficos_desempenho_brooklyn_nets(
     fig_details.add_trace(dummy_loss)
 
     fig_details.update_layout(
-        title="Detalhes dos Jogos dos Brooklyn Nets",
+        title=f"Detalhes dos Jogos dos {team_name}",
         xaxis_title="Data do Jogo",
-        yaxis_title="Margem de Pontos (Placar: Nets - Adversário)",
+        yaxis_title=f"Margem de Pontos (Placar: {team_name.split()[-1]} - Adversário)",
         xaxis=dict(type="date"),
         legend_title="Legenda"
     )
@@ -440,9 +440,11 @@ def rf_graficos_desempenho_brooklyn_nets(
     details_csv_path = os.path.join(csv_output_dir, "rf8_scatter_detalhes_jogos RF07.csv")
 
     fig_details.write_html(details_html_path)
-    fig_details.write_image(details_img_path, format="jpg", engine=engine_image)
+    fila.adicionar(fig_details, details_img_path)
     all_seasons_data.to_csv(details_csv_path, index=False)
 
     print(f"Gráfico de Dispersão dos Jogos salvo em {details_html_path} e {details_img_path}")
 
+    fila.exportar()
+
     print("✅ Todos os gráficos e arquivos CSV foram gerados com sucesso!")
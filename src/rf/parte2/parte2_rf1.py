@@ -3,9 +3,11 @@ from nba_api.stats.static import players
 from nba_api.stats.endpoints import commonplayerinfo
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
 from datetime import datetime
 import requests
+from src.data.cache_api import consultar_endpoint
+from src.visualizations.tabelas import salvar_tabela_como_imagem
+from src.utils.instrumentacao import span
 
 def calculate_age(birthdate):
     """
@@ -26,7 +28,8 @@ def fetch_player_salary(player_name):
     Busca o salário do jogador no site HoopsHype. 
     """ 
     url = 'https://hoopshype.com/salaries/players/' 
-    response = requests.get(url) 
+    with span("busca", "hoopshype", player_name=player_name):
+        response = requests.get(url)
     soup = BeautifulSoup(response.content, 'html.parser') 
 
     table = soup.find('table', {'class': 'hh-salaries-ranking-table'}) 
@@ -68,7 +71,7 @@ def apresentar_dados_jogadores(player_names, output_dir, html_dir, img_dir):
 
         # Obter detalhes do jogador
         try:
-            player_info = commonplayerinfo.CommonPlayerInfo(player_id=player['id']).get_dict()
+            player_info = consultar_endpoint(commonplayerinfo.CommonPlayerInfo, player_id=player['id']).get_dict()
             player_data = player_info['resultSets'][0]['rowSet'][0]
 
             # Dados do jogador
@@ -116,25 +119,7 @@ def apresentar_dados_jogadores(player_names, output_dir, html_dir, img_dir):
 
     # Salvar como imagem
     img_path = os.path.join(img_dir, "p2_rft1_dados_jogadores.jpg")
-    salvar_tabela_como_imagem(df_players, img_path, "Dados dos Jogadores")
+    salvar_tabela_como_imagem(df_players, img_path, "Dados dos Jogadores", largura=12, altura_linha=0.6)
 
     print('Processamento da Parte2-RF1 concluído.')
     return df_players
-
-
-def salvar_tabela_como_imagem(df, img_path, title):
-    if df.empty:
-        print("DataFrame vazio. Não é possível salvar como imagem.")
-        return
-
-    fig, ax = plt.subplots(figsize=(12, len(df) * 0.6))
-    ax.axis("off")
-    ax.axis("tight")
-    ax.set_title(title, fontsize=16, weight="bold")
-    table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.auto_set_column_width(col=list(range(len(df.columns))))
-    plt.savefig(img_path, bbox_inches="tight", dpi=300)
-    plt.close()
-    print(f"Tabela salva como imagem em: {img_path}")
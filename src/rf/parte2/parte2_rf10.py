@@ -2,15 +2,13 @@ import matplotlib
 from matplotlib import pyplot as plt
 import plotly.figure_factory as ff
 import plotly.graph_objects as go
-from nba_api.stats.endpoints import playercareerstats, playergamelog
+from nba_api.stats.endpoints import playercareerstats
 import pandas as pd
 import os
 import statistics
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-engine_image = os.getenv('ENGINE_IMAGE')
+from src.data.cache_api import consultar_endpoint
+from src.data.repositorio_gamelogs import carregar_gamelog
+from src.visualizations.exportacao_figuras import FilaExportacao
 
 def fetch_career_stats(player_id):
     """
@@ -23,7 +21,8 @@ def fetch_career_stats(player_id):
         pd.Series: Totais de carreira do jogador.
     """
     try:
-        career_stats = playercareerstats.PlayerCareerStats(
+        career_stats = consultar_endpoint(
+            playercareerstats.PlayerCareerStats,
             player_id=player_id, timeout=30
         ).get_data_frames()[0]
 
@@ -57,9 +56,7 @@ def fetch_season_stats(player_id):
         pd.Series: Totais da temporada do jogador.
     """
     try:
-        season_stats = playergamelog.PlayerGameLog(
-            player_id=player_id, season="2024-25", timeout=30
-        ).get_data_frames()[0]
+        season_stats = carregar_gamelog(player_id, season="2024-25")
 
         season_stats = season_stats.rename(columns={
             'PTS': 'Pontos',
@@ -80,20 +77,21 @@ def fetch_season_stats(player_id):
         return pd.Series({'Pontos': 0, 'Rebotes': 0, 'Assistências': 0, 'Minutos': 0, 'GP': 0,
                           'Média de Pontos': 0, 'Média de Rebotes': 0, 'Média de Assistências': 0})
     
-def fetch_player_game_data(player_id):
+def fetch_player_game_data(player_id, team_abbr="BKN"):
     """
     Busca dados de todos os jogos de um jogador na temporada atual.
 
     Args:
         player_id (int): ID do jogador na NBA API.
+        team_abbr (str): Sigla do time pelo qual o jogador atua (padrão: "BKN").
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados dos jogos.
     """
     try:
-        player_log = playergamelog.PlayerGameLog(player_id=player_id, season="2024-25").get_data_frames()[0]
+        player_log = carregar_gamelog(player_id, season="2024-25")
 
-        player_log = player_log[player_log['MATCHUP'].str.contains("BKN")]
+        player_log = player_log[player_log['MATCHUP'].str.contains(team_abbr)]
 
         player_log = player_log.rename(columns={
             'PTS': 'Pontos',
@@ -111,7 +109,7 @@ def fetch_player_game_data(player_id):
         print(f"Erro ao buscar dados do jogador: {e}")
         return pd.DataFrame()
 
-def comparar_estatisticas(players, output_dir, html_dir, img_dir):
+def comparar_estatisticas(players, output_dir, html_dir, img_dir, team_abbr="BKN"):
     """
     Compara as estatísticas da carreira e da temporada atual dos jogadores.
 
@@ -120,11 +118,15 @@ def comparar_estatisticas(players, output_dir, html_dir, img_dir):
         output_dir (str): Diretório para salvar os resultados em CSV.
         html_dir (str): Diretório para salvar os resultados em HTML.
         img_dir (str): Diretório para salvar os gráficos.
+        team_abbr (str): Sigla do time pelo qual os jogadores atuam (padrão: "BKN").
     """
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(html_dir, exist_ok=True)
     os.makedirs(img_dir, exist_ok=True)
 
+    # As imagens dos gráficos de todos os jogadores são exportadas juntas, ao final
+    fila = FilaExportacao()
+
     for player in players:
         player_name = player['PLAYER']
         player_id = player['PLAYER_ID']
@@ -151,17 +153,19 @@ def comparar_estatisticas(players, output_dir, html_dir, img_dir):
             print(f"Tabela HTML salva em: {html_path}")
 
             # Salvar gráficos
-            dados = fetch_player_game_data(player_id)
-            salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir)
+            dados = fetch_player_game_data(player_id, team_abbr)
+            salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir, fila)
             salvar_graficos_boxplot(player_name, dados, img_dir)
 
         except Exception as e:
             print(f"Erro ao processar dados do jogador {player_name}: {e}")
 
+    fila.exportar()
+
     print('Processamento da Parte2-RF10 concluído.')
 
 
-def salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir):
+def salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir, fila=None):
     """
     Salva gráficos de distribuição para os dados de um jogador.
 
@@ -170,7 +174,13 @@ def salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir):
         dados (pd.DataFrame): DataFrame com os dados dos jogos do jogador.
         img_dir (str): Diretório para salvar os gráficos como imagens.
         html_dir (str): Diretório para salvar os gráficos como HTML.
+        fila (FilaExportacao, opcional): Fila onde as imagens são agendadas. Sem ela, as imagens
+            são exportadas ao final da função.
     """
+    fila_propria = fila is None
+    if fila_propria:
+        fila = FilaExportacao()
+
     def plot_distribuicao_plotly(dados, nome, xlabel):
         """
         Cria e salva um gráfico de distribuição usando Plotly.
@@ -218,8 +228,7 @@ def salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir):
         # Salvar gráfico como .jpg
         # .env contendo a engine referente para cada um: kaleido ou orca
         img_path = os.path.join(img_dir, f"{player_name}_distribuicao_{nome.lower()}.jpg")
-        fig.write_image(img_path, format='jpg', engine=engine_image)
-        print(f"Gráfico de distribuição salvo em: {img_path}")
+        fila.adicionar(fig, img_path, format='jpg')
 
         # Salvar gráfico como HTML
         html_path = os.path.join(html_dir, f"{player_name}_distribuicao_{nome.lower()}.html")
@@ -236,6 +245,9 @@ def salvar_graficos_distribuicao(player_name, dados, img_dir, html_dir):
             if dados_filtrados:
                 plot_distribuicao_plotly(dados_filtrados, nome, xlabel)
 
+    if fila_propria:
+        fila.exportar()
+
 
 def salvar_graficos_boxplot(player_name, dados, img_dir):
     """
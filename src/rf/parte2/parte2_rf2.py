@@ -1,7 +1,10 @@
-from nba_api.stats.endpoints import commonteamroster, playergamelog
+from nba_api.stats.endpoints import commonteamroster
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
+from src.data.cache_api import consultar_endpoint
+from src.data.repositorio_gamelogs import carregar_gamelog
+from src.visualizations.tabelas import salvar_tabela_como_imagem
+from src.data.transformacoes import local_do_jogo, sigla_adversario
 
 
 def fetch_team_players_by_id(team_id):
@@ -15,7 +18,7 @@ def fetch_team_players_by_id(team_id):
         list: Lista de dicionários contendo os dados dos jogadores.
     """
     try:
-        roster = commonteamroster.CommonTeamRoster(team_id=team_id).get_data_frames()[0]
+        roster = consultar_endpoint(commonteamroster.CommonTeamRoster, team_id=team_id).get_data_frames()[0]
         players = roster[['PLAYER', 'PLAYER_ID']].to_dict('records')
         return players
     except Exception as e:
@@ -23,20 +26,21 @@ def fetch_team_players_by_id(team_id):
         return []
 
 
-def fetch_player_game_data(player_id):
+def fetch_player_game_data(player_id, team_abbr="BKN"):
     """
     Busca dados de todos os jogos de um jogador na temporada atual.
 
     Args:
         player_id (int): ID do jogador na NBA API.
+        team_abbr (str): Sigla do time pelo qual o jogador atua (padrão: "BKN").
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados dos jogos.
     """
     try:
-        player_log = playergamelog.PlayerGameLog(player_id=player_id, season="2024-25").get_data_frames()[0]
+        player_log = carregar_gamelog(player_id, season="2024-25")
 
-        player_log = player_log[player_log['MATCHUP'].str.contains("BKN")]
+        player_log = player_log[player_log['MATCHUP'].str.contains(team_abbr)]
 
         player_log = player_log.rename(columns={
             'GAME_DATE': 'Data do Jogo',
@@ -51,8 +55,8 @@ def fetch_player_game_data(player_id):
         })
 
         player_log['V ou D'] = player_log['V ou D'].map({'W': 'V', 'L': 'D'})
-        player_log['Casa/Fora'] = player_log['Adversário'].apply(lambda x: 'Casa' if 'vs.' in x else 'Fora')
-        player_log['Adversário'] = player_log['Adversário'].apply(lambda x: x.split(' ')[-1])
+        player_log['Casa/Fora'] = local_do_jogo(player_log['Adversário'])
+        player_log['Adversário'] = sigla_adversario(player_log['Adversário'])
 
         columns = [
             'Data do Jogo', 'Adversário', 'V ou D', 'Casa/Fora', 'PTS', 'REB', 'AST',
@@ -67,7 +71,7 @@ def fetch_player_game_data(player_id):
         return pd.DataFrame()
 
 
-def apresentar_dados_partidas_time_por_id(team_id, output_dir, html_dir, img_dir):
+def apresentar_dados_partidas_time_por_id(team_id, output_dir, html_dir, img_dir, team_abbr="BKN", players=None):
     """
     Apresenta os dados para cada jogador do time contra um time adversário.
 
@@ -76,8 +80,11 @@ def apresentar_dados_partidas_time_por_id(team_id, output_dir, html_dir, img_dir
         output_dir (str): Diretório para salvar arquivos CSV.
         html_dir (str): Diretório para salvar arquivos HTML.
         img_dir (str): Diretório para salvar imagens.
+        team_abbr (str): Sigla do time pelo qual os jogadores atuam (padrão: "BKN").
+        players (list, opcional): Jogadores a apresentar; se não for informado, usa o elenco atual do time.
     """
-    players = fetch_team_players_by_id(team_id)
+    if players is None:
+        players = fetch_team_players_by_id(team_id)
 
     if not players:
         print("Nenhum jogador encontrado para o time especificado.")
@@ -93,13 +100,9 @@ def apresentar_dados_partidas_time_por_id(team_id, output_dir, html_dir, img_dir
 
         try:
             print(f"Buscando dados do jogador: {player_name}, ID: {player_id}")
-            player_game_data = fetch_player_game_data(player_id)
+            player_game_data = fetch_player_game_data(player_id, team_abbr)
 
-            player_log = playergamelog.PlayerGameLog(
-                player_id=player_id,
-                season="2024-25",
-                timeout=30
-            ).get_data_frames()[0]
+            player_log = carregar_gamelog(player_id, season="2024-25")
 
             if player_log.empty:
                 raise ValueError(f"Nenhuma partida encontrada para o jogador ID: {player_id}")
@@ -114,36 +117,10 @@ def apresentar_dados_partidas_time_por_id(team_id, output_dir, html_dir, img_dir
                 print(f"Tabela HTML salva em: {html_path}")
 
                 img_path = os.path.join(img_dir, f"{player_name}_dados_partidas.jpg")
-                salvar_tabela_como_imagem(player_game_data, img_path, f"Dados das Partidas - {player_name}")
+                salvar_tabela_como_imagem(player_game_data, img_path, f"Dados das Partidas - {player_name}", largura=12, altura_linha=0.6)
 
 
         except Exception as e:
             print(f"Erro ao processar dados do jogador {player_name}: {e}")
     
     print('Processamento da Parte2-RF2 concluído.')
-
-
-def salvar_tabela_como_imagem(df, img_path, title):
-    """
-    Salva uma tabela como imagem.
-
-    Args:
-        df (pd.DataFrame): DataFrame contendo os dados a serem salvos.
-        img_path (str): Caminho para salvar a imagem.
-        title (str): Título da tabela.
-    """
-    if df.empty:
-        print("DataFrame vazio. Não é possível salvar como imagem.")
-        return
-
-    fig, ax = plt.subplots(figsize=(12, len(df) * 0.6))
-    ax.axis("off")
-    ax.axis("tight")
-    ax.set_title(title, fontsize=16, weight="bold")
-    table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.auto_set_column_width(col=list(range(len(df.columns))))
-    plt.savefig(img_path, bbox_inches="tight", dpi=300)
-    plt.close()
-    print(f"Tabela salva como imagem em: {img_path}")
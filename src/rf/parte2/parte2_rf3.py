@@ -1,28 +1,26 @@
-from nba_api.stats.endpoints import playergamelog
 import pandas as pd
 import os
-import matplotlib.pyplot as plt
+from src.data.repositorio_gamelogs import carregar_gamelog
+from src.visualizations.tabelas import salvar_tabela_como_imagem
+from src.data.transformacoes import local_do_jogo
 
-def fetch_player_game_data_against_team(player_id, opponent_abbr):
+def fetch_player_game_data_against_team(player_id, opponent_abbr, team_abbr="BKN"):
     """
     Busca os dados de jogos de um jogador contra um time específico na temporada atual, 
-    garantindo que ele jogue pelo Brooklyn Nets (BKN).
+    garantindo que ele jogue pelo time informado (padrão: Brooklyn Nets, BKN).
 
     Args:
         player_id (int): ID do jogador na NBA API.
         opponent_abbr (str): Abreviação do time adversário (ex.: "LAL" para Los Angeles Lakers).
+        team_abbr (str): Sigla do time pelo qual o jogador atua (padrão: "BKN").
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados dos jogos contra o adversário.
     """
     try:
-        player_log = playergamelog.PlayerGameLog(
-            player_id=player_id,
-            season="2024-25",
-            timeout=30
-        ).get_data_frames()[0]
+        player_log = carregar_gamelog(player_id, season="2024-25")
 
-        player_log = player_log[player_log['MATCHUP'].str.contains("BKN")]
+        player_log = player_log[player_log['MATCHUP'].str.contains(team_abbr)]
         player_log = player_log[player_log['MATCHUP'].str.contains(opponent_abbr)]
 
         player_log = player_log.rename(columns={
@@ -37,7 +35,7 @@ def fetch_player_game_data_against_team(player_id, opponent_abbr):
             'MIN': 'Tempo de Permanência do Jogador em Quadra'
         })
 
-        player_log['Casa/Fora'] = player_log['Adversário'].apply(lambda x: 'Casa' if 'vs.' in x else 'Fora')
+        player_log['Casa/Fora'] = local_do_jogo(player_log['Adversário'])
         player_log['Adversário'] = opponent_abbr
         player_log['V ou D'] = player_log['V ou D'].map({'W': 'V', 'L': 'D'})
 
@@ -55,22 +53,26 @@ def fetch_player_game_data_against_team(player_id, opponent_abbr):
         return pd.DataFrame()
 
 
-def apresentar_dados_partidas_contra_time(opponent_abbr, output_dir, html_dir, img_dir):
+def apresentar_dados_partidas_contra_time(opponent_abbr, output_dir, html_dir, img_dir, team_abbr="BKN", players=None):
     """
-    Apresenta os dados das partidas dos três jogadores do Brooklyn Nets contra um time adversário.
+    Apresenta os dados das partidas dos jogadores de um time (padrão: três jogadores do Brooklyn Nets)
+    contra um time adversário.
 
     Args:
         opponent_abbr (str): Abreviação do time adversário (ex.: "LAL" para Los Angeles Lakers).
         output_dir (str): Diretório para salvar arquivos CSV.
         html_dir (str): Diretório para salvar arquivos HTML.
         img_dir (str): Diretório para salvar imagens.
+        team_abbr (str): Sigla do time pelo qual os jogadores atuam (padrão: "BKN").
+        players (list, opcional): Jogadores a apresentar (padrão: os três jogadores do Brooklyn Nets).
     """
     # IDs dos jogadores determinados
-    players = [
-        {'PLAYER': 'Cam Thomas', 'PLAYER_ID': 1630560},
-        {'PLAYER': 'Cameron Johnson', 'PLAYER_ID': 1629661},
-        {'PLAYER': 'D\'Angelo Russell', 'PLAYER_ID': 1626156}
-    ]
+    if players is None:
+        players = [
+            {'PLAYER': 'Cam Thomas', 'PLAYER_ID': 1630560},
+            {'PLAYER': 'Cameron Johnson', 'PLAYER_ID': 1629661},
+            {'PLAYER': 'D\'Angelo Russell', 'PLAYER_ID': 1626156}
+        ]
 
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(html_dir, exist_ok=True)
@@ -82,7 +84,7 @@ def apresentar_dados_partidas_contra_time(opponent_abbr, output_dir, html_dir, i
 
         try:
             print(f"Buscando dados do jogador: {player_name}, ID: {player_id}")
-            player_game_data = fetch_player_game_data_against_team(player_id, opponent_abbr)
+            player_game_data = fetch_player_game_data_against_team(player_id, opponent_abbr, team_abbr)
 
             if player_game_data.empty:
                 print(f"Nenhuma partida encontrada para {player_name} contra {opponent_abbr}.")
@@ -100,35 +102,9 @@ def apresentar_dados_partidas_contra_time(opponent_abbr, output_dir, html_dir, i
 
             # Salvar como imagem
             img_path = os.path.join(img_dir, f"{player_name}_vs_{opponent_abbr}.jpg")
-            salvar_tabela_como_imagem(player_game_data, img_path, f"Partidas contra {opponent_abbr} - {player_name}")
+            salvar_tabela_como_imagem(player_game_data, img_path, f"Partidas contra {opponent_abbr} - {player_name}", largura=12, altura_linha=0.6)
 
         except Exception as e:
             print(f"Erro ao processar dados do jogador {player_name}: {e}")
 
     print('Processamento da Parte2-RF3 concluído.')
-
-
-def salvar_tabela_como_imagem(df, img_path, title):
-    """
-    Salva uma tabela como imagem.
-
-    Args:
-        df (pd.DataFrame): DataFrame contendo os dados a serem salvos.
-        img_path (str): Caminho para salvar a imagem.
-        title (str): Título da tabela.
-    """
-    if df.empty:
-        print("DataFrame vazio. Não é possível salvar como imagem.")
-        return
-
-    fig, ax = plt.subplots(figsize=(12, len(df) * 0.6))
-    ax.axis("off")
-    ax.axis("tight")
-    ax.set_title(title, fontsize=16, weight="bold")
-    table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.auto_set_column_width(col=list(range(len(df.columns))))
-    plt.savefig(img_path, bbox_inches="tight", dpi=300)
-    plt.close()
-    print(f"Tabela salva como imagem em: {img_path}")
@@ -1,7 +1,8 @@
-from matplotlib import pyplot as plt
 from nba_api.stats.endpoints import playercareerstats
 import pandas as pd
 import os
+from src.data.cache_api import consultar_endpoint
+from src.visualizations.tabelas import salvar_tabela_como_imagem
 
 def fetch_career_stats(player_id):
     """
@@ -14,7 +15,8 @@ def fetch_career_stats(player_id):
         pd.DataFrame: DataFrame com os totais de carreira do jogador.
     """
     try:
-        career_stats = playercareerstats.PlayerCareerStats(
+        career_stats = consultar_endpoint(
+            playercareerstats.PlayerCareerStats,
             player_id=player_id, timeout=30
         ).get_data_frames()[0]
 
@@ -72,34 +74,9 @@ def apresentar_totais_carreira(players, output_dir, html_dir, img_dir):
 
             # Salvar como imagem
             img_path = os.path.join(img_dir, f"{player_name}_carreira_totais.jpg")
-            salvar_tabela_como_imagem(final, img_path, f"Totais de Carreira - {player_name}")
+            salvar_tabela_como_imagem(final, img_path, f"Totais de Carreira - {player_name}", largura=8, altura_linha=0.6, tamanho_titulo=14)
 
         except Exception as e:
             print(f"Erro ao processar dados do jogador {player_name}: {e}")
 
     print('Processamento da Parte2-RF9 concluído.')
-
-def salvar_tabela_como_imagem(df, img_path, title):
-    """
-    Salva uma tabela como imagem.
-
-    Args:
-        df (pd.DataFrame): DataFrame contendo os dados a serem salvos.
-        img_path (str): Caminho para salvar a imagem.
-        title (str): Título da tabela.
-    """
-    if df.empty:
-        print("DataFrame vazio. Não é possível salvar como imagem.")
-        return
-
-    fig, ax = plt.subplots(figsize=(8, len(df) * 0.6))
-    ax.axis("off")
-    ax.axis("tight")
-    ax.set_title(title, fontsize=14, weight="bold")
-    table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
-    table.auto_set_font_size(False)
-    table.set_fontsize(10)
-    table.auto_set_column_width(col=list(range(len(df.columns))))
-    plt.savefig(img_path, bbox_inches="tight", dpi=300)
-    plt.close()
-    print(f"Tabela salva como imagem em: {img_path}")
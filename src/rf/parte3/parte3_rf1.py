@@ -1,6 +1,9 @@
+import os
 import numpy as np
 import pandas as pd
-import scipy.stats as stats
+
+from src.analytics.extremos import METRICAS, LIMIARES_PADRAO, probabilidades_gumbel
+from src.data.lago import ler_gamelogs
 
 def aplicar_metodo_gumbel(dados, valores_x):
     """
@@ -22,30 +25,86 @@ def aplicar_metodo_gumbel(dados, valores_x):
                     "Proporção de valores menores que X (%)"]
     }
 
-    for coluna in ['PTS', 'REB', 'AST']:
-        if coluna in dados:
-            valores = dados[coluna].dropna().values
-            
-            loc, scale = stats.gumbel_r.fit(valores)
-            
-            x = valores_x.get(coluna, np.median(valores))
-            
-            # Cálculos
-            prob_acima_x = round((1 - stats.gumbel_r.cdf(x, loc, scale)) * 100, 2)  # Probabilidade de marcar acima de X (%)
-            prob_excede_x = round(stats.gumbel_r.sf(x, loc, scale) * 100, 2)  # Probabilidade de atingir ou exceder X (%)
-            prob_abaixo_x = round(stats.gumbel_r.cdf(x, loc, scale) * 100, 2)  # Probabilidade de atingir ou ficar abaixo de X (%)
-            prop_menor_igual_x = round(np.mean(valores <= x) * 100, 2)  # Proporção de valores menores ou iguais a X (%)
-            valores_menores_x = valores[valores < x]  # Valores menores que X
-            prop_menor_x = round(np.mean(valores < x) * 100, 2)  # Proporção de valores menores que X (%)
-            
-            resultados[coluna] = [
-                prob_acima_x,
-                prob_excede_x,
-                prob_abaixo_x,
-                prop_menor_igual_x,
-                valores_menores_x.tolist(),
-                prop_menor_x
-            ]
+    metricas = [coluna for coluna in METRICAS if coluna in dados]
+    limiares = {coluna: valores_x.get(coluna, np.median(dados[coluna].dropna().values)) for coluna in metricas}
+    # Um único ajuste vetorizado para todas as métricas, avaliado nos valores de X de cada uma
+    tabela = probabilidades_gumbel(dados, limiares=sorted(set(limiares.values())), metricas=metricas)
+
+    for coluna in metricas:
+        valores = dados[coluna].dropna().values
+        x = limiares[coluna]
+        linha = tabela[(tabela["metrica"] == coluna) & (tabela["limiar"] == x)].iloc[0]
+
+        prob_acima_x = round(linha["prob_acima"] * 100, 2)  # Probabilidade de marcar acima de X (%)
+        prob_abaixo_x = round(linha["prob_abaixo"] * 100, 2)  # Probabilidade de atingir ou ficar abaixo de X (%)
+        resultados[coluna] = [
+            prob_acima_x,
+            prob_acima_x,  # Probabilidade de atingir ou exceder X (%): a distribuição é contínua
+            prob_abaixo_x,
+            round(linha["prop_menor_igual"] * 100, 2),  # Proporção de valores menores ou iguais a X (%)
+            valores[valores < x].tolist(),  # Valores menores que X
+            round(linha["prop_menor"] * 100, 2)  # Proporção de valores menores que X (%)
+        ]
     
     print('Processamento da Parte3-RF1 concluído.')
     return pd.DataFrame(resultados)
+
+
+def aplicar_metodo_gumbel_jogadores(players, valores_x_por_jogador, team_abbr="BKN", season="2024-25"):
+    """
+    Aplica o método de Gumbel aos jogos de vários jogadores pelo time, lidos do repositório de game logs.
+
+    Os jogos são os mesmos da tabela de partidas da Parte 2 RF2 (temporada atual, jogos pelo time), mas
+    vêm direto dos arquivos Parquet, lendo só as colunas usadas e só as partições dos jogadores.
+
+    Args:
+        players (list): Dicionários com 'PLAYER' e 'PLAYER_ID' de cada jogador.
+        valores_x_por_jogador (dict): Valores de X de cada jogador, no formato de aplicar_metodo_gumbel().
+        team_abbr (str): Sigla do time pelo qual os jogadores atuam (padrão: "BKN").
+        season (str): Temporada no formato 'YYYY-YY' (padrão: '2024-25').
+
+    Returns:
+        dict: DataFrame de resultados de cada jogador.
+    """
+    ids = {player['PLAYER']: player['PLAYER_ID'] for player in players}
+    jogos = ler_gamelogs("jogadores", colunas=["PLAYER_ID", "MATCHUP", "PTS", "REB", "AST"],
+                         filtros={"SEASON": season, "PLAYER_ID": list(ids.values())})
+    if not jogos.empty:
+        jogos = jogos[jogos["MATCHUP"].str.contains(team_abbr)]
+
+    resultados = {}
+    for nome_jogador, valores_x in valores_x_por_jogador.items():
+        dados = jogos[jogos["PLAYER_ID"] == ids[nome_jogador]] if not jogos.empty else jogos
+        if dados.empty:
+            print(f"Nenhum jogo de {nome_jogador} na temporada {season} no repositório de game logs.")
+            continue
+        resultados[nome_jogador] = aplicar_metodo_gumbel(dados, valores_x)
+
+    return resultados
+
+
+def gumbel_liga(season="2024-25", limiares=LIMIARES_PADRAO, metodo="mle",
+                output_dir="reports/liga/arquivos_csv/parte3"):
+    """
+    Aplica o método de Gumbel a todos os jogadores da liga no repositório de game logs, varrendo os limiares.
+
+    Args:
+        season (str): Temporada no formato 'YYYY-YY' (padrão: '2024-25').
+        limiares (array): Valores de X avaliados (padrão: 0 a 60).
+        metodo (str): 'mle' (padrão) ou 'momentos' (ver src/analytics/extremos.py).
+        output_dir (str): Pasta do CSV gerado.
+
+    Returns:
+        pd.DataFrame: Probabilidades de cada jogador, métrica e limiar (ver probabilidades_gumbel()).
+    """
+    jogos = ler_gamelogs("jogadores", colunas=["PLAYER_ID", *METRICAS], filtros={"SEASON": season})
+    if jogos.empty:
+        print(f"Nenhum jogo da temporada {season} no repositório de game logs.")
+        return None
+
+    tabela = probabilidades_gumbel(jogos, limiares=limiares, por=["PLAYER_ID"], metodo=metodo)
+    os.makedirs(output_dir, exist_ok=True)
+    caminho = os.path.join(output_dir, f"rf1_gumbel_liga_{season.replace('-', '_')}.csv")
+    tabela.to_csv(caminho, index=False)
+    print(f"Método de Gumbel aplicado a {tabela['PLAYER_ID'].nunique()} jogadores e {len(limiares)} limiares: {caminho}")
+    return tabela
@@ -79,3 +79,15 @@ def visualizando_metodo_gumbel(resultado_df, nome_jogador, output_dir):
     plt.close()
     print(f"Gráficos salvos em: {output_path}")
     print('Processamento da Parte3-RF2 concluído.')
+
+
+def visualizar_resultados_gumbel(resultados, output_dir):
+    """
+    Gera os gráficos do método de Gumbel para vários jogadores.
+
+    Args:
+        resultados (dict): DataFrame de resultados (Parte 3 RF1) de cada jogador.
+        output_dir (str): Diretório onde os gráficos serão salvos.
+    """
+    for nome_jogador, resultado_df in resultados.items():
+        visualizando_metodo_gumbel(resultado_df, nome_jogador, output_dir)
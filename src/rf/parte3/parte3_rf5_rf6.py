@@ -4,86 +4,136 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from nba_api.stats.endpoints import leaguedashplayerstats
-from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import auc, confusion_matrix, roc_curve
 from sklearn.model_selection import train_test_split
-
-def analisar_regressao_logistica_graficos():
-    players = [
-        {"PLAYER": "Cam Thomas", "PLAYER_ID": 1630560},
-        {"PLAYER": "Cameron Johnson", "PLAYER_ID": 1629661},
-        {"PLAYER": "D'Angelo Russell", "PLAYER_ID": 1626156},
-    ]
-
-    output_dir = "reports/arquivos_csv/parte3/parte3-rf5-rf6"
-    html_dir = "reports/html/parte3/parte3-rf5-rf6"
-    img_dir = "reports/imagens/parte3/parte3-rf5-rf6"
+from src.data.liga import estatisticas_jogadores_time
+from src.models.regressao_logistica import ajustar_logisticas, probabilidades_logisticas
+from src.models.registro import obter_modelo
+
+# Limiares das classificações "acima do limiar"; o RF5 e o RF6 usam a mediana, e a média
+# entra apenas na tabela de classificações
+LIMIARES = {"mediana": lambda valores: valores.median(), "media": lambda valores: valores.mean()}
+
+
+def _problemas_da_temporada(base, targets, season):
+    # Uma classificação por target e limiar, com a mesma divisão treino/teste estratificada de antes
+    problemas = {}
+    for target in targets:
+        for limiar, calcular in LIMIARES.items():
+            valor = calcular(base[target])
+            classes = (base[target] > valor).astype(int).to_numpy()
+            if len(np.unique(classes)) < 2 or np.bincount(classes).min() < 2:
+                print(f"Atenção: O target {target} (limiar: {limiar}) para a temporada {season} não possui exemplos "
+                      f"suficientes em ambas as classes. Pulando esta análise.")
+                continue
+            treino, teste = train_test_split(np.arange(len(base)), test_size=0.3, random_state=42, stratify=classes)
+            Y = np.full(len(base), -1)
+            Y[treino] = classes[treino]
+            problemas[(target, limiar)] = {"valor": valor, "classes": classes, "teste": teste, "Y": Y}
+    return problemas
+
+
+def _linhas_classificacao(season, chave, problema):
+    # Linhas da tabela de classificações: um ponto da curva ROC por linha, com a matriz de confusão e a AUC
+    vn, fp, fn, vp = confusion_matrix(problema["y_test"], problema["y_pred"], labels=[0, 1]).ravel()
+    fpr, tpr, _ = roc_curve(problema["y_test"], problema["y_prob"])
+    return pd.DataFrame({
+        "temporada": season, "target": chave[0], "limiar": chave[1], "valor_limiar": problema["valor"],
+        "jogadores_teste": len(problema["teste"]), "vn": vn, "fp": fp, "fn": fn, "vp": vp, "auc": auc(fpr, tpr),
+        "fpr": fpr, "tpr": tpr,
+    })
+
+
+def analisar_regressao_logistica_graficos(team_id=1610612751, seasons=["2023-24", "2024-25"], players=None,
+                                          team_name="Brooklyn Nets",
+                                          output_dir="reports/arquivos_csv/parte3/parte3-rf5-rf6",
+                                          html_dir="reports/html/parte3/parte3-rf5-rf6",
+                                          img_dir="reports/imagens/parte3/parte3-rf5-rf6"):
+    if players is None:
+        players = [
+            {"PLAYER": "Cam Thomas", "PLAYER_ID": 1630560},
+            {"PLAYER": "Cameron Johnson", "PLAYER_ID": 1629661},
+            {"PLAYER": "D'Angelo Russell", "PLAYER_ID": 1626156},
+        ]
 
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(html_dir, exist_ok=True)
     os.makedirs(img_dir, exist_ok=True)
 
     # Parâmetros fixos
-    team_id = 1610612751  # Brooklyn Nets
-    seasons = ["2023-24", "2024-25"]
     features = ["MIN", "FGA", "TOV"]
     targets = ["PTS", "AST", "REB"]
 
     target_mapping = {"PTS": "Pontos", "AST": "Assistências", "REB": "Rebotes"}
+    tabela = []
 
     for season in seasons:
-        print(f"\nProcessando dados para a temporada {season} dos Brooklyn Nets...")
+        print(f"\nProcessando dados para a temporada {season} dos {team_name}...")
 
         try:
-            stats = leaguedashplayerstats.LeagueDashPlayerStats(
-                season=season, season_type_all_star="Regular Season", team_id_nullable=team_id
-            )
-            df = stats.get_data_frames()[0]
+            # Estatísticas da liga inteira (uma requisição por temporada, compartilhada entre os times)
+            df = estatisticas_jogadores_time(team_id, season)
         except Exception as e:
             print(f"Erro ao obter os dados da API para a temporada {season}: {e}")
             continue
 
         if df.empty:
-            print(f"Nenhum dado encontrado para o Brooklyn Nets na temporada {season}.")
+            print(f"Nenhum dado encontrado para o {team_name} na temporada {season}.")
             continue
 
         # Converter para numérico
         for col in features + targets:
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
+        base = df[["PLAYER_ID", "PLAYER_NAME"] + features + targets].dropna()
+        problemas = _problemas_da_temporada(base, targets, season)
+        if not problemas:
+            continue
 
-        for target in targets:
-            print(f"\nProcessando o target: {target} para a temporada {season}")
-            data = df[["PLAYER_ID", "PLAYER_NAME"] + features + [target]].dropna()
-
-            if data.empty:
-                print(f"Atenção: Nenhum dado válido para {target} na temporada {season}. Pulando esta análise.")
+        # Todas as classificações (target x limiar) da temporada em um único ajuste vetorizado;
+        # os limiares pela média partem dos coeficientes dos limiares pela mediana (warm start)
+        X = base[features].to_numpy(dtype=np.float64)
+        coeficientes = {}
+        for limiar in LIMIARES:
+            chaves = [chave for chave in problemas if chave[1] == limiar]
+            if not chaves:
                 continue
+            Y = np.column_stack([problemas[chave]["Y"] for chave in chaves])
+            inicial = np.array([coeficientes.get((chave[0], "mediana"), np.zeros(X.shape[1] + 1)) for chave in chaves])
+            coef = obter_modelo("regressao_logistica_lote",
+                                {"team_id": team_id, "season": season, "features": features,
+                                 "problemas": [list(chave) for chave in chaves]},
+                                X, Y, lambda X, Y: ajustar_logisticas(X, Y, inicial=inicial),
+                                aquecer=lambda anterior, X, Y, ampliado: ajustar_logisticas(X, Y, inicial=anterior))
+            coeficientes.update(zip(chaves, coef))
+
+        probabilidades = probabilidades_logisticas(np.array(list(coeficientes.values())), X)
+        for j, chave in enumerate(coeficientes):
+            problema = problemas[chave]
+            teste = problema["teste"]
+            problema["y_test"] = problema["classes"][teste]
+            problema["y_prob"] = probabilidades[teste, j]
+            problema["y_pred"] = (problema["y_prob"] > 0.5).astype(int)
+            tabela.append(_linhas_classificacao(season, chave, problema))
 
-            median_val = data[target].median()
-            data["target_class"] = (data[target] > median_val).astype(int)
-
-            if len(data["target_class"].unique()) < 2 or data["target_class"].value_counts().min() < 2:
-                print(f"Atenção: O target {target} para a temporada {season} não possui exemplos suficientes em ambas as classes. Pulando esta análise.")
+        for target in targets:
+            chave = (target, "mediana")
+            if chave not in problemas:
                 continue
+            print(f"\nProcessando o target: {target} para a temporada {season}")
+            problema = problemas[chave]
+            X_test = base[features].iloc[problema["teste"]]
+            y_test = problema["y_test"]
+            y_pred = problema["y_pred"]
 
-            X_train, X_test, y_train, y_test = train_test_split(
-                data[features], data["target_class"], test_size=0.3, random_state=42, stratify=data["target_class"]
-            )
-
-            model = LogisticRegression()
-            model.fit(X_train, y_train)
-            y_pred = model.predict(X_test)
-
-            conf_matrix = confusion_matrix(y_test, y_pred)
+            conf_matrix = confusion_matrix(y_test, y_pred, labels=[0, 1])
 
             test_data = X_test.copy()
-            test_data["Real"] = y_test.values
+            test_data["Real"] = y_test
             test_data["Predito"] = y_pred
 
             for player in players:
-                if player["PLAYER_ID"] not in data["PLAYER_ID"].values:
+                if player["PLAYER_ID"] not in base["PLAYER_ID"].values:
                     print(f"Jogador {player['PLAYER']} não encontrado na base, adicionando com valores NaN.")
                     new_row = pd.Series(
                         {**{col: np.nan for col in features}, "Real": np.nan, "Predito": np.nan}
@@ -129,7 +179,7 @@ def analisar_regressao_logistica_graficos():
             plt.close()
             print(f"Gráfico da Matriz de Confusão salvo em: {img_filename}")
 
-            y_prob = model.predict_proba(X_test)[:, 1]  # Probabilidade da classe positiva (Acima Mediana)
+            y_prob = problema["y_prob"]  # Probabilidade da classe positiva (Acima Mediana)
 
             # Calcular a curva ROC
             fpr, tpr, _ = roc_curve(y_test, y_prob)
@@ -155,4 +205,14 @@ def analisar_regressao_logistica_graficos():
 
         print(f"\nProcessamento finalizado para a temporada {season}.")
 
-    print("Processamento concluído.")
\ No newline at end of file
+    if not tabela:
+        print("Processamento concluído.")
+        return None
+
+    # Matrizes de confusão e curvas ROC de todas as temporadas, targets e limiares em uma única tabela
+    classificacoes = pd.concat(tabela, ignore_index=True)
+    tabela_csv = os.path.join(output_dir, "rf5_rf6_classificacoes.csv")
+    classificacoes.to_csv(tabela_csv, index=False)
+    print(f"Tabela de classificações salva em: {tabela_csv}")
+    print("Processamento concluído.")
+    return classificacoes
\ No newline at end of file
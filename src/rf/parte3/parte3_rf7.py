@@ -9,86 +9,59 @@ np.int = int
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
-from pygam import PoissonGAM, LinearGAM, s
-from scipy.stats import poisson, norm, mode
-from nba_api.stats.endpoints import playergamelog
-import time
+from scipy.stats import poisson, norm
+from src.analytics.agregados import resumos_distribuicao
+from src.models.gams_jogadores import ESTATISTICAS, METRICAS_ESTATISTICAS, carregar_dados_jogadores, ajustar_gams_jogadores
 
-def gamlss_brooklyn_nets():
+def gamlss_brooklyn_nets(players=None, team_abbr="BKN", seasons=["2023-24", "2024-25"],
+                         csv_dir='reports/arquivos_csv/parte3', html_dir='reports/html/parte3',
+                         img_dir='reports/imagens/parte3'):
 
     print("Executando RF7: Fazendo previsão através de GAMLSS...")
 
     # Configura diretórios de saída para as tabelas e imagens
-    csv_dir = 'reports/arquivos_csv/parte3'
-    html_dir = 'reports/html/parte3'
-    img_dir = 'reports/imagens/parte3'
     for d in [csv_dir, html_dir, img_dir]:
         os.makedirs(d, exist_ok=True)
 
-    # Definir os jogadores e seus IDs (Brooklyn Nets)
-    players = {
-        1630560: 'Cam Thomas',
-        1629661: 'Cameron Johnson',
-        1626156: "D'Angelo Russell"
-    }
+    # Definir os jogadores e seus IDs (padrão: Brooklyn Nets)
+    if players is None:
+        players = {
+            1630560: 'Cam Thomas',
+            1629661: 'Cameron Johnson',
+            1626156: "D'Angelo Russell"
+        }
+    else:
+        players = {player['PLAYER_ID']: player['PLAYER'] for player in players}
 
     # Buscar dados reais através da API nba_api para as temporadas desejadas
-    seasons = ["2023-24", "2024-25"]
-    data_list = []
-    for season in seasons:
-        for pid, player_name in players.items():
-            print(f"Buscando dados para {player_name} na temporada {season}...")
-            try:
-                time.sleep(1)  # Delay para evitar rate limiting
-                gamelog = playergamelog.PlayerGameLog(
-                    player_id=pid,
-                    season=season,
-                    season_type_all_star='Regular Season'
-                )
-                df = gamelog.get_data_frames()[0]
-                # Filtrar jogos dos Brooklyn Nets usando a coluna "MATCHUP"
-                df = df[df["MATCHUP"].str.contains("BKN")]
-                if df.empty:
-                    print(f"Não há dados para {player_name} na temporada {season}.")
-                    continue
-                df = df.sort_values("GAME_DATE")
-                df["game"] = range(1, len(df) + 1)
-                df["player_id"] = pid
-                df["team"] = "BKN"
-                df = df.rename(columns={"PTS": "points", "REB": "rebounds", "AST": "assists"})
-                df = df[["team", "player_id", "game", "points", "rebounds", "assists"]]
-                data_list.append(df)
-            except Exception as e:
-                print(f"Erro ao buscar dados para {player_name} na temporada {season}: {e}")
-
-    if not data_list:
-        print("Nenhum dado foi recuperado da API nba_api.")
+    data = carregar_dados_jogadores(players, team_abbr, seasons)
+    if data is None:
         return
 
-    data = pd.concat(data_list, ignore_index=True)
+    # Os modelos são ajustados em paralelo e ficam salvos para a RF8, que usa os mesmos ajustes
+    modelos = ajustar_gams_jogadores(data, players, ESTATISTICAS)
+
+    # Valores de referência dos histogramas salvos com os agregados (etapa P2-AGREGADOS), os mesmos da RF8
+    resumos = resumos_distribuicao(list(players), seasons, team_abbr)
 
-    def process_prediction(player_data, stat, player_name):
+    def process_prediction(player_data, stat, player_name, poisson_gam, linear_gam):
         X = player_data['game'].values.reshape(-1, 1)
         y = player_data[stat].values
         next_game = player_data['game'].max() + 1
 
-        poisson_gam = PoissonGAM(s(0))
-        poisson_gam.gridsearch(X, y)
         pred_poisson = poisson_gam.predict(np.array([[next_game]]))[0]
-
-        linear_gam = LinearGAM(s(0))
-        linear_gam.gridsearch(X, y)
         pred_linear = linear_gam.predict(np.array([[next_game]]))[0]
         residuals = y - linear_gam.predict(X)
         sigma = np.std(residuals)
         if sigma == 0:
             sigma = 1e-6
 
-        mean_val = np.mean(y)
-        median_val = np.median(y)
-        mode_val = np.atleast_1d(mode(y).mode)[0]
-        min_val = np.min(y)
-        max_val = np.max(y)
+        resumo = resumos[(int(player_data['player_id'].iloc[0]), METRICAS_ESTATISTICAS[stat])]
+        mean_val = resumo.media
+        median_val = resumo.mediana
+        mode_val = resumo.moda
+        min_val = resumo.minimo
+        max_val = resumo.maximo
 
         references = {
             'mean': mean_val,
@@ -135,15 +108,15 @@ def gamlss_brooklyn_nets():
         }
         return result
 
-    stats = ['points', 'rebounds', 'assists']
     all_results = []
     for pid, player_name in players.items():
         player_data = data[data['player_id'] == pid]
         if player_data.empty:
             print(f"Sem dados para {player_name}.")
             continue
-        for stat in stats:
-            res = process_prediction(player_data, stat, player_name)
+        for stat in ESTATISTICAS:
+            ajuste = modelos[player_name][stat]
+            res = process_prediction(player_data, stat, player_name, ajuste['poisson'], ajuste['linear'])
             all_results.append(res)
 
     if not all_results:
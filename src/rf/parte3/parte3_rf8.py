@@ -27,26 +27,29 @@ import numpy as np
 np.int = int
 
 import os
-import time
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import mpld3  # para gerar gráficos interativos em HTML
 
-from pygam import PoissonGAM, LinearGAM, s
-from scipy.stats import poisson, norm, mode
-from nba_api.stats.endpoints import playergamelog
+from scipy.stats import poisson, norm
+from src.models.gams_jogadores import ESTATISTICAS, METRICAS_ESTATISTICAS, carregar_dados_jogadores, ajustar_gams_jogadores
+from src.analytics.agregados import resumos_distribuicao
 
 # Para avaliação de classificação:
 from sklearn.metrics import confusion_matrix, roc_curve, auc
 
-def graficos_gamglss_nets():
+def graficos_gamglss_nets(players=None, team_abbr="BKN", seasons=["2023-24", "2024-25"],
+                          csv_dir='reports/arquivos_csv/parte3', html_dir='reports/html/parte3',
+                          img_dir='reports/imagens/parte3'):
     """
     Função principal que:
-      1. Obtém os dados reais (via nba_api) para os jogadores dos Brooklyn Nets (Cam Thomas,
-         Cameron Johnson e D'Angelo Russell) nas temporadas 2023-24 e 2024-25.
+      1. Obtém os dados reais (via nba_api) para os jogadores do time informado nas temporadas
+         informadas (padrão: Cam Thomas, Cameron Johnson e D'Angelo Russell, dos Brooklyn Nets,
+         nas temporadas 2023-24 e 2024-25). Os jogadores são dicionários com 'PLAYER' e 'PLAYER_ID'.
       2. Ajusta os modelos PoissonGAM e LinearGAM para as estatísticas (points, rebounds, assists),
-         gerando previsões para o próximo jogo.
+         gerando previsões para o próximo jogo. Os ajustes feitos pela RF7 com os mesmos dados são
+         reaproveitados (ver src/models/gams_jogadores.py).
       3. Gera os seguintes gráficos para cada jogador e estatística:
            - Matriz de Confusão (classificação "acima/abaixo da mediana" usando o modelo Poisson)
            - Gráfico da Distribuição de Probabilidade Predita (PMF da distribuição de Poisson para o próximo jogo)
@@ -58,76 +61,51 @@ def graficos_gamglss_nets():
     print("Executando RF8: Gerando gráficos através de GAMLSS...")
 
     # Configurar diretórios de saída
-    csv_dir = 'reports/arquivos_csv/parte3'
-    html_dir = 'reports/html/parte3'
-    img_dir = 'reports/imagens/parte3'
     for d in [csv_dir, html_dir, img_dir]:
         os.makedirs(d, exist_ok=True)
 
-    # Definir jogadores (IDs da nba_api) e nomes – Brooklyn Nets
-    players = {
-        1630560: 'Cam Thomas',
-        1629661: 'Cameron Johnson',
-        1626156: "D'Angelo Russell"
-    }
-    seasons = ["2023-24", "2024-25"]
-    data_list = []
-    # Obter dados via nba_api para cada temporada e jogador
-    for season in seasons:
-        for pid, player_name in players.items():
-            print(f"Buscando dados para {player_name} na temporada {season}...")
-            try:
-                time.sleep(1)  # Delay para evitar rate limiting
-                gamelog = playergamelog.PlayerGameLog(
-                    player_id=pid,
-                    season=season,
-                    season_type_all_star='Regular Season'
-                )
-                df = gamelog.get_data_frames()[0]
-                # Filtrar apenas jogos dos Nets (usando "MATCHUP" que contenha "BKN")
-                df = df[df["MATCHUP"].str.contains("BKN")]
-                if df.empty:
-                    print(f"Não há dados para {player_name} na temporada {season}.")
-                    continue
-                df = df.sort_values("GAME_DATE")
-                df["game"] = range(1, len(df) + 1)
-                df["player_id"] = pid
-                df["team"] = "BKN"
-                df = df.rename(columns={"PTS": "points", "REB": "rebounds", "AST": "assists"})
-                df = df[["team", "player_id", "game", "points", "rebounds", "assists"]]
-                data_list.append(df)
-            except Exception as e:
-                print(f"Erro ao buscar dados para {player_name} na temporada {season}: {e}")
-    if not data_list:
-        print("Nenhum dado foi recuperado da API nba_api.")
+    # Definir jogadores (IDs da nba_api) e nomes – padrão: Brooklyn Nets
+    if players is None:
+        players = {
+            1630560: 'Cam Thomas',
+            1629661: 'Cameron Johnson',
+            1626156: "D'Angelo Russell"
+        }
+    else:
+        players = {player['PLAYER_ID']: player['PLAYER'] for player in players}
+    data = carregar_dados_jogadores(players, team_abbr, seasons)
+    if data is None:
         return
-    data = pd.concat(data_list, ignore_index=True)
+
+    # Os ajustes da RF7 (mesmos dados) são carregados do disco; os que faltarem rodam em paralelo
+    ajustes = ajustar_gams_jogadores(data, players, ESTATISTICAS)
+
+    # Valores de referência dos histogramas salvos com os agregados (etapa P2-AGREGADOS), os mesmos da RF7
+    resumos = resumos_distribuicao(list(players), seasons, team_abbr)
 
     # Armazenar modelos e dados para os gráficos
-    modelos = {}  # modelos[player][stat] = { 'poisson': ..., 'linear': ..., 'X': ..., 'y': ..., 'median': ..., 'predicted_poisson': ... }
-    stats = ['points', 'rebounds', 'assists']
+    modelos = {}  # modelos[player][stat] = { 'poisson': ..., 'linear': ..., 'X': ..., 'y': ..., 'resumo': ..., 'median': ..., 'predicted_poisson': ... }
     for pid, player_name in players.items():
         modelos[player_name] = {}
         player_data = data[data['player_id'] == pid]
         if player_data.empty:
             print(f"Sem dados para {player_name}.")
             continue
-        for stat in stats:
-            X = player_data['game'].values.reshape(-1, 1)
-            y = player_data[stat].values
-            # Ajuste dos modelos
-            poisson_model = PoissonGAM(s(0))
-            poisson_model.gridsearch(X, y)
-            linear_model = LinearGAM(s(0))
-            linear_model.gridsearch(X, y)
+        for stat in ESTATISTICAS:
+            ajuste = ajustes[player_name][stat]
+            X = ajuste['X']
+            y = ajuste['y']
+            poisson_model = ajuste['poisson']
+            linear_model = ajuste['linear']
             next_game = player_data['game'].max() + 1
             pred_poisson = poisson_model.predict(np.array([[next_game]]))[0]
             pred_linear = linear_model.predict(np.array([[next_game]]))[0]
-            median_val = np.median(y)
+            resumo = resumos[(int(pid), METRICAS_ESTATISTICAS[stat])]
             modelos[player_name][stat] = {
                 'X': X,
                 'y': y,
-                'median': median_val,
+                'resumo': resumo,
+                'median': resumo.mediana,
                 'poisson': poisson_model,
                 'linear': linear_model,
                 'predicted_poisson': pred_poisson,
@@ -180,8 +158,9 @@ def graficos_gamglss_nets():
             pmf_vals = poisson.pmf(x_vals, pred_lambda)
             fig, ax = plt.subplots(figsize=(8, 5))
             ax.bar(x_vals, pmf_vals, color="skyblue", edgecolor="black", label=f"λ = {pred_lambda:.1f}")
-            refs = {"média": np.mean(y), "mediana": median_val, "moda": np.atleast_1d(mode(y).mode)[0],
-                    "mínimo": np.min(y), "máximo": np.max(y)}
+            resumo = dados['resumo']
+            refs = {"média": resumo.media, "mediana": median_val, "moda": resumo.moda,
+                    "mínimo": resumo.minimo, "máximo": resumo.maximo}
             for ref, valor in refs.items():
                 ax.axvline(valor, color="red", linestyle="--", label=f"{ref}: {valor:.1f}")
             ax.set_title(f"Distribuição Poisson Predita - {player_name} - {stat}")
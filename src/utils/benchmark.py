@@ -0,0 +1,286 @@
+import os
+import sys
+import glob
+import json
+import time
+import platform
+import threading
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from src.data.transporte_gravado import estatisticas_http, zerar_estatisticas_http
+from src.utils.manifesto_etapas import RegistroArtefatos, listar_artefatos
+from src.utils.pipeline import carregar_intermediario, salvar_intermediario
+
+# Intervalo (em segundos) entre as leituras da memória residente durante uma etapa
+INTERVALO_MEMORIA = 0.02
+
+# Aumento relativo tolerado antes de uma métrica ser considerada uma regressão
+TOLERANCIA_PADRAO = 0.2
+
+# Métricas comparadas com a baseline; as de tempo e memória usam a tolerância, as demais não podem aumentar
+METRICAS_COM_TOLERANCIA = ("tempo_s", "cpu_s", "pico_rss_mb")
+METRICAS_EXATAS = ("requisicoes_http",)
+
+# Diferenças menores que estas nunca são regressões (ruído de etapas muito curtas)
+DIFERENCA_MINIMA = {"tempo_s": 0.05, "cpu_s": 0.05, "pico_rss_mb": 5.0}
+
+
+def _rss(pid="self"):
+    # Memória residente de um processo, em bytes (None fora do Linux ou se o processo já terminou)
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _descendentes(pid="self"):
+    # Processos filhos (e netos) ainda em execução, pelo /proc/<pid>/task/<tid>/children do Linux
+    filhos = []
+    for arquivo in glob.glob(f"/proc/{pid}/task/*/children"):
+        try:
+            with open(arquivo, "r") as f:
+                filhos.extend(int(filho) for filho in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return [neto for filho in filhos for neto in [filho, *_descendentes(filho)]]
+
+
+def _rss_atual():
+    # Memória residente do processo somada à dos seus filhos (pools de renderização e de ajuste)
+    proprio = _rss()
+    if proprio is None:
+        return None
+    return proprio + sum(_rss(pid) or 0 for pid in _descendentes())
+
+
+def _rss_maximo(quem="RUSAGE_SELF"):
+    if resource is None:
+        return 0
+    maximo = resource.getrusage(getattr(resource, quem)).ru_maxrss
+    # ru_maxrss vem em bytes no macOS e em kilobytes no Linux
+    return maximo if sys.platform == "darwin" else maximo * 1024
+
+
+def _cpu_filhos():
+    # Tempo de CPU (usuário + sistema) dos processos filhos já encerrados, como os workers dos pools
+    if resource is None:
+        return 0.0
+    uso = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return uso.ru_utime + uso.ru_stime
+
+
+class MonitorMemoria:
+    """
+    Acompanha o pico de memória residente (RSS) do processo e dos seus filhos enquanto está ativo.
+
+    No Linux, uma thread soma a memória do processo e dos filhos em execução a cada INTERVALO_MEMORIA
+    segundos, então o pico é o da etapa medida, incluindo os pools que ela abre. Nos demais sistemas, usa
+    o pico do processo inteiro (getrusage). Em ambos, o pico do maior filho encerrado durante a etapa
+    (RUSAGE_CHILDREN) serve de limite inferior, para os filhos curtos demais para a amostragem.
+    """
+
+    def __init__(self, intervalo=INTERVALO_MEMORIA):
+        self.intervalo = intervalo
+        self.pico = 0
+        self._parar = threading.Event()
+        self._thread = None
+        self._filhos_antes = 0
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self.pico = max(self.pico, _rss_atual() or 0)
+
+    def __enter__(self):
+        self._filhos_antes = _rss_maximo("RUSAGE_CHILDREN")
+        atual = _rss_atual()
+        if atual is not None:
+            self.pico = atual
+            self._thread = threading.Thread(target=self._amostrar, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._parar.set()
+            self._thread.join()
+            self.pico = max(self.pico, _rss_atual() or 0)
+        else:
+            self.pico = _rss_maximo()
+        # ru_maxrss dos filhos é o maior desde o início do processo; só vale se aumentou nesta etapa
+        filhos = _rss_maximo("RUSAGE_CHILDREN")
+        if filhos > self._filhos_antes:
+            self.pico = max(self.pico, filhos)
+        return False
+
+
+def medir_etapa(nome, etapa):
+    """
+    Executa uma etapa do pipeline no processo atual e mede o seu custo.
+
+    Args:
+        nome (str): Nome da etapa.
+        etapa (dict): Definição da etapa, no formato de src/rf/etapas.py.
+
+    Returns:
+        dict: Situação ('concluida' ou 'falhou'), tempo_s, cpu_s (incluindo cpu_filhos_s, a CPU dos
+        processos filhos), requisicoes_http, bytes_http, pico_rss_mb (processo e filhos), artefatos e
+        bytes_artefatos (e 'erro', se a etapa falhar).
+    """
+    kwargs = dict(etapa.get("kwargs", {}), **{
+        parametro: carregar_intermediario(origem) for parametro, origem in etapa.get("intermediarios", {}).items()
+    })
+
+    zerar_estatisticas_http()
+    inicio, inicio_cpu, inicio_cpu_filhos = time.perf_counter(), time.process_time(), _cpu_filhos()
+    erro = None
+    with MonitorMemoria() as memoria, RegistroArtefatos() as registro:
+        try:
+            resultado = etapa["funcao"](**kwargs)
+        except Exception as e:
+            resultado, erro = None, e
+    # Os pools abertos pela etapa já foram encerrados (e aguardados), então a sua CPU está em RUSAGE_CHILDREN
+    tempo, cpu, cpu_filhos = time.perf_counter() - inicio, time.process_time() - inicio_cpu, _cpu_filhos() - inicio_cpu_filhos
+
+    if resultado is not None:
+        registro.caminhos.add(os.path.abspath(salvar_intermediario(nome, resultado)))
+    http = estatisticas_http()
+    artefatos = listar_artefatos(etapa.get("saidas", []), registro.caminhos)
+
+    medicao = {
+        "situacao": "falhou" if erro else "concluida",
+        "tempo_s": round(tempo, 3),
+        "cpu_s": round(cpu + cpu_filhos, 3),
+        "cpu_filhos_s": round(cpu_filhos, 3),
+        "requisicoes_http": http["requisicoes"],
+        "bytes_http": http["bytes"],
+        "pico_rss_mb": round(memoria.pico / 2 ** 20, 1),
+        "artefatos": len(artefatos),
+        "bytes_artefatos": sum(artefatos.values()),
+    }
+    if erro:
+        medicao["erro"] = f"{type(erro).__name__}: {erro}"
+    return medicao
+
+
+def executar_benchmark(etapas, selecionadas=None):
+    """
+    Mede as etapas selecionadas uma a uma, no processo atual e na ordem do grafo.
+
+    Diferente do executar_pipeline(), não há paralelismo nem reaproveitamento pelo manifesto: toda etapa
+    é executada, para que as medidas de uma não se misturem com as de outra. As dependências são
+    respeitadas pela ordem do grafo, e os intermediários são gravados como no pipeline.
+
+    Args:
+        etapas (dict): Grafo de etapas.
+        selecionadas (list, opcional): Etapas a medir (padrão: todas).
+
+    Returns:
+        dict: Medições de cada etapa (ver medir_etapa()).
+    """
+    selecionadas = list(selecionadas or etapas)
+    medicoes = {}
+    for nome in selecionadas:
+        dependencias = [d for d in etapas[nome]["depende_de"] if d in medicoes]
+        if any(medicoes[d]["situacao"] != "concluida" for d in dependencias):
+            print(f"Etapa {nome} ignorada: uma de suas dependências falhou.")
+            medicoes[nome] = {"situacao": "ignorada"}
+            continue
+
+        print(f"Medindo a etapa {nome}...")
+        medicoes[nome] = medir_etapa(nome, etapas[nome])
+        m = medicoes[nome]
+        print(f"Etapa {nome}: {m['tempo_s']:.2f}s, CPU {m['cpu_s']:.2f}s, {m['requisicoes_http']} requisições, "
+              f"pico de {m['pico_rss_mb']:.0f} MB, {m['artefatos']} arquivos.")
+    return medicoes
+
+
+def montar_relatorio(medicoes, modo_http=None, estado=None):
+    """
+    Monta o relatório do benchmark (ambiente, totais e medições por etapa), no formato da baseline.
+
+    `estado` indica se as etapas partiram de diretórios vazios ('isolado') ou dos caches, game logs, modelos
+    e agregados já existentes ('reaproveitado').
+    """
+    concluidas = [m for m in medicoes.values() if m.get("situacao") == "concluida"]
+    return {
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "modo_http": modo_http,
+            "estado": estado,
+        },
+        "totais": {
+            "tempo_s": round(sum(m["tempo_s"] for m in concluidas), 3),
+            "cpu_s": round(sum(m["cpu_s"] for m in concluidas), 3),
+            "requisicoes_http": sum(m["requisicoes_http"] for m in concluidas),
+            "bytes_http": sum(m["bytes_http"] for m in concluidas),
+            "pico_rss_mb": max((m["pico_rss_mb"] for m in concluidas), default=0.0),
+            "bytes_artefatos": sum(m["bytes_artefatos"] for m in concluidas),
+        },
+        "etapas": medicoes,
+    }
+
+
+def comparar_com_baseline(relatorio, baseline, tolerancia=TOLERANCIA_PADRAO):
+    """
+    Compara um relatório com a baseline e lista as regressões.
+
+    Tempo, CPU e memória são regressões quando passam da baseline em mais que `tolerancia` (e em mais
+    que DIFERENCA_MINIMA); a quantidade de requisições HTTP não pode aumentar. Etapas que passaram
+    a falhar também são regressões.
+
+    Args:
+        relatorio (dict): Relatório atual (ver montar_relatorio()).
+        baseline (dict): Relatório de referência.
+        tolerancia (float): Aumento relativo tolerado (padrão: TOLERANCIA_PADRAO).
+
+    Returns:
+        list: Descrição de cada regressão encontrada.
+
+    Raises:
+        ValueError: Se o relatório e a baseline não partiram do mesmo estado (caches vazios ou reaproveitados),
+            quando as medidas não são comparáveis.
+    """
+    estado, estado_baseline = (r.get("ambiente", {}).get("estado") for r in (relatorio, baseline))
+    if estado != estado_baseline:
+        raise ValueError(f"a baseline foi medida com o estado '{estado_baseline}' e esta execução com '{estado}'.")
+
+    regressoes = []
+    for nome, atual in relatorio["etapas"].items():
+        anterior = baseline.get("etapas", {}).get(nome)
+        if not anterior or anterior.get("situacao") != "concluida":
+            continue
+        if atual.get("situacao") != "concluida":
+            regressoes.append(f"{nome}: a etapa {atual.get('situacao')} (antes concluída).")
+            continue
+
+        for metrica in METRICAS_COM_TOLERANCIA:
+            limite = anterior[metrica] * (1 + tolerancia)
+            if atual[metrica] > limite and atual[metrica] - anterior[metrica] > DIFERENCA_MINIMA[metrica]:
+                regressoes.append(f"{nome}: {metrica} passou de {anterior[metrica]} para {atual[metrica]}.")
+        for metrica in METRICAS_EXATAS:
+            if atual[metrica] > anterior[metrica]:
+                regressoes.append(f"{nome}: {metrica} passou de {anterior[metrica]} para {atual[metrica]}.")
+
+    return regressoes
+
+
+def salvar_relatorio(relatorio, caminho):
+    """Grava o relatório do benchmark em JSON."""
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+
+
+def ler_relatorio(caminho):
+    """Lê um relatório (ou baseline) gravado por salvar_relatorio()."""
+    with open(caminho, "r", encoding="utf-8") as f:
+        return json.load(f)
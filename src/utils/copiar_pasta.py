@@ -27,16 +27,25 @@ def copiar_pasta(origem, destino):
 
     print(f"✅ {arquivos_copiados} arquivos copiados de '{origem}' para '{destino}'.")
 
-if __name__ == "__main__":
-    # Lista de pares (origem, destino)
-    caminhos = [
-        ("reports/imagens/parte1/parte1-rf8", "src/visualizations/dashboard/parte1/assets"),
-        ("reports/imagens/parte2/parte2-rf10", "src/visualizations/dashboard/parte2/assets")
-    ]
+# Pastas de gráficos usadas pelos dashboards: pares (origem, destino)
+PASTAS_DASHBOARD = [
+    ("reports/imagens/parte1/parte1-rf8", "src/visualizations/dashboard/parte1/assets"),
+    ("reports/imagens/parte2/parte2-rf10", "src/visualizations/dashboard/parte2/assets")
+]
 
-    # Executa a cópia para cada par
+def copiar_pastas(caminhos=PASTAS_DASHBOARD):
+    """
+    Copia várias pastas.
+
+    Args:
+        caminhos (list): Lista de pares (origem, destino).
+    """
     for origem, destino in caminhos:
         copiar_pasta(origem, destino)
 
+if __name__ == "__main__":
+    # Executa a cópia para cada par
+    copiar_pastas()
+
 # Rode este comando para copiar os gráficos das RFs específicas para a pasta do Dash:
 # python src/utils/copiar_pasta.py
@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import threading
+import functools
+from collections import defaultdict
+
+import pandas as pd
+
+# Medição dos trechos mais pesados do pipeline (spans): buscas na API, transformações dos game logs,
+# ajuste de modelos e geração de imagens e HTML. Cada span vira um evento com a etapa, a categoria, o
+# nome, a duração e atributos como jogador, time e temporada. Os eventos ficam em memória e, se houver
+# um arquivo configurado, também são gravados em JSON Lines (um por linha), o que permite juntar os
+# eventos de todos os processos do pipeline em um único relatório.
+# Desativada (padrão), span() só testa uma variável e devolve um objeto vazio.
+# NBA_INSTRUMENTACAO=1 ativa a instrumentação no main.py, como a opção --instrumentar.
+ATIVA = os.getenv("NBA_INSTRUMENTACAO", "0") == "1"
+
+# Pasta dos eventos e dos relatórios de tempo de cada execução
+INSTRUMENTACAO_DIR = os.getenv("NBA_INSTRUMENTACAO_DIR", "data/instrumentacao")
+
+# Categorias dos spans; 'etapa' cobre a etapa inteira e não entra na soma das demais
+CATEGORIAS = ("etapa", "busca", "transformacao", "ajuste", "renderizacao")
+
+_estado = {"ativa": False, "arquivo": None, "etapa": None}
+_eventos = []
+_lock = threading.Lock()
+_originais = {}
+
+
+class _SpanNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class _Span:
+    __slots__ = ("categoria", "nome", "atributos", "inicio", "_relogio")
+
+    def __init__(self, categoria, nome, atributos):
+        self.categoria = categoria
+        self.nome = nome
+        self.atributos = atributos
+
+    def __enter__(self):
+        self.inicio = time.time()
+        self._relogio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreio):
+        evento = {
+            "etapa": _estado["etapa"],
+            "categoria": self.categoria,
+            "nome": self.nome,
+            "inicio": self.inicio,
+            "duracao_s": time.perf_counter() - self._relogio,
+            "pid": os.getpid(),
+        }
+        if tipo_erro is not None:
+            evento["erro"] = tipo_erro.__name__
+        evento.update(self.atributos)
+        _registrar(evento)
+        return False
+
+
+def _registrar(evento):
+    with _lock:
+        _eventos.append(evento)
+        arquivo = _estado["arquivo"]
+        if arquivo:
+            # Cada linha é gravada de uma vez em modo append, então processos diferentes não se misturam
+            with open(arquivo, "a", encoding="utf-8") as f:
+                f.write(json.dumps(evento, default=str, ensure_ascii=False) + "\n")
+
+
+def span(categoria, nome, **atributos):
+    """
+    Mede o trecho de código dentro de um bloco with.
+
+    Exemplo:
+        with span("ajuste", "gam_poisson", player_id=1630560, season="2024-25"):
+            modelo.gridsearch(X, y)
+
+    Args:
+        categoria (str): Uma das CATEGORIAS.
+        nome (str): Nome do trecho (ex.: o endpoint ou o modelo).
+        **atributos: Informações do evento, como player_id, team_id e season.
+
+    Returns:
+        Gerenciador de contexto (vazio quando a instrumentação está desativada).
+    """
+    if not _estado["ativa"]:
+        return _SPAN_NULO
+    return _Span(categoria, nome, atributos)
+
+
+def instrumentar(categoria, nome=None):
+    """Decorador que mede cada chamada da função como um span (nome padrão: nome da função)."""
+    def decorador(funcao):
+        nome_span = nome or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            if not _estado["ativa"]:
+                return funcao(*args, **kwargs)
+            with _Span(categoria, nome_span, {}):
+                return funcao(*args, **kwargs)
+
+        return envolvida
+    return decorador
+
+
+def _medir_gravacao(metodo, categoria, nome):
+    # Mede um método que grava a figura em arquivo, registrando o nome do arquivo
+    @functools.wraps(metodo)
+    def envolvido(figura, caminho, *args, **kwargs):
+        if not _estado["ativa"]:
+            return metodo(figura, caminho, *args, **kwargs)
+        arquivo = os.path.basename(caminho) if isinstance(caminho, (str, os.PathLike)) else None
+        with _Span(categoria, nome, {"arquivo": arquivo}):
+            return metodo(figura, caminho, *args, **kwargs)
+    return envolvido
+
+
+def _instrumentar_graficos():
+    # As imagens do Matplotlib e os HTML do Plotly são gravados em dezenas de pontos dos RFs;
+    # medir os métodos de gravação cobre todos eles
+    from matplotlib.figure import Figure
+    from plotly.basedatatypes import BaseFigure
+
+    for classe, metodo, nome in [(Figure, "savefig", "matplotlib_savefig"), (BaseFigure, "write_html", "plotly_html")]:
+        if (classe, metodo) not in _originais:
+            _originais[(classe, metodo)] = getattr(classe, metodo)
+            setattr(classe, metodo, _medir_gravacao(_originais[(classe, metodo)], "renderizacao", nome))
+
+
+def ativar_instrumentacao(arquivo=None):
+    """
+    Ativa a instrumentação neste processo.
+
+    Args:
+        arquivo (str, opcional): Arquivo JSON Lines onde os eventos também são gravados.
+
+    Returns:
+        dict: Configuração ativa, que pode ser repassada a outros processos.
+    """
+    with _lock:
+        _estado["ativa"] = True
+        _estado["arquivo"] = arquivo
+    if arquivo:
+        os.makedirs(os.path.dirname(arquivo) or ".", exist_ok=True)
+    _instrumentar_graficos()
+    return configuracao_instrumentacao()
+
+
+def desativar_instrumentacao():
+    """Desativa a instrumentação (os eventos já coletados continuam em memória)."""
+    with _lock:
+        _estado.update(ativa=False, arquivo=None, etapa=None)
+
+
+def configuracao_instrumentacao():
+    """Retorna a configuração ativa (ou None), para ser reaplicada em outro processo."""
+    return {"arquivo": _estado["arquivo"]} if _estado["ativa"] else None
+
+
+def definir_etapa(nome):
+    """Define a etapa do pipeline à qual os próximos eventos deste processo pertencem."""
+    _estado["etapa"] = nome
+
+
+def eventos_coletados():
+    """Retorna uma cópia dos eventos coletados neste processo."""
+    with _lock:
+        return list(_eventos)
+
+
+def limpar_eventos():
+    """Descarta os eventos coletados em memória."""
+    with _lock:
+        _eventos.clear()
+
+
+def ler_eventos(arquivo):
+    """Lê os eventos gravados em um arquivo JSON Lines."""
+    if not os.path.exists(arquivo):
+        return []
+    with open(arquivo, "r", encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f if linha.strip()]
+
+
+def resumir_eventos(eventos):
+    """
+    Agrega os eventos por etapa, categoria e nome.
+
+    Args:
+        eventos (list): Eventos coletados ou lidos de um arquivo.
+
+    Returns:
+        list: Um dicionário por grupo (etapa, categoria, nome, chamadas, total_s, media_s, maximo_s e
+        percentual_etapa, a parte do tempo da etapa), do maior para o menor tempo total.
+    """
+    grupos = defaultdict(list)
+    tempo_etapa = defaultdict(float)
+    for evento in eventos:
+        grupos[(evento.get("etapa") or "-", evento["categoria"], evento["nome"])].append(evento["duracao_s"])
+        if evento["categoria"] == "etapa":
+            tempo_etapa[evento.get("etapa") or "-"] += evento["duracao_s"]
+
+    resumo = []
+    for (etapa, categoria, nome), duracoes in grupos.items():
+        total = sum(duracoes)
+        resumo.append({
+            "etapa": etapa,
+            "categoria": categoria,
+            "nome": nome,
+            "chamadas": len(duracoes),
+            "total_s": round(total, 4),
+            "media_s": round(total / len(duracoes), 4),
+            "maximo_s": round(max(duracoes), 4),
+            "percentual_etapa": round(100 * total / tempo_etapa[etapa], 1) if tempo_etapa.get(etapa) else None,
+        })
+    return sorted(resumo, key=lambda linha: linha["total_s"], reverse=True)
+
+
+def relatorio_tempos(eventos, caminho_csv=None, linhas=15):
+    """
+    Imprime os trechos que mais consumiram tempo e, opcionalmente, salva o resumo completo em CSV.
+
+    Args:
+        eventos (list): Eventos coletados ou lidos de um arquivo.
+        caminho_csv (str, opcional): Arquivo CSV do resumo.
+        linhas (int): Quantidade de linhas impressas.
+
+    Returns:
+        list: Resumo, como em resumir_eventos().
+    """
+    resumo = resumir_eventos(eventos)
+    por_categoria = defaultdict(float)
+    for linha in resumo:
+        por_categoria[linha["categoria"]] += linha["total_s"]
+
+    print("Tempo por categoria: " + ", ".join(
+        f"{categoria} {por_categoria[categoria]:.1f}s" for categoria in CATEGORIAS if categoria in por_categoria
+    ))
+    for linha in [linha for linha in resumo if linha["categoria"] != "etapa"][:linhas]:
+        print(f"{linha['total_s']:>9.2f}s {linha['chamadas']:>6}x  {linha['etapa']:<19} "
+              f"{linha['categoria']:<14} {linha['nome']}")
+
+    if caminho_csv:
+        os.makedirs(os.path.dirname(caminho_csv) or ".", exist_ok=True)
+        pd.DataFrame(resumo).to_csv(caminho_csv, index=False)
+        print(f"Resumo dos tempos salvo em: {caminho_csv}")
+    return resumo
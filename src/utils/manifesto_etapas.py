@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import inspect
+import hashlib
+import tempfile
+import threading
+
+# Manifesto com a impressão digital e os artefatos da última execução de cada etapa
+MANIFESTO_ETAPAS = os.getenv("NBA_MANIFESTO_ETAPAS", "data/manifesto_etapas.json")
+
+_lock = threading.Lock()
+
+
+def _atualizar_hash_caminho(h, caminho):
+    if os.path.isfile(caminho):
+        arquivos = [caminho]
+    else:
+        arquivos = sorted(
+            os.path.join(raiz, arquivo)
+            for raiz, _, nomes in os.walk(caminho)
+            for arquivo in nomes
+            if not arquivo.endswith(".tmp")
+        )
+
+    for arquivo in arquivos:
+        h.update(arquivo.replace(os.sep, "/").encode("utf-8"))
+        with open(arquivo, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloco)
+
+
+def hash_entradas(caminhos):
+    """
+    Calcula o hash do conteúdo dos arquivos de entrada de uma etapa.
+
+    Args:
+        caminhos (list): Arquivos ou diretórios (percorridos recursivamente). Caminhos inexistentes
+            entram no hash apenas pelo nome.
+
+    Returns:
+        str: Hash SHA-256 do conteúdo.
+    """
+    h = hashlib.sha256()
+    for caminho in sorted(caminhos):
+        h.update(f"<{caminho}>".encode("utf-8"))
+        if os.path.exists(caminho):
+            _atualizar_hash_caminho(h, caminho)
+    return h.hexdigest()
+
+
+def modulos_da_funcao(funcao):
+    """
+    Lista os arquivos de código do projeto (módulos 'src.*') usados por uma função.
+
+    Parte do módulo onde a função foi definida e segue, recursivamente, os módulos e funções
+    do projeto importados por ele.
+
+    Returns:
+        list: Caminhos dos arquivos .py, em ordem.
+    """
+    visitados = {}
+    pendentes = [inspect.getmodule(funcao)]
+
+    while pendentes:
+        modulo = pendentes.pop()
+        if modulo is None or modulo.__name__ in visitados:
+            continue
+        if not (modulo.__name__.startswith("src.") or modulo is inspect.getmodule(funcao)):
+            continue
+        visitados[modulo.__name__] = getattr(modulo, "__file__", None)
+
+        for valor in vars(modulo).values():
+            if inspect.ismodule(valor):
+                pendentes.append(valor)
+            elif inspect.isfunction(valor) or inspect.isclass(valor):
+                pendentes.append(sys.modules.get(valor.__module__))
+
+    return sorted(arquivo for arquivo in visitados.values() if arquivo)
+
+
+def calcular_impressao(etapa):
+    """
+    Calcula a impressão digital de uma etapa: hash das entradas, parâmetros e versão do código.
+
+    Args:
+        etapa (dict): Definição da etapa (com 'funcao', 'kwargs' e, opcionalmente, 'entradas').
+
+    Returns:
+        str: Hash SHA-256 que identifica a execução da etapa.
+    """
+    h = hashlib.sha256()
+    h.update(hash_entradas(etapa.get("entradas", [])).encode("utf-8"))
+    h.update(json.dumps(etapa.get("kwargs", {}), sort_keys=True, default=str).encode("utf-8"))
+    h.update(etapa["funcao"].__qualname__.encode("utf-8"))
+    for arquivo in modulos_da_funcao(etapa["funcao"]):
+        with open(arquivo, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+# Flags de os.open que indicam gravação
+_FLAGS_ESCRITA = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT
+
+# Registro ativo no processo (um por vez: cada processo do pipeline executa uma etapa de cada vez)
+_registro_ativo = None
+_gancho_instalado = False
+
+
+def _gancho_auditoria(evento, args):
+    registro = _registro_ativo
+    if registro is None or registro._gravando:
+        return
+    if evento == "open":
+        caminho, modo, flags = args
+        if isinstance(flags, int) and flags >= 0:
+            gravacao = bool(flags & _FLAGS_ESCRITA)
+        else:
+            gravacao = isinstance(modo, str) and any(c in modo for c in "wax+")
+        if gravacao and isinstance(caminho, (str, bytes, os.PathLike)):
+            registro._anotar(caminho)
+    elif evento == "os.rename":
+        # os.replace das gravações atômicas: o arquivo final é o destino
+        registro._anotar(args[1])
+
+
+class RegistroArtefatos:
+    """
+    Registra os arquivos gravados por uma etapa enquanto está ativo (gerenciador de contexto).
+
+    Um audit hook (sys.addaudithook) observa as aberturas de arquivo para escrita e as renomeações
+    (os.replace) feitas no processo da etapa, em qualquer thread, e nos processos filhos criados por
+    fork (pools internos), que anotam os caminhos em um diário lido ao sair do bloco. Assim, cada etapa
+    registra só o que ela mesma gravou, mesmo com outras etapas gravando nas mesmas pastas ao mesmo tempo.
+
+    Attributes:
+        caminhos (set): Caminhos absolutos gravados, disponíveis ao sair do bloco.
+    """
+
+    def __init__(self):
+        self.caminhos = set()
+        self._pid = None
+        self._diario = None
+        self._arquivo_diario = None
+        self._gravando = False
+
+    def _anotar(self, caminho):
+        caminho = os.path.abspath(os.fsdecode(caminho))
+        if caminho == self._diario:
+            return
+        if os.getpid() == self._pid:
+            self.caminhos.add(caminho)
+            return
+        # Processo filho: anota no diário, aberto uma vez por processo em modo de acréscimo
+        self._gravando = True
+        try:
+            if self._arquivo_diario is None or self._arquivo_diario[0] != os.getpid():
+                self._arquivo_diario = (os.getpid(), open(self._diario, "a", encoding="utf-8", buffering=1))
+            self._arquivo_diario[1].write(caminho + "\n")
+        finally:
+            self._gravando = False
+
+    def __enter__(self):
+        global _registro_ativo, _gancho_instalado
+        if not _gancho_instalado:
+            sys.addaudithook(_gancho_auditoria)
+            _gancho_instalado = True
+        self._pid = os.getpid()
+        self._gravando = True
+        try:
+            descritor, self._diario = tempfile.mkstemp(prefix="artefatos_", suffix=".txt")
+            os.close(descritor)
+        finally:
+            self._gravando = False
+        _registro_ativo = self
+        return self
+
+    def __exit__(self, *exc):
+        global _registro_ativo
+        _registro_ativo = None
+        with open(self._diario, "r", encoding="utf-8") as f:
+            self.caminhos.update(linha.rstrip("\n") for linha in f if linha.strip())
+        os.remove(self._diario)
+        return False
+
+
+def listar_artefatos(saidas, gravados):
+    """
+    Lista os arquivos gravados por uma etapa dentro das suas pastas de saída.
+
+    Args:
+        saidas (list): Pastas (ou arquivos) de saída da etapa.
+        gravados (iterable): Caminhos gravados pela etapa (RegistroArtefatos.caminhos).
+
+    Returns:
+        dict: Tamanho de cada arquivo que ainda existe, indexado pelo caminho (a partir da pasta de saída,
+        como nas definições das etapas).
+    """
+    artefatos = {}
+    for arquivo in sorted(gravados):
+        if arquivo.endswith(".tmp") or not os.path.isfile(arquivo):
+            continue
+        for saida in saidas:
+            absoluta = os.path.abspath(saida)
+            if arquivo == absoluta:
+                artefatos[saida] = os.path.getsize(arquivo)
+            elif arquivo.startswith(absoluta + os.sep):
+                artefatos[os.path.join(saida, os.path.relpath(arquivo, absoluta))] = os.path.getsize(arquivo)
+            else:
+                continue
+            break
+
+    return artefatos
+
+
+def ler_manifesto(caminho=None):
+    caminho = caminho or MANIFESTO_ETAPAS
+    if not os.path.exists(caminho):
+        return {}
+
+    try:
+        with open(caminho, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Manifesto das etapas corrompido em {caminho}, ignorando: {e}")
+        return {}
+
+
+def registrar_execucao(nome_etapa, impressao, artefatos, caminho=None):
+    """Grava no manifesto a impressão digital e os artefatos de uma etapa concluída."""
+    caminho = caminho or MANIFESTO_ETAPAS
+    with _lock:
+        manifesto = ler_manifesto(caminho)
+        manifesto[nome_etapa] = {"impressao": impressao, "artefatos": artefatos, "concluida_em": time.time()}
+
+        if os.path.dirname(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+        with open(caminho_tmp, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, indent=2, sort_keys=True)
+        os.replace(caminho_tmp, caminho)
+
+
+def etapa_atualizada(nome_etapa, etapa, impressao, caminho=None):
+    """
+    Verifica se a etapa pode ser pulada.
+
+    A etapa é reaproveitada quando a impressão digital é igual à registrada, há artefatos registrados
+    e todos ainda existem com o mesmo tamanho e a execução anterior não passou da validade
+    da etapa ('validade' em segundos; None = não expira).
+
+    Returns:
+        bool: True se os artefatos anteriores podem ser reaproveitados.
+    """
+    registro = ler_manifesto(caminho).get(nome_etapa)
+    # Sem artefatos, a execução registrada não produziu nada que possa ser reaproveitado
+    if not registro or registro["impressao"] != impressao or not registro["artefatos"]:
+        return False
+
+    validade = etapa.get("validade")
+    if validade is not None and time.time() - registro["concluida_em"] > validade:
+        return False
+
+    return all(
+        os.path.exists(arquivo) and os.path.getsize(arquivo) == tamanho
+        for arquivo, tamanho in registro["artefatos"].items()
+    )
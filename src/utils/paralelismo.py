@@ -0,0 +1,28 @@
+import os
+
+# Orçamento de processos dos pools internos das etapas (renderização de tabelas, ajuste de GAMs).
+# Fora do pipeline não há limite além do número de CPUs. O executar_pipeline divide as CPUs entre os
+# seus processos, para que N etapas em paralelo, cada uma com um pool interno, não abram N x CPUs
+# processos; com tantos workers quanto CPUs, cada etapa trabalha no próprio processo.
+_orcamento = None
+
+
+def definir_orcamento(processos):
+    """Limita os pools internos deste processo a `processos` (None remove o limite)."""
+    global _orcamento
+    _orcamento = processos
+
+
+def processos_disponiveis(pedidos=None):
+    """
+    Retorna quantos processos um pool interno pode abrir.
+
+    Args:
+        pedidos (int, opcional): Quantidade pedida (padrão: número de CPUs). Dentro do pipeline, é
+            limitada ao orçamento da etapa.
+
+    Returns:
+        int: Quantidade de processos (1 = executar no processo atual).
+    """
+    processos = pedidos or os.cpu_count() or 1
+    return min(processos, _orcamento) if _orcamento else processos
@@ -0,0 +1,201 @@
+import os
+import time
+import pickle
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from src.data import agendador
+from src.data.transporte_gravado import ativar_transporte, configuracao_transporte
+from src.utils.instrumentacao import ativar_instrumentacao, configuracao_instrumentacao, definir_etapa, span
+from src.utils.paralelismo import definir_orcamento
+from src.utils.manifesto_etapas import (RegistroArtefatos, calcular_impressao, etapa_atualizada, listar_artefatos,
+                                        registrar_execucao)
+
+# Diretório onde ficam os resultados intermediários passados de uma etapa para outra
+INTERMEDIARIOS_DIR = os.getenv("NBA_INTERMEDIARIOS_DIR", "data/intermediarios")
+
+
+def _caminho_intermediario(nome_etapa, diretorio=None):
+    return os.path.join(diretorio or INTERMEDIARIOS_DIR, f"{nome_etapa}.pkl")
+
+
+def salvar_intermediario(nome_etapa, valor, diretorio=None):
+    """
+    Grava em disco o valor retornado por uma etapa, para que as etapas dependentes possam lê-lo.
+
+    Returns:
+        str: Caminho do arquivo gravado.
+    """
+    caminho = _caminho_intermediario(nome_etapa, diretorio)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    caminho_tmp = f"{caminho}.{os.getpid()}.tmp"
+    with open(caminho_tmp, "wb") as f:
+        pickle.dump(valor, f)
+    os.replace(caminho_tmp, caminho)
+    return caminho
+
+
+def carregar_intermediario(nome_etapa, diretorio=None):
+    """
+    Lê o valor gravado por uma etapa anterior.
+
+    Raises:
+        FileNotFoundError: Se a etapa ainda não foi executada.
+    """
+    caminho = _caminho_intermediario(nome_etapa, diretorio)
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Resultado da etapa {nome_etapa} não encontrado; execute-a antes.")
+    with open(caminho, "rb") as f:
+        return pickle.load(f)
+
+
+def selecionar_etapas(etapas, somente=None, a_partir_de=None):
+    """
+    Seleciona as etapas a executar, mantendo a ordem de declaração.
+
+    Args:
+        etapas (dict): Grafo de etapas (nome -> definição), na ordem de declaração.
+        somente (list, opcional): Nomes de etapas, de partes ou, no modo liga, siglas de times
+            (ex.: 'parte2', 'P3-RF1', 'BKN').
+        a_partir_de (str, opcional): Executa a partir desta etapa, na ordem de declaração.
+
+    Returns:
+        list: Nomes das etapas selecionadas.
+    """
+    nomes = list(etapas)
+
+    if a_partir_de:
+        if a_partir_de not in etapas:
+            raise ValueError(f"Etapa desconhecida: {a_partir_de}")
+        nomes = nomes[nomes.index(a_partir_de):]
+
+    if somente:
+        grupos = {e["parte"] for e in etapas.values()} | {e["time"] for e in etapas.values() if e.get("time")}
+        desconhecidos = [s for s in somente if s not in etapas and s not in grupos]
+        if desconhecidos:
+            raise ValueError(f"Etapas ou partes desconhecidas: {', '.join(desconhecidos)}")
+        nomes = [n for n in nomes if n in somente or etapas[n]["parte"] in somente or etapas[n].get("time") in somente]
+
+    return nomes
+
+
+def _inicializar_processo(taxa, processos, transporte, instrumentacao):
+    # Cada processo tem seu próprio agendador; a taxa total da API é dividida entre eles
+    agendador.TAXA_PADRAO = taxa
+    # O mesmo vale para as CPUs usadas pelos pools internos das etapas
+    definir_orcamento(processos)
+    # A gravação ou reprodução das requisições ativada no processo principal vale também para as etapas
+    if transporte:
+        ativar_transporte(**transporte)
+    if instrumentacao:
+        ativar_instrumentacao(**instrumentacao)
+
+
+def _executar_etapa(nome, funcao, kwargs, intermediarios):
+    inicio = time.time()
+    definir_etapa(nome)
+    with span("etapa", nome):
+        kwargs = dict(kwargs, **{parametro: carregar_intermediario(etapa) for parametro, etapa in intermediarios.items()})
+        # Os arquivos gravados pela própria etapa são os seus artefatos no manifesto
+        with RegistroArtefatos() as registro:
+            resultado = funcao(**kwargs)
+    return resultado, registro.caminhos, time.time() - inicio
+
+
+def _impressao_etapa(etapa):
+    # Os intermediários lidos pela etapa também fazem parte das suas entradas
+    entradas = list(etapa.get("entradas", [])) + [
+        _caminho_intermediario(origem) for origem in etapa.get("intermediarios", {}).values()
+    ]
+    return calcular_impressao(dict(etapa, entradas=entradas))
+
+
+def executar_pipeline(etapas, selecionadas=None, workers=None, forcar=False):
+    """
+    Executa as etapas selecionadas respeitando as dependências, com as independentes em paralelo.
+
+    Cada etapa roda em um processo do pool assim que todas as suas dependências selecionadas
+    terminam. Dependências fora da seleção são consideradas já executadas (seus arquivos estão em
+    reports/ e data/). O valor retornado por uma etapa, se houver, é gravado como intermediário.
+    Se uma etapa falha, as que dependem dela não são executadas.
+
+    Antes de executar, a impressão digital da etapa (entradas, parâmetros e código) é comparada com
+    a do manifesto; se for igual e os artefatos anteriores ainda existirem, a etapa é pulada. Etapas que
+    terminam sem gravar nenhum artefato (nem intermediário) não são registradas no manifesto.
+
+    Args:
+        etapas (dict): Grafo de etapas. Cada definição tem 'funcao', 'kwargs', 'depende_de', 'saidas' e
+            'parte', e opcionalmente 'entradas', 'intermediarios' (parâmetro -> etapa de origem) e 'validade'.
+        selecionadas (list, opcional): Etapas a executar (padrão: todas).
+        workers (int, opcional): Quantidade de processos (padrão: número de CPUs).
+        forcar (bool): Executa todas as etapas selecionadas, ignorando o manifesto.
+
+    Returns:
+        dict: Situação final de cada etapa selecionada ('concluida', 'reaproveitada', 'falhou' ou 'ignorada').
+    """
+    selecionadas = list(selecionadas or etapas)
+    workers = workers or os.cpu_count() or 1
+    taxa = agendador.TAXA_PADRAO / min(workers, len(selecionadas) or 1)
+    processos = max(1, (os.cpu_count() or 1) // min(workers, len(selecionadas) or 1))
+
+    situacao = {}
+    pendentes = list(selecionadas)
+    em_execucao = {}
+    impressoes = {}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_processo,
+                             initargs=(taxa, processos, configuracao_transporte(), configuracao_instrumentacao())) as pool:
+        while pendentes or em_execucao:
+            for nome in list(pendentes):
+                dependencias = [d for d in etapas[nome]["depende_de"] if d in selecionadas]
+                if any(situacao.get(d) in ("falhou", "ignorada") for d in dependencias):
+                    print(f"Etapa {nome} ignorada: uma de suas dependências falhou.")
+                    situacao[nome] = "ignorada"
+                    pendentes.remove(nome)
+                elif all(situacao.get(d) in ("concluida", "reaproveitada") for d in dependencias):
+                    pendentes.remove(nome)
+                    etapa = etapas[nome]
+                    impressoes[nome] = _impressao_etapa(etapa)
+                    if not forcar and etapa_atualizada(nome, etapa, impressoes[nome]):
+                        print(f"Etapa {nome} sem alterações; artefatos anteriores reaproveitados.")
+                        situacao[nome] = "reaproveitada"
+                        continue
+
+                    print(f"Iniciando a etapa {nome}...")
+                    futuro = pool.submit(
+                        _executar_etapa, nome, etapa["funcao"], etapa.get("kwargs", {}), etapa.get("intermediarios", {})
+                    )
+                    em_execucao[futuro] = nome
+
+            if not em_execucao:
+                # Se nada foi submetido nem reaproveitado nesta volta, as pendentes nunca serão liberadas
+                liberadas = [n for n in pendentes if all(
+                    situacao.get(d) for d in etapas[n]["depende_de"] if d in selecionadas
+                )]
+                if pendentes and not liberadas:
+                    raise ValueError(f"Dependências circulares entre as etapas: {', '.join(pendentes)}")
+                continue
+
+            concluidos, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                nome = em_execucao.pop(futuro)
+                try:
+                    resultado, gravados, duracao = futuro.result()
+                except Exception as e:
+                    print(f"Erro na etapa {nome}: {e}")
+                    situacao[nome] = "falhou"
+                    continue
+
+                if resultado is not None:
+                    # O intermediário é gravado aqui, fora do registro da etapa, mas também é um artefato dela
+                    gravados = set(gravados) | {os.path.abspath(salvar_intermediario(nome, resultado))}
+                artefatos = listar_artefatos(etapas[nome]["saidas"], gravados)
+                if artefatos:
+                    registrar_execucao(nome, impressoes[nome], artefatos)
+                else:
+                    # Os RFs tratam os erros da API e dos dados imprimindo e retornando: sem artefatos, a
+                    # execução não é registrada, para não ser reaproveitada como se tivesse dado certo
+                    print(f"Etapa {nome} não gravou artefatos; ela não será reaproveitada na próxima execução.")
+                situacao[nome] = "concluida"
+                print(f"Etapa {nome} concluída em {duracao:.1f}s.")
+
+    return situacao
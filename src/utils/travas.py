@@ -0,0 +1,38 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Travas entre processos baseadas em arquivo. As etapas do pipeline rodam em processos separados, então
+# um threading.Lock não protege arquivos compartilhados por elas (manifestos, estado de limitadores de
+# taxa); o flock do sistema operacional protege, e é liberado sozinho se o processo morrer.
+
+
+@contextmanager
+def travar_arquivo(caminho):
+    """
+    Trava exclusiva entre processos, mantida durante o bloco `with`.
+
+    Args:
+        caminho (str): Arquivo de trava (criado se não existir). Deve ser diferente do arquivo protegido,
+            que pode ser substituído com os.replace enquanto a trava está ativa.
+    """
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "a+b") as arquivo:
+        if fcntl is not None:
+            fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX)
+        else:
+            arquivo.seek(0)
+            msvcrt.locking(arquivo.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(arquivo.fileno(), fcntl.LOCK_UN)
+            else:
+                arquivo.seek(0)
+                msvcrt.locking(arquivo.fileno(), msvcrt.LK_UNLCK, 1)
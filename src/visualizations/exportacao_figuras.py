@@ -0,0 +1,119 @@
+import os
+import atexit
+import inspect
+
+import plotly.io as pio
+from dotenv import load_dotenv
+
+from src.utils.instrumentacao import span
+
+load_dotenv()
+
+# Engine de exportação das imagens (ENGINE_IMAGE no .env): kaleido ou orca
+ENGINE_IMAGE = os.getenv("ENGINE_IMAGE") or "kaleido"
+
+# Engine usada quando a principal falha (ENGINE_IMAGE_RESERVA no .env)
+ENGINE_RESERVA = os.getenv("ENGINE_IMAGE_RESERVA") or ("orca" if ENGINE_IMAGE == "kaleido" else "kaleido")
+
+# Figuras renderizadas em paralelo pelo processo exportador (NBA_EXPORTACAO_WORKERS no .env)
+WORKERS_EXPORTACAO = int(os.getenv("NBA_EXPORTACAO_WORKERS", "4"))
+
+_servidor_kaleido = False
+
+
+def _iniciar_servidor_kaleido(workers):
+    # Kaleido >= 1.0: um único navegador por processo, que fica aberto entre os lotes
+    # e renderiza `workers` figuras ao mesmo tempo
+    global _servidor_kaleido
+    if _servidor_kaleido:
+        return True
+    try:
+        import kaleido
+        # O servidor abre o navegador em outra thread e, se o Chrome não existir, as chamadas
+        # ficam bloqueadas; por isso o Chrome é procurado antes, aqui
+        kaleido.Kaleido()
+        kaleido.start_sync_server(n=workers, silence_warnings=True)
+    except (ImportError, AttributeError):
+        return False
+    atexit.register(kaleido.stop_sync_server, silence_warnings=True)
+    _servidor_kaleido = True
+    return True
+
+
+def _aceita_engine():
+    # O parâmetro engine foi removido no plotly 7, que só exporta com o kaleido
+    return "engine" in inspect.signature(pio.write_image).parameters
+
+
+def _exportar_com(engine, itens, workers):
+    figuras, caminhos, formatos = (list(coluna) for coluna in zip(*itens))
+
+    if engine == "kaleido" and hasattr(pio, "write_images") and _iniciar_servidor_kaleido(workers):
+        pio.write_images(figuras, caminhos, format=formatos)
+        return
+
+    if _aceita_engine():
+        # Kaleido < 1.0 e Orca já mantêm um processo aberto entre as chamadas
+        for figura, caminho, formato in itens:
+            figura.write_image(caminho, format=formato, engine=engine)
+    elif engine == "kaleido":
+        for figura, caminho, formato in itens:
+            figura.write_image(caminho, format=formato)
+    else:
+        raise ValueError(f"A engine {engine} não é suportada pela versão instalada do plotly.")
+
+
+class FilaExportacao:
+    """
+    Acumula as figuras Plotly de uma etapa e exporta todas as imagens de uma vez.
+
+    Pode ser usada como gerenciador de contexto: as imagens são exportadas ao sair do bloco.
+    """
+
+    def __init__(self, engine=None, engine_reserva=None, workers=None):
+        self.engine = engine or ENGINE_IMAGE
+        self.engine_reserva = engine_reserva or ENGINE_RESERVA
+        self.workers = workers or WORKERS_EXPORTACAO
+        self.itens = []
+
+    def adicionar(self, figura, caminho, format="jpg"):
+        """Agenda a exportação de uma figura como imagem."""
+        self.itens.append((figura, caminho, format))
+
+    def exportar(self):
+        """
+        Exporta as figuras acumuladas, tentando a engine de reserva se a principal falhar.
+
+        Returns:
+            list: Caminhos das imagens geradas.
+
+        Raises:
+            Exception: O erro da última engine, se nenhuma conseguir exportar.
+        """
+        if not self.itens:
+            return []
+
+        engines = [self.engine] + [e for e in [self.engine_reserva] if e != self.engine]
+        for indice, engine in enumerate(engines):
+            try:
+                with span("renderizacao", f"plotly_imagens_{engine}", figuras=len(self.itens)):
+                    _exportar_com(engine, self.itens, self.workers)
+                break
+            except Exception as e:
+                print(f"Erro ao exportar as imagens com a engine {engine}: {e}")
+                if indice == len(engines) - 1:
+                    raise
+
+        caminhos = [caminho for _, caminho, _ in self.itens]
+        self.itens = []
+        for caminho in caminhos:
+            print(f"Imagem salva em: {caminho}")
+        return caminhos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_erro, erro, rastreamento):
+        if tipo_erro is None:
+            self.exportar()
+        return False
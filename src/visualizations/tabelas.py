@@ -0,0 +1,160 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from pandas.plotting import table as tabela_pandas
+
+from src.utils.paralelismo import processos_disponiveis
+
+# Resolução padrão das imagens de tabelas (NBA_TABELAS_DPI no .env)
+DPI_PADRAO = int(os.getenv("NBA_TABELAS_DPI", "300"))
+
+# Formato das imagens de tabelas: vazio mantém a extensão do caminho; 'png' ou 'webp' troca a extensão
+FORMATO_PADRAO = os.getenv("NBA_TABELAS_FORMATO", "")
+
+# Figura reaproveitada entre as tabelas, uma por thread
+_local = threading.local()
+
+
+def _figura():
+    # Figura fora do pyplot: sem registro global de figuras e com o mesmo canvas Agg entre as tabelas
+    if not hasattr(_local, "figura"):
+        _local.figura = Figure()
+        FigureCanvasAgg(_local.figura)
+    figura = _local.figura
+    figura.clear()
+    return figura
+
+
+def _caminho_saida(img_path, formato):
+    formato = formato or FORMATO_PADRAO
+    if not formato:
+        return img_path
+    return f"{os.path.splitext(img_path)[0]}.{formato.lstrip('.')}"
+
+
+def salvar_tabela_como_imagem(df, img_path, title, largura=10, altura_linha=0.5, tamanho_titulo=16,
+                              dpi=None, formato=None):
+    """
+    Salva uma tabela como imagem.
+
+    Args:
+        df (pd.DataFrame): DataFrame contendo os dados a serem salvos.
+        img_path (str): Caminho para salvar a imagem.
+        title (str): Título da tabela.
+        largura (float): Largura da figura em polegadas.
+        altura_linha (float): Altura da figura por linha da tabela, em polegadas.
+        tamanho_titulo (int): Tamanho da fonte do título.
+        dpi (int, opcional): Resolução da imagem (padrão: DPI_PADRAO).
+        formato (str, opcional): 'png', 'webp' ou 'jpg'; troca a extensão de img_path (padrão: FORMATO_PADRAO).
+
+    Returns:
+        str: Caminho da imagem gerada, ou None se o DataFrame estiver vazio.
+    """
+    if df.empty:
+        print("DataFrame vazio. Não é possível salvar como imagem.")
+        return None
+
+    img_path = _caminho_saida(img_path, formato)
+
+    figura = _figura()
+    figura.set_size_inches(largura, len(df) * altura_linha)
+    ax = figura.add_subplot()
+    ax.axis("off")
+    ax.axis("tight")
+    ax.set_title(title, fontsize=tamanho_titulo, weight="bold")
+    table = ax.table(cellText=df.values, colLabels=df.columns, loc="center", cellLoc="center")
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.auto_set_column_width(col=list(range(len(df.columns))))
+    figura.savefig(img_path, bbox_inches="tight", dpi=dpi or DPI_PADRAO)
+    print(f"Tabela salva como imagem em: {img_path}")
+
+    return img_path
+
+
+def _salvar_pagina(df_page, img_path, largura_coluna, dpi):
+    figura = _figura()
+    figura.set_size_inches(12, 8)
+    ax = figura.add_subplot()
+    ax.axis('tight')
+    ax.axis('off')
+    tabela = tabela_pandas(ax, df_page, loc='center', colWidths=[largura_coluna] * len(df_page.columns))
+    tabela.auto_set_font_size(False)
+    tabela.set_fontsize(10)
+    tabela.scale(1.2, 1.2)
+    figura.savefig(img_path, bbox_inches='tight', dpi=dpi)
+    return img_path
+
+
+def salvar_tabela_em_paginas(df, img_dir, file_prefix, rows_per_page=20, dpi=100, formato=None, workers=None):
+    """
+    Salva a tabela em múltiplas imagens, caso os dados não caibam em uma única imagem.
+
+    Args:
+        df (pd.DataFrame): DataFrame contendo os dados.
+        img_dir (str): Diretório para salvar as imagens.
+        file_prefix (str): Prefixo para os nomes dos arquivos de imagem.
+        rows_per_page (int): Número de linhas por imagem.
+        dpi (int): Resolução das imagens.
+        formato (str, opcional): 'png', 'webp' ou 'jpg' (padrão: FORMATO_PADRAO, ou jpg).
+        workers (int, opcional): Processos usados para gerar as páginas (padrão: ver salvar_em_lote()).
+
+    Returns:
+        list: Caminhos das imagens geradas.
+    """
+    total_pages = (len(df) // rows_per_page) + int(len(df) % rows_per_page > 0)
+
+    paginas = []
+    for page in range(total_pages):
+        df_page = df.iloc[page * rows_per_page:(page + 1) * rows_per_page]
+        img_path = _caminho_saida(os.path.join(img_dir, f"{file_prefix}_page_{page + 1}.jpg"), formato)
+        paginas.append((_salvar_pagina, (df_page, img_path, 0.1, dpi)))
+
+    caminhos = salvar_em_lote(paginas, workers)
+    for img_path in caminhos:
+        print(f"Tabela salva como imagem em: {img_path}")
+    return caminhos
+
+
+def _executar(tarefa):
+    funcao, args, *kwargs = tarefa
+    return funcao(*args, **(kwargs[0] if kwargs else {}))
+
+
+def salvar_em_lote(tarefas, workers=None):
+    """
+    Executa várias tarefas de renderização em processos separados.
+
+    Args:
+        tarefas (list): Tuplas (funcao, args) ou (funcao, args, kwargs).
+        workers (int, opcional): Quantidade de processos (padrão: número de CPUs, limitado ao de tarefas e,
+            dentro do pipeline, ao orçamento da etapa). Com 1 processo ou uma única tarefa, tudo roda no
+            processo atual.
+
+    Returns:
+        list: Retorno de cada tarefa, na mesma ordem.
+    """
+    workers = min(processos_disponiveis(workers), len(tarefas))
+    if workers <= 1:
+        return [_executar(tarefa) for tarefa in tarefas]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_executar, tarefas))
+
+
+def salvar_tabelas_em_lote(tabelas, workers=None, **opcoes):
+    """
+    Salva várias tabelas como imagem em paralelo.
+
+    Args:
+        tabelas (list): Tuplas (df, img_path, title).
+        workers (int, opcional): Quantidade de processos (ver salvar_em_lote()).
+        **opcoes: Repassadas a salvar_tabela_como_imagem() (largura, altura_linha, dpi, formato...).
+
+    Returns:
+        list: Caminhos das imagens geradas.
+    """
+    return salvar_em_lote([(salvar_tabela_como_imagem, tabela, opcoes) for tabela in tabelas], workers)
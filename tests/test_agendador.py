@@ -0,0 +1,68 @@
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from src.data import agendador as modulo_agendador
+from src.data.agendador import Agendador, BaldeDeTokens, IntervaloEntreProcessos
+
+
+def test_balde_limita_a_taxa():
+    balde = BaldeDeTokens(taxa=20, capacidade=1)
+
+    inicio = time.monotonic()
+    for _ in range(5):
+        balde.consumir()
+
+    # O primeiro token já está no balde; os outros 4 chegam a 20 por segundo
+    assert time.monotonic() - inicio >= 4 / 20 * 0.9
+
+
+def test_executar_repete_apos_falha(monkeypatch):
+    monkeypatch.setattr(modulo_agendador, "BACKOFF_BASE", 0.001)
+    agendador = Agendador(taxa=1000, rajada=10, workers=2, tentativas=3)
+    tentativas = []
+
+    def requisicao_instavel():
+        tentativas.append(1)
+        if len(tentativas) < 3:
+            raise ConnectionError("falha temporária")
+        return "ok"
+
+    assert agendador.executar("endpointfalso", requisicao_instavel) == "ok"
+    assert len(tentativas) == 3
+
+
+def test_limite_de_concorrencia_por_endpoint(monkeypatch):
+    monkeypatch.setitem(modulo_agendador.LIMITES_POR_ENDPOINT, "endpointpesado", 1)
+    agendador = Agendador(taxa=1000, rajada=10, workers=4, tentativas=1)
+    ativos = []
+    maximo = []
+    lock = threading.Lock()
+
+    def requisicao():
+        with lock:
+            ativos.append(1)
+            maximo.append(len(ativos))
+        time.sleep(0.02)
+        with lock:
+            ativos.pop()
+
+    futuros = [agendador.submeter(agendador.executar, "endpointpesado", requisicao) for _ in range(4)]
+    for futuro in futuros:
+        futuro.result()
+
+    assert max(maximo) == 1
+
+
+def _consumir_e_marcar(caminho):
+    IntervaloEntreProcessos(taxa=10, caminho=caminho).consumir()
+    return time.time()
+
+
+def test_intervalo_compartilhado_entre_processos(tmp_path):
+    caminho = str(tmp_path / "host")
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        horarios = sorted(pool.map(_consumir_e_marcar, [caminho] * 6))
+
+    # Os processos somados respeitam 10 requisições por segundo
+    assert all(b - a >= 0.1 * 0.9 for a, b in zip(horarios, horarios[1:]))
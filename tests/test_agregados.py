@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics import agregados
+from src.analytics.agregados import acumular_jogos, resumir_jogos, caminho_agregados, carregar_resumo, METRICAS
+from src.analytics.histogramas import Histograma
+from src.analytics.quantis import atualizar_estimadores
+
+
+def _jogos(n=30, jogadores=(1, 2)):
+    rng = np.random.default_rng(0)
+    linhas = []
+    for pid in jogadores:
+        for i in range(n):
+            linhas.append({"PLAYER_ID": pid, "GAME_ID": f"{pid}{i:03d}", "GAME_DATE": pd.Timestamp("2024-10-22") + pd.Timedelta(days=i),
+                           "PTS": int(rng.poisson(15)), "REB": int(rng.poisson(5)), "AST": int(rng.poisson(3))})
+    # Fora de ordem, como a API devolve os logs (mais recentes primeiro)
+    return pd.DataFrame(linhas).iloc[::-1].reset_index(drop=True)
+
+
+def test_resumo_igual_ao_calculo_por_jogador():
+    jogos = _jogos()
+    resumo = resumir_jogos(jogos)
+
+    assert list(resumo["metrica"].astype(str)) == ["PTS", "REB", "AST"] * 2
+    for _, linha in resumo.iterrows():
+        valores = jogos.loc[jogos["PLAYER_ID"] == linha["PLAYER_ID"], str(linha["metrica"])]
+        assert linha["jogos"] == len(valores)
+        np.testing.assert_allclose([linha["media"], linha["mediana"], linha["desvio"]],
+                                   [valores.mean(), valores.median(), valores.std()])
+        assert linha["pct_abaixo_media"] == valores.lt(valores.mean()).mean() * 100
+        assert linha["pct_abaixo_mediana"] == valores.lt(valores.median()).mean() * 100
+        assert linha["modas"] == list(valores.mode())
+        assert linha["ocorrencias_moda"] == [int((valores == moda).sum()) for moda in valores.mode()]
+
+
+def test_jogador_sem_moda():
+    jogos = pd.DataFrame({"PLAYER_ID": [1, 1, 1, 1], "PTS": [10, 12, 10, 12], "REB": [1, 2, 3, 3], "AST": [0, 1, 2, 4]})
+    resumo = resumir_jogos(jogos).set_index("metrica")
+
+    assert list(resumo["possui_moda"]) == [False, True, False]
+    assert resumo.loc["REB", "modas"] == [3] and resumo.loc["REB", "ocorrencias_moda"] == [2]
+
+
+def test_valores_fracionarios_sem_histograma():
+    jogos = pd.DataFrame({"PLAYER_ID": [1, 1, 1, 2, 2], "PTS": [1.5, 2.5, 2.5, 0.5, 4.0],
+                          "REB": [1, 2, 3, 3, 3], "AST": [0, 1, 2, 4, 4]})
+    resumo = resumir_jogos(jogos).set_index(["PLAYER_ID", "metrica"])
+
+    assert resumo.loc[(1, "PTS"), "modas"] == [2.5] and resumo.loc[(1, "PTS"), "ocorrencias_moda"] == [2]
+    assert np.isclose(resumo.loc[(1, "PTS"), "pct_abaixo_media"], 100 / 3)
+    assert not resumo.loc[(2, "PTS"), "possui_moda"]
+
+def test_resumo_dos_estimadores_igual_ao_dos_jogos():
+    jogos = _jogos()
+    por_jogo = acumular_jogos(jogos)
+    quantis, _ = atualizar_estimadores(por_jogo, METRICAS)
+    histogramas, _ = atualizar_estimadores(por_jogo, METRICAS, classe=Histograma)
+
+    resumo = agregados._resumo_dos_estimadores(por_jogo["PLAYER_ID"].unique(), quantis, histogramas)
+    pd.testing.assert_frame_equal(resumo, resumir_jogos(jogos), check_dtype=False)
+
+def test_janelas_e_acumulados_iguais_ao_rolling():
+    jogos = _jogos()
+    tabela = acumular_jogos(jogos, janelas=(5, 10))
+
+    ordenados = jogos.sort_values(["PLAYER_ID", "GAME_DATE"]).reset_index(drop=True)
+    pontos = ordenados.groupby("PLAYER_ID")["PTS"]
+    assert list(tabela["GAME_ID"]) == list(ordenados["GAME_ID"])
+    np.testing.assert_allclose(tabela["PTS_media_acum"], pontos.transform(lambda x: x.expanding().mean()))
+    np.testing.assert_allclose(tabela["PTS_desvio_acum"], pontos.transform(lambda x: x.expanding().std()))
+    np.testing.assert_allclose(tabela["PTS_media_5"], pontos.transform(lambda x: x.rolling(5, min_periods=1).mean()))
+    np.testing.assert_allclose(tabela["PTS_desvio_10"], pontos.transform(lambda x: x.rolling(10, min_periods=1).std()))
+
+
+def test_jogos_novos_continuam_da_tabela_anterior():
+    jogos = _jogos()
+    completa = acumular_jogos(jogos)
+    inicio = acumular_jogos(jogos[jogos["GAME_DATE"] < pd.Timestamp("2024-11-05")])
+
+    incremental = acumular_jogos(jogos, anterior=inicio)
+    pd.testing.assert_frame_equal(incremental, completa, check_exact=False)
+
+    # Um jogo antigo corrigido refaz a tabela do jogador
+    corrigidos = jogos.copy()
+    corrigidos.loc[corrigidos["GAME_ID"] == "1000", "PTS"] += 10
+    pd.testing.assert_frame_equal(acumular_jogos(corrigidos, anterior=inicio), acumular_jogos(corrigidos), check_exact=False)
+
+
+def test_rfs_leem_o_resumo_gravado(tmp_path, monkeypatch):
+    resumo = resumir_jogos(_jogos())
+    agregados._gravar_resumo(resumo, caminho_agregados("2024-25", "BKN", str(tmp_path), "_resumo.parquet"))
+
+    def recalcular(*args, **kwargs):
+        raise AssertionError("o resumo gravado deveria ser lido, não recalculado")
+
+    monkeypatch.setattr(agregados, "agregados_jogadores", recalcular)
+    lido = carregar_resumo([2], team_abbr="BKN", diretorio=str(tmp_path))
+
+    esperado = resumo[resumo["PLAYER_ID"] == 2].reset_index(drop=True)
+    pd.testing.assert_frame_equal(lido, esperado, check_categorical=False)
+    assert isinstance(lido.loc[0, "modas"], list)
@@ -0,0 +1,109 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import requests
+
+from src.data.transporte_gravado import ativar_transporte, desativar_transporte, gravar_fixture, caminho_fixture
+from src.utils import pipeline
+from src.utils.benchmark import _rss, executar_benchmark, montar_relatorio, comparar_com_baseline
+
+URL = "https://stats.nba.com/stats/teste"
+
+
+def gerar_arquivo(caminho):
+    requests.get(URL)
+    with open(caminho, "w") as f:
+        f.write("x" * 100)
+    return [1, 2, 3]
+
+
+def somar(valores):
+    return sum(valores)
+
+
+def _ocupar_cpu(segundos):
+    fim = time.process_time() + segundos
+    while time.process_time() < fim:
+        pass
+    # 100 MB escritos de fato (bytearray() sozinho não ocupa as páginas)
+    return len(b"x" * (100 * 2 ** 20))
+
+
+def usar_pool():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        list(pool.map(_ocupar_cpu, [0.3, 0.3]))
+
+
+def falhar():
+    raise RuntimeError("falha proposital")
+
+
+def _etapa(funcao, kwargs=None, depende_de=(), saidas=(), intermediarios=None):
+    return {"parte": "parte1", "funcao": funcao, "kwargs": kwargs or {}, "depende_de": list(depende_de),
+            "saidas": list(saidas), "intermediarios": intermediarios or {}}
+
+
+def test_medicoes_por_etapa(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(tmp_path / "intermediarios"))
+    fixtures = str(tmp_path / "fixtures")
+    gravar_fixture(caminho_fixture("GET", URL, diretorio=fixtures), "GET", URL, None, 200, "{}" * 50)
+    saida = str(tmp_path / "saida.txt")
+    etapas = {
+        "A": _etapa(gerar_arquivo, {"caminho": saida}, saidas=[saida]),
+        "B": _etapa(somar, depende_de=["A"], intermediarios={"valores": "A"}),
+        "C": _etapa(falhar),
+        "D": _etapa(somar, {"valores": [1]}, depende_de=["C"]),
+    }
+
+    try:
+        ativar_transporte("reproduzir", fixtures, latencia=0)
+        medicoes = executar_benchmark(etapas)
+    finally:
+        desativar_transporte()
+
+    assert medicoes["A"]["requisicoes_http"] == 1 and medicoes["A"]["bytes_http"] == 100
+    assert medicoes["A"]["artefatos"] == 1 and medicoes["A"]["bytes_artefatos"] == 100
+    assert medicoes["A"]["pico_rss_mb"] > 0
+    assert medicoes["B"]["situacao"] == "concluida" and medicoes["B"]["requisicoes_http"] == 0
+    assert medicoes["C"]["situacao"] == "falhou" and "falha proposital" in medicoes["C"]["erro"]
+    assert medicoes["D"]["situacao"] == "ignorada"
+    assert pipeline.carregar_intermediario("B") == 6
+
+    relatorio = montar_relatorio(medicoes, "reproduzir")
+    assert relatorio["totais"]["requisicoes_http"] == 1
+
+
+def test_regressoes_em_relacao_a_baseline():
+    def relatorio(tempo, requisicoes, situacao="concluida"):
+        etapa = {"situacao": situacao, "tempo_s": tempo, "cpu_s": 0.1, "pico_rss_mb": 100.0, "requisicoes_http": requisicoes}
+        return {"etapas": {"A": etapa}}
+
+    baseline = relatorio(10.0, 3)
+    assert comparar_com_baseline(relatorio(11.0, 3), baseline) == []
+    assert len(comparar_com_baseline(relatorio(13.0, 3), baseline)) == 1
+    assert len(comparar_com_baseline(relatorio(10.0, 4), baseline)) == 1
+    assert len(comparar_com_baseline(relatorio(10.0, 3, "falhou"), baseline)) == 1
+    # Etapas muito curtas não acusam regressão por ruído
+    assert comparar_com_baseline(relatorio(0.03, 3), relatorio(0.01, 3)) == []
+
+
+def test_baseline_com_outro_estado_nao_e_comparada():
+    medicoes = {"A": {"situacao": "concluida", "tempo_s": 1.0, "cpu_s": 0.1, "pico_rss_mb": 100.0,
+                      "requisicoes_http": 0, "bytes_http": 0, "bytes_artefatos": 0}}
+    isolado, reaproveitado = montar_relatorio(medicoes, estado="isolado"), montar_relatorio(medicoes, estado="reaproveitado")
+
+    assert comparar_com_baseline(isolado, montar_relatorio(medicoes, estado="isolado")) == []
+    with pytest.raises(ValueError):
+        comparar_com_baseline(reaproveitado, isolado)
+
+
+def test_cpu_e_memoria_dos_processos_filhos(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(tmp_path))
+    proprio_mb = _rss() / 2 ** 20
+
+    medicao = executar_benchmark({"P": _etapa(usar_pool)})["P"]
+
+    # A CPU e a memória dos workers do pool entram na medição da etapa, não só as do processo principal
+    assert medicao["cpu_filhos_s"] >= 0.5 and medicao["cpu_s"] >= medicao["cpu_filhos_s"]
+    assert medicao["pico_rss_mb"] >= proprio_mb + 90
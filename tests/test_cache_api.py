@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+
+from src.data import cache_api
+from src.data.cache_api import consultar_endpoint, calcular_ttl, temporada_atual
+
+
+class EndpointFalso:
+    """Endpoint mínimo com a mesma interface dos endpoints da nba_api."""
+    endpoint = "endpointfalso"
+    chamadas = 0
+
+    def __init__(self, season="2023-24", timeout=30, get_request=True):
+        self.parameters = {"Season": season}
+        self.nba_response = None
+        if get_request:
+            self.get_request()
+
+    def get_request(self):
+        EndpointFalso.chamadas += 1
+        resposta = json.dumps({"resultSets": [{"name": "Teste", "headers": ["PTS"], "rowSet": [[10], [20]]}]})
+        self.nba_response = cache_api.NBAStatsResponse(response=resposta, status_code=200, url="http://falso")
+        self.load_response()
+
+    def load_response(self):
+        self.dados = self.nba_response.get_dict()["resultSets"][0]["rowSet"]
+
+
+def test_segunda_consulta_nao_acessa_rede(tmp_path):
+    EndpointFalso.chamadas = 0
+
+    primeira = consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2023-24")
+    segunda = consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2023-24", timeout=60)
+
+    assert EndpointFalso.chamadas == 1
+    assert primeira.dados == segunda.dados == [[10], [20]]
+
+
+def test_parametros_diferentes_geram_chaves_diferentes(tmp_path):
+    EndpointFalso.chamadas = 0
+
+    consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2022-23")
+    consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2023-24")
+
+    assert EndpointFalso.chamadas == 2
+
+
+def test_ttl_por_temporada():
+    assert calcular_ttl("playergamelog", {"Season": "2019-20"}) is None
+    assert calcular_ttl("playergamelog", {"Season": temporada_atual()}) == cache_api.TTL_TEMPORADA_ATUAL
+
+
+def test_resposta_gravada_no_meio_da_temporada_continua_expirando(tmp_path):
+    EndpointFalso.chamadas = 0
+    consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2023-24")
+    caminho = next(tmp_path.rglob("*.json"))
+
+    # Gravada em fevereiro de 2024, antes do fim da temporada: ainda não é definitiva e já expirou
+    registro = json.loads(caminho.read_text())
+    registro["criado_em"] = datetime(2024, 2, 1).timestamp()
+    caminho.write_text(json.dumps(registro))
+    consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2023-24")
+    assert EndpointFalso.chamadas == 2
+
+    # A nova resposta foi gravada depois do fim da temporada e não expira mais
+    consultar_endpoint(EndpointFalso, cache_dir=str(tmp_path), season="2023-24")
+    assert EndpointFalso.chamadas == 2
+    assert calcular_ttl("playergamelog", {"Season": "2023-24"}, criado_em=datetime(2024, 2, 1).timestamp()) \
+        == cache_api.TTL_TEMPORADA_ATUAL
@@ -1,6 +1,50 @@
-from src.data.coleta_dados import coletar_dados_jogador
+import json
 
+import requests
+
+from src.data import cache_api, repositorio_gamelogs, transporte_gravado
+from src.data.coleta_dados import coletar_dados_time
+from src.data.transporte_gravado import ativar_transporte, desativar_transporte
+
+COLUNAS = ["Team_ID", "Game_ID", "GAME_DATE", "MATCHUP", "WL", "PTS"]
+JOGOS = [[1610612751, "0022300002", "NOV 03, 2023", "BKN vs. LAL", "W", 110],
+         [1610612751, "0022300001", "NOV 01, 2023", "BKN @ TOR", "L", 98]]
+
+
+def _team_game_log(sessao, method, url, params=None, data=None, **kwargs):
+    resposta = requests.Response()
+    resposta.status_code = 200
+    resposta._content = json.dumps({
+        "resource": "teamgamelog",
+        "resultSets": [{"name": "TeamGameLog", "headers": COLUNAS, "rowSet": JOGOS}],
+    }).encode("utf-8")
+    resposta.encoding = "utf-8"
+    resposta.url = url
+    return resposta
+
+
+def test_coletar_dados_time_offline(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_api, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(repositorio_gamelogs, "GAMELOGS_DIR", str(tmp_path / "gamelogs"))
+    repositorio_gamelogs.limpar_memoria()
+    fixtures = str(tmp_path / "fixtures")
+
+    try:
+        # Grava a resposta uma vez e depois coleta de novo, do zero, apenas reproduzindo o que foi gravado
+        monkeypatch.setattr(transporte_gravado, "_enviar", _team_game_log)
+        ativar_transporte("gravar", fixtures)
+        coletar_dados_time(1610612751, "2023-24")
+
+        cache_api.limpar_cache(str(tmp_path / "cache"))
+        repositorio_gamelogs.limpar_memoria()
+        (tmp_path / "gamelogs").rename(tmp_path / "gamelogs_antigo")
+        monkeypatch.setattr(transporte_gravado, "_enviar", None)
+        ativar_transporte("reproduzir", fixtures, latencia=0)
+        data = coletar_dados_time(1610612751, "2023-24")
+    finally:
+        desativar_transporte()
+        repositorio_gamelogs.limpar_memoria()
 
-def test_coletar_dados_jogador():
-    data = coletar_dados_jogador(player_id=123, season="2024-25")
     assert not data.empty
+    assert data["GAME_ID"].tolist() == ["0022300002", "0022300001"]
+    assert data["PTS"].tolist() == [110, 98]
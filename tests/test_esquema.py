@@ -0,0 +1,48 @@
+import pandas as pd
+
+from src.data.esquema import normalizar_gamelog, converter_datas
+
+
+def _gamelog():
+    return pd.DataFrame({
+        "Team_ID": [1610612751, 1610612751, 1610612747],
+        "Game_ID": ["0022300003", "0022300002", "0022300001"],
+        "GAME_DATE": ["NOV 03, 2023", "NOV 01, 2023", "OCT 30, 2023"],
+        "MATCHUP": ["BKN vs. LAL", "BKN @ TOR", "LAL vs. BKN"],
+        "WL": ["W", "L", "L"],
+        "W": [2, 1, 1],
+        "W_PCT": [0.667, 0.5, 0.5],
+        "PTS": [110, 98, 101],
+        "PLUS_MINUS": [10.0, -7.0, None],
+    })
+
+
+def test_tipos_normalizados():
+    df = normalizar_gamelog(_gamelog())
+
+    assert "TEAM_ID" in df.columns and "GAME_ID" in df.columns
+    assert df["TEAM_ID"].dtype == "int32"
+    assert df["PTS"].dtype == "int16"
+    assert df["W_PCT"].dtype == "float32"
+    assert isinstance(df["MATCHUP"].dtype, pd.CategoricalDtype)
+    assert isinstance(df["WL"].dtype, pd.CategoricalDtype)
+    # Contagem com valor ausente não pode ser inteira
+    assert df["PLUS_MINUS"].dtype == "float32"
+    assert df["GAME_DATE"].dt.strftime("%Y-%m-%d").tolist() == ["2023-11-03", "2023-11-01", "2023-10-30"]
+    assert df["GAME_ID"].tolist() == ["0022300003", "0022300002", "0022300001"]
+
+
+def test_datas_dos_dois_formatos():
+    datas = converter_datas(pd.Series(["APR 13, 2025", "2025-04-11", None]))
+
+    assert datas.iloc[:2].dt.strftime("%Y-%m-%d").tolist() == ["2025-04-13", "2025-04-11"]
+    assert pd.isna(datas.iloc[2])
+
+
+def test_normalizacao_idempotente_e_sem_categorias_sobrando():
+    df = normalizar_gamelog(_gamelog())
+    novamente = normalizar_gamelog(df)
+    pd.testing.assert_frame_equal(df, novamente)
+
+    pedaco = normalizar_gamelog(df[df["TEAM_ID"] == 1610612751])
+    assert list(pedaco["MATCHUP"].cat.categories) == ["BKN @ TOR", "BKN vs. LAL"]
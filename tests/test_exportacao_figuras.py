@@ -0,0 +1,43 @@
+import plotly.graph_objects as go
+import pytest
+
+from src.visualizations import exportacao_figuras
+from src.visualizations.exportacao_figuras import FilaExportacao
+
+
+def test_lote_exportado_em_uma_chamada(monkeypatch):
+    chamadas = []
+    monkeypatch.setattr(exportacao_figuras, "_iniciar_servidor_kaleido", lambda workers: True)
+    monkeypatch.setattr(exportacao_figuras.pio, "write_images",
+                        lambda figuras, caminhos, format: chamadas.append((figuras, caminhos, format)), raising=False)
+
+    with FilaExportacao(engine="kaleido") as fila:
+        for i in range(3):
+            fila.adicionar(go.Figure(), f"grafico_{i}.jpg")
+        assert chamadas == []
+
+    assert len(chamadas) == 1
+    assert chamadas[0][1] == ["grafico_0.jpg", "grafico_1.jpg", "grafico_2.jpg"]
+    assert chamadas[0][2] == ["jpg"] * 3
+    assert fila.itens == []
+
+
+def test_engine_de_reserva(monkeypatch):
+    usadas = []
+
+    def exportar_com(engine, itens, workers):
+        usadas.append(engine)
+        if engine == "kaleido":
+            raise RuntimeError("navegador não encontrado")
+
+    monkeypatch.setattr(exportacao_figuras, "_exportar_com", exportar_com)
+
+    fila = FilaExportacao(engine="kaleido", engine_reserva="orca")
+    fila.adicionar(go.Figure(), "grafico.jpg")
+    assert fila.exportar() == ["grafico.jpg"]
+    assert usadas == ["kaleido", "orca"]
+
+    fila.adicionar(go.Figure(), "grafico.jpg")
+    fila.engine_reserva = "kaleido"
+    with pytest.raises(RuntimeError):
+        fila.exportar()
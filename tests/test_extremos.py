@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+from src.analytics.extremos import probabilidades_gumbel
+
+
+def _jogos():
+    rng = np.random.default_rng(3)
+    return pd.concat([
+        pd.DataFrame({"PLAYER_ID": pid, "PTS": rng.gumbel(loc, 4, 40).round(), "REB": rng.poisson(6, 40)})
+        for pid, loc in [(1, 12), (2, 22)]
+    ], ignore_index=True)
+
+
+def test_mesmo_ajuste_e_probabilidades_do_scipy():
+    jogos = _jogos()
+    limiares = np.array([0, 10, 20.5, 60])
+    tabela = probabilidades_gumbel(jogos, limiares=limiares, por=["PLAYER_ID"])
+
+    assert len(tabela) == 2 * 2 * len(limiares)
+    for (pid, metrica), grupo in tabela.groupby(["PLAYER_ID", "metrica"]):
+        valores = jogos.loc[jogos["PLAYER_ID"] == pid, metrica].values
+        loc, scale = stats.gumbel_r.fit(valores)
+        np.testing.assert_allclose(grupo[["loc", "scale"]].iloc[0], [loc, scale], rtol=1e-6)
+        np.testing.assert_allclose(grupo["prob_acima"], stats.gumbel_r.sf(limiares, loc, scale), atol=1e-6)
+        np.testing.assert_allclose(grupo["prob_abaixo"], stats.gumbel_r.cdf(limiares, loc, scale), atol=1e-6)
+        np.testing.assert_allclose(grupo["prop_menor_igual"], [np.mean(valores <= x) for x in limiares])
+        np.testing.assert_allclose(grupo["prop_menor"], [np.mean(valores < x) for x in limiares])
+
+
+def test_formato_longo_e_momentos():
+    longo = pd.DataFrame({"metrica": ["PTS"] * 4 + ["AST"], "valor": [10, 20, 30, 20, 5]})
+    tabela = probabilidades_gumbel(longo, limiares=[20], metodo="momentos")
+
+    pts = tabela[tabela["metrica"] == "PTS"].iloc[0]
+    scale = np.std([10, 20, 30, 20], ddof=1) * np.sqrt(6) / np.pi
+    assert np.isclose(pts["scale"], scale) and np.isclose(pts["loc"], 20 - np.euler_gamma * scale)
+    assert pts["prop_menor"] == 0.25 and pts["prop_menor_igual"] == 0.75
+
+    # Um único jogo não permite o ajuste, mas as proporções continuam calculadas
+    ast = tabela[tabela["metrica"] == "AST"].iloc[0]
+    assert np.isnan(ast["prob_acima"]) and ast["prop_menor"] == 1.0
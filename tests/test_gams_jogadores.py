@@ -0,0 +1,65 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import src.models.gams_jogadores as gams
+from src.models.gams_jogadores import ajustar_gams_jogadores
+
+
+def _dados():
+    rng = np.random.default_rng(0)
+    linhas = []
+    for pid in (1, 2):
+        for jogo in range(1, 21):
+            linhas.append({"team": "BKN", "player_id": pid, "game": jogo, "points": int(rng.poisson(15 + jogo / 4)),
+                           "rebounds": int(rng.poisson(5)), "assists": int(rng.poisson(3))})
+    return pd.DataFrame(linhas)
+
+
+def test_ajustes_sao_salvos_e_reaproveitados(tmp_path, monkeypatch):
+    players = {1: "A", 2: "B", 3: "C"}
+    modelos = ajustar_gams_jogadores(_dados(), players, ["points", "assists"], workers=1, diretorio=str(tmp_path))
+
+    # C não tem jogos e fica de fora
+    assert list(modelos) == ["A", "B"]
+    assert list(modelos["A"]) == ["points", "assists"]
+    assert len(os.listdir(tmp_path / "gam_poisson")) == len(os.listdir(tmp_path / "gam_linear")) == 4
+
+    def nao_ajustar(*args, **kwargs):
+        raise AssertionError("o modelo deveria ter sido carregado do disco")
+
+    monkeypatch.setattr(gams, "ajustar_gam", nao_ajustar)
+    carregados = ajustar_gams_jogadores(_dados(), players, ["points", "assists"], diretorio=str(tmp_path))
+    X = np.array([[21]])
+    assert carregados["B"]["points"]["poisson"].predict(X) == modelos["B"]["points"]["poisson"].predict(X)
+
+
+def test_ajuste_em_paralelo_igual_ao_serial(tmp_path):
+    dados = _dados()
+    serial = ajustar_gams_jogadores(dados, {1: "A", 2: "B"}, ["points"], workers=1, diretorio=str(tmp_path / "serial"))
+    paralelo = ajustar_gams_jogadores(dados, {1: "A", 2: "B"}, ["points"], workers=2, diretorio=str(tmp_path / "paralelo"))
+
+    X = np.arange(1, 22).reshape(-1, 1)
+    for nome in ("A", "B"):
+        for modelo in ("poisson", "linear"):
+            np.testing.assert_allclose(paralelo[nome]["points"][modelo].predict(X), serial[nome]["points"][modelo].predict(X))
+
+
+def test_jogos_novos_partem_do_ajuste_anterior(tmp_path, monkeypatch):
+    dados = _dados()
+    ajustar_gams_jogadores(dados[dados["game"] <= 15], {1: "A"}, ["points"], workers=1, diretorio=str(tmp_path))
+
+    chamadas = []
+    ajustar_gam = gams.ajustar_gam
+
+    def registrar_chamada(tipo, X, y, lam=None, **atributos):
+        chamadas.append((tipo, len(y), lam))
+        return ajustar_gam(tipo, X, y, lam, **atributos)
+
+    monkeypatch.setattr(gams, "ajustar_gam", registrar_chamada)
+    modelos = ajustar_gams_jogadores(dados, {1: "A"}, ["points"], workers=1, diretorio=str(tmp_path))
+
+    assert [(tipo, n) for tipo, n, _ in chamadas] == [("gam_poisson", 20), ("gam_linear", 20)]
+    assert all(lam is not None for _, _, lam in chamadas)
+    assert len(modelos["A"]["points"]["y"]) == 20
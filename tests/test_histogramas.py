@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.histogramas import Histograma, contagens_abaixo, histogramas_por_grupo, menores_por_grupo
+
+
+def test_histograma_igual_ao_pandas():
+    valores = pd.Series(np.random.default_rng(0).poisson(6, 75))
+    histograma = Histograma.de_valores(valores)
+
+    modas = valores.mode()
+    assert histograma.modas() == (modas.tolist(), [int((valores == m).sum()) for m in modas])
+    assert histograma.possui_moda()
+    assert histograma.mediana() == valores.median()
+    assert histograma.media == valores.mean()
+    assert histograma.proporcao_abaixo(histograma.media) == valores.lt(valores.mean()).mean()
+    assert histograma.proporcao_menor_igual(6.5) == (valores <= 6.5).mean()
+    assert (histograma.minimo, histograma.maximo) == (valores.min(), valores.max())
+
+    # Mediana com n par
+    assert Histograma.de_valores([1, 2, 4, 9]).mediana() == 3
+
+
+def test_adicionar_e_unir():
+    histograma = Histograma.de_valores([3, 3, 5])
+    histograma.adicionar(12)
+    histograma.unir(Histograma.de_valores([5, 5, 0]))
+
+    assert len(histograma) == 7 and histograma.soma == 33
+    assert histograma.modas() == ([5], [3])
+    assert not Histograma.de_valores([1, 2, 3]).possui_moda()
+    assert Histograma.de_dict(histograma.para_dict()).contagens.tolist() == histograma.contagens.tolist()
+    with pytest.raises(ValueError):
+        histograma.adicionar(-1)
+
+
+def test_contagens_por_grupo():
+    rng = np.random.default_rng(1)
+    valores, codigos = rng.poisson(10, 500), rng.integers(0, 7, 500)
+    limiares = np.array([-1, 0, 4.5, 10, 40])
+    menores, menores_iguais = contagens_abaixo(histogramas_por_grupo(valores, codigos, 7), limiares)
+
+    for grupo in range(7):
+        do_grupo = valores[codigos == grupo]
+        assert menores[grupo].tolist() == [(do_grupo < x).sum() for x in limiares]
+        assert menores_iguais[grupo].tolist() == [(do_grupo <= x).sum() for x in limiares]
+
+    # Um limiar por grupo
+    proprios = rng.uniform(-1, 40, 7)
+    assert menores_por_grupo(histogramas_por_grupo(valores, codigos, 7), proprios).tolist() == \
+        [(valores[codigos == grupo] < x).sum() for grupo, x in enumerate(proprios)]
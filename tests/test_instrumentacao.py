@@ -0,0 +1,53 @@
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from src.utils.instrumentacao import (span, instrumentar, ativar_instrumentacao, desativar_instrumentacao, definir_etapa,
+                                      eventos_coletados, limpar_eventos, ler_eventos, resumir_eventos)
+
+
+@instrumentar("transformacao")
+def dobrar(valor):
+    return valor * 2
+
+
+def test_desativada_nao_registra_eventos():
+    limpar_eventos()
+    with span("busca", "teste"):
+        pass
+    assert dobrar(2) == 4
+    assert eventos_coletados() == []
+    assert span("busca", "teste") is span("ajuste", "outro")
+
+
+def test_spans_gravados_e_resumidos(tmp_path):
+    limpar_eventos()
+    arquivo = str(tmp_path / "eventos.jsonl")
+    try:
+        ativar_instrumentacao(arquivo)
+        definir_etapa("P3-RF7")
+        with span("etapa", "P3-RF7"):
+            for _ in range(2):
+                with span("ajuste", "gam_poisson", player_id=1630560, season="2024-25"):
+                    time.sleep(0.01)
+            assert dobrar(3) == 6
+            figura = plt.figure()
+            figura.savefig(str(tmp_path / "grafico.png"))
+            plt.close(figura)
+    finally:
+        desativar_instrumentacao()
+
+    eventos = ler_eventos(arquivo)
+    assert len(eventos) == len(eventos_coletados()) == 5
+    assert {e["etapa"] for e in eventos} == {"P3-RF7"}
+    ajuste = [e for e in eventos if e["nome"] == "gam_poisson"]
+    assert ajuste[0]["player_id"] == 1630560 and ajuste[0]["season"] == "2024-25"
+    assert [e["arquivo"] for e in eventos if e["categoria"] == "renderizacao"] == ["grafico.png"]
+
+    resumo = {linha["nome"]: linha for linha in resumir_eventos(eventos)}
+    assert resumo["gam_poisson"]["chamadas"] == 2
+    assert resumo["gam_poisson"]["total_s"] >= 0.02
+    assert 0 < resumo["gam_poisson"]["percentual_etapa"] <= 100
+    assert resumo["dobrar"]["categoria"] == "transformacao"
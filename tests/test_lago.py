@@ -0,0 +1,51 @@
+import pandas as pd
+
+from src.data.esquema import normalizar_gamelog
+from src.data.lago import ler_gamelogs
+from src.data.repositorio_gamelogs import caminho_gamelog, _gravar_parquet
+from src.rf.parte3.parte3_rf1 import aplicar_metodo_gumbel_jogadores
+
+
+def _log(player_id, matchups, pontos):
+    return normalizar_gamelog(pd.DataFrame({
+        "Player_ID": player_id,
+        "Game_ID": [f"{player_id}{i:03d}" for i in range(len(matchups))],
+        "GAME_DATE": ["NOV 03, 2024"] * len(matchups),
+        "MATCHUP": matchups,
+        "WL": ["W"] * len(matchups),
+        "PTS": pontos,
+        "REB": [p // 2 for p in pontos],
+        "AST": [p // 5 for p in pontos],
+    }))
+
+
+def _repositorio(diretorio):
+    _gravar_parquet(_log(1, ["BKN vs. LAL", "BKN @ TOR", "BKN @ BOS"], [10, 20, 30]), caminho_gamelog(1, "2024-25", diretorio=diretorio))
+    _gravar_parquet(_log(2, ["LAL vs. BOS"], [25]), caminho_gamelog(2, "2024-25", diretorio=diretorio))
+    _gravar_parquet(_log(1, ["BKN @ BOS"], [5]), caminho_gamelog(1, "2023-24", diretorio=diretorio))
+
+
+def test_colunas_e_filtros_na_leitura(tmp_path):
+    _repositorio(str(tmp_path))
+
+    df = ler_gamelogs(colunas=["PTS", "MATCHUP"], filtros={"PLAYER_ID": 1, "SEASON": "2024-25"}, diretorio=str(tmp_path))
+    assert list(df.columns) == ["MATCHUP", "PTS"]
+    assert df["PTS"].tolist() == [10, 20, 30]
+
+    df = ler_gamelogs(colunas=["PLAYER_ID", "PTS", "SEASON"], filtros={"PLAYER_ID": [1, 2], "MATCHUP": "BKN @ BOS"},
+                      diretorio=str(tmp_path))
+    assert sorted(zip(df["SEASON"], df["PTS"])) == [("2023-24", 5), ("2024-25", 30)]
+
+    assert ler_gamelogs(tipo="times", diretorio=str(tmp_path)).empty
+
+
+def test_gumbel_le_o_repositorio(tmp_path, monkeypatch):
+    _repositorio(str(tmp_path))
+    monkeypatch.setattr("src.data.lago.GAMELOGS_DIR", str(tmp_path))
+
+    players = [{"PLAYER": "A", "PLAYER_ID": 1}, {"PLAYER": "B", "PLAYER_ID": 2}]
+    resultados = aplicar_metodo_gumbel_jogadores(players, {"A": {"PTS": 15}, "B": {"PTS": 15}})
+
+    # B só tem jogos pelo LAL, então fica de fora dos resultados do BKN
+    assert list(resultados) == ["A"]
+    assert resultados["A"]["PTS"].iloc[4] == [10]
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from src.data import liga
+from src.data.liga import elenco_do_time
+from src.rf.etapas import montar_etapas_liga
+from src.utils.pipeline import selecionar_etapas
+
+
+ESTATISTICAS = pd.DataFrame({
+    "PLAYER_ID": [1, 2, 3, 4],
+    "PLAYER_NAME": ["A", "B", "C", "D"],
+    "TEAM_ID": [10, 10, 10, 20],
+    "MIN": [30.5, 12.0, 25.1, 40.0],
+})
+
+TIMES = {
+    "BKN": {"team_id": 1610612751, "team_abbr": "BKN", "team_name": "Brooklyn Nets",
+            "players": [{"PLAYER": "A", "PLAYER_ID": 1}]},
+    "LAL": {"team_id": 1610612747, "team_abbr": "LAL", "team_name": "Los Angeles Lakers",
+            "players": [{"PLAYER": "D", "PLAYER_ID": 4}]},
+}
+
+
+def test_elenco_com_mais_minutos():
+    assert elenco_do_time(ESTATISTICAS, 10, 2) == [{"PLAYER": "A", "PLAYER_ID": 1}, {"PLAYER": "C", "PLAYER_ID": 3}]
+
+
+def test_etapas_da_liga_por_time():
+    etapas = montar_etapas_liga(TIMES, ["2023-24"])
+
+    # As etapas gerais da liga aparecem uma vez; as demais, uma vez por time, em pastas separadas
+    assert [nome for nome in etapas if "/" not in nome] == ["P1-RF1", "P1-RF2", "P3-RF1-LIGA-2023-24"]
+    assert etapas["BKN/P3-RF2"]["depende_de"] == ["BKN/P3-RF1"]
+    assert etapas["LAL/P3-RF1"]["kwargs"]["team_abbr"] == "LAL"
+    assert etapas["LAL/P2-RF5"]["kwargs"]["output_dir"] == "reports/liga/LAL/arquivos_csv/parte2/parte2-rf5"
+    assert etapas["BKN/P1-RF7"]["kwargs"]["team_abbr"] == "BRK"
+    assert etapas["LAL/P2-RF3"]["kwargs"]["opponent_abbr"] != "LAL"
+
+    selecionadas = selecionar_etapas(etapas, somente=["LAL"])
+    assert selecionadas and all(nome.startswith("LAL/") for nome in selecionadas)
+
+
+def test_estatisticas_do_time_consultadas_por_time(monkeypatch):
+    chamadas = []
+
+    class RespostaFalsa:
+        def get_data_frames(self):
+            return [ESTATISTICAS[ESTATISTICAS["TEAM_ID"] == 10]]
+
+    def consultar_falso(endpoint, **kwargs):
+        chamadas.append(kwargs)
+        return RespostaFalsa()
+
+    monkeypatch.setattr(liga, "consultar_endpoint", consultar_falso)
+
+    # Os números do jogador pelo time, e não o filtro do LeagueDashPlayerStats da liga por TEAM_ID
+    # (que mostra um jogador trocado só no último time, com os totais somados)
+    assert liga.estatisticas_jogadores_time(10, "2023-24")["PLAYER_ID"].tolist() == [1, 2, 3]
+    assert chamadas == [{"season": "2023-24", "season_type_all_star": "Regular Season", "team_id_nullable": 10}]
@@ -1,4 +1,6 @@
-from src.models.regressao_linear import aplicar_regressao
+import numpy as np
+
+from src.models.regressao_linear import aplicar_regressao, previsoes_loocv, press
 
 
 def test_regressao_linear():
@@ -6,3 +8,27 @@ def test_regressao_linear():
     y = [2, 4, 6]
     model = aplicar_regressao(X, y)
     assert model.coef_[0] == 2
+
+
+def _loocv_sklearn(X, Y):
+    from sklearn.model_selection import LeaveOneOut
+    previsoes = np.zeros_like(Y, dtype=float)
+    for treino, teste in LeaveOneOut().split(X):
+        previsoes[teste] = aplicar_regressao(X[treino], Y[treino]).predict(X[teste])
+    return previsoes
+
+
+def test_loocv_em_forma_fechada_igual_ao_leave_one_out():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(12, 3))
+    Y = X @ rng.normal(size=(3, 2)) + rng.normal(size=(12, 2))
+    previsoes = previsoes_loocv(X, Y)
+    np.testing.assert_allclose(previsoes, _loocv_sklearn(X, Y))
+    np.testing.assert_allclose(press(Y, previsoes), ((Y - _loocv_sklearn(X, Y)) ** 2).sum(axis=0))
+
+    # Coluna repetida (posto incompleto) e um único target
+    X_repetido = np.column_stack([X, X[:, 0]])
+    np.testing.assert_allclose(previsoes_loocv(X_repetido, Y[:, 0]), _loocv_sklearn(X_repetido, Y[:, 0]))
+
+    # Menos linhas que coeficientes, como nas amostras pequenas da Parte 3 RF3
+    np.testing.assert_allclose(previsoes_loocv(X[:3], Y[:3]), _loocv_sklearn(X[:3], Y[:3]))
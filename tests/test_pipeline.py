@@ -0,0 +1,155 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.utils import pipeline, manifesto_etapas
+from src.utils.pipeline import executar_pipeline, selecionar_etapas, carregar_intermediario
+from src.utils.paralelismo import processos_disponiveis
+
+
+def gerar_numeros():
+    return [1, 2, 3]
+
+
+def somar_numeros():
+    return sum(carregar_intermediario("A"))
+
+
+def falhar():
+    raise RuntimeError("falha proposital")
+
+
+def nada():
+    return None
+
+
+def orcamento_da_etapa():
+    return processos_disponiveis()
+
+
+def _etapa(parte, funcao, depende_de=()):
+    return {"parte": parte, "funcao": funcao, "kwargs": {}, "depende_de": list(depende_de), "saidas": []}
+
+
+ETAPAS = {
+    "A": _etapa("parte1", gerar_numeros),
+    "B": _etapa("parte1", somar_numeros, depende_de=["A"]),
+    "C": _etapa("parte2", falhar),
+    "D": _etapa("parte2", nada, depende_de=["C"]),
+}
+
+
+def test_dependencias_e_intermediarios(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(tmp_path))
+    monkeypatch.setattr(manifesto_etapas, "MANIFESTO_ETAPAS", str(tmp_path / "manifesto.json"))
+
+    situacao = executar_pipeline(ETAPAS, workers=2)
+
+    assert situacao == {"A": "concluida", "B": "concluida", "C": "falhou", "D": "ignorada"}
+    assert carregar_intermediario("B", diretorio=str(tmp_path)) == 6
+
+
+def test_selecionar_etapas():
+    assert selecionar_etapas(ETAPAS, somente=["parte2"]) == ["C", "D"]
+    assert selecionar_etapas(ETAPAS, a_partir_de="B") == ["B", "C", "D"]
+    assert selecionar_etapas(ETAPAS, somente=["A", "parte2"], a_partir_de="B") == ["C", "D"]
+
+    with pytest.raises(ValueError):
+        selecionar_etapas(ETAPAS, somente=["parte9"])
+
+
+def copiar_entrada(origem, destino):
+    with open(origem) as f, open(destino, "w") as g:
+        g.write(f.read())
+
+
+def test_etapa_sem_alteracoes_e_reaproveitada(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(tmp_path / "intermediarios"))
+    monkeypatch.setattr(manifesto_etapas, "MANIFESTO_ETAPAS", str(tmp_path / "manifesto.json"))
+    entrada, saida = tmp_path / "entrada.csv", tmp_path / "saida" / "copia.csv"
+    saida.parent.mkdir()
+    entrada.write_text("PTS\n10\n")
+
+    etapas = {"COPIA": dict(_etapa("parte1", copiar_entrada), kwargs={"origem": str(entrada), "destino": str(saida)},
+                            entradas=[str(entrada)], saidas=[str(saida.parent)])}
+
+    assert executar_pipeline(etapas, workers=1) == {"COPIA": "concluida"}
+    assert executar_pipeline(etapas, workers=1) == {"COPIA": "reaproveitada"}
+
+    # Entrada alterada ou artefato apagado: a etapa volta a ser executada
+    entrada.write_text("PTS\n20\n")
+    assert executar_pipeline(etapas, workers=1) == {"COPIA": "concluida"}
+    saida.unlink()
+    assert executar_pipeline(etapas, workers=1) == {"COPIA": "concluida"}
+    assert saida.read_text() == "PTS\n20\n"
+
+
+def test_pools_internos_dividem_as_cpus(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(tmp_path))
+    monkeypatch.setattr(manifesto_etapas, "MANIFESTO_ETAPAS", str(tmp_path / "manifesto.json"))
+    etapas = {nome: _etapa("parte1", orcamento_da_etapa) for nome in ("E1", "E2")}
+
+    executar_pipeline(etapas, workers=2)
+
+    # Duas etapas em paralelo: cada uma pode abrir metade das CPUs nos seus pools internos
+    assert carregar_intermediario("E1", diretorio=str(tmp_path)) == max(1, (os.cpu_count() or 1) // 2)
+
+
+def gravar_devagar(pasta, nome):
+    for i in range(5):
+        with open(os.path.join(pasta, f"{nome}_{i}.csv"), "w") as f:
+            f.write(nome * (i + 1))
+        time.sleep(0.02)
+
+
+def gravar_em_pool(pasta):
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        list(pool.map(gravar_devagar, [pasta, pasta], ["P1", "P2"]))
+
+
+def test_artefatos_sao_os_gravados_pela_etapa(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(tmp_path / "intermediarios"))
+    monkeypatch.setattr(manifesto_etapas, "MANIFESTO_ETAPAS", str(tmp_path / "manifesto.json"))
+    pasta = str(tmp_path / "saida")
+    os.makedirs(pasta)
+    etapas = {
+        nome: dict(_etapa("parte1", gravar_devagar), kwargs={"pasta": pasta, "nome": nome}, saidas=[pasta])
+        for nome in ("X", "Y")
+    }
+    etapas["Z"] = dict(_etapa("parte1", gravar_em_pool), kwargs={"pasta": pasta}, saidas=[pasta])
+
+    executar_pipeline(etapas, workers=3)
+
+    # Etapas simultâneas na mesma pasta registram só os próprios arquivos, inclusive os gravados por filhos
+    manifesto = manifesto_etapas.ler_manifesto()
+    for nome, prefixos in {"X": ["X"], "Y": ["Y"], "Z": ["P1", "P2"]}.items():
+        assert sorted(manifesto[nome]["artefatos"]) == sorted(
+            os.path.join(pasta, f"{prefixo}_{i}.csv") for prefixo in prefixos for i in range(5)
+        )
+
+
+def falhar_em_silencio(pasta):
+    # Como os RFs: o erro é impresso e a função retorna normalmente, sem gravar nada
+    print("Erro ao buscar dados: falha proposital")
+
+
+def test_etapa_sem_artefatos_nao_e_reaproveitada(tmp_path, monkeypatch):
+    intermediarios = tmp_path / "intermediarios"
+    monkeypatch.setattr(pipeline, "INTERMEDIARIOS_DIR", str(intermediarios))
+    monkeypatch.setattr(manifesto_etapas, "MANIFESTO_ETAPAS", str(tmp_path / "manifesto.json"))
+    etapas = {
+        "SILENCIO": dict(_etapa("parte1", falhar_em_silencio), kwargs={"pasta": str(tmp_path)}, saidas=[str(tmp_path / "saida")]),
+        "VALOR": dict(_etapa("parte3", gerar_numeros), saidas=[str(intermediarios / "VALOR.pkl")]),
+    }
+
+    assert executar_pipeline(etapas, workers=1) == {"SILENCIO": "concluida", "VALOR": "concluida"}
+    manifesto = manifesto_etapas.ler_manifesto()
+    assert "SILENCIO" not in manifesto
+    assert list(manifesto["VALOR"]["artefatos"]) == [str(intermediarios / "VALOR.pkl")]
+
+    assert executar_pipeline(etapas, workers=1) == {"SILENCIO": "concluida", "VALOR": "reaproveitada"}
+    # O intermediário apagado faz a etapa ser executada de novo
+    (intermediarios / "VALOR.pkl").unlink()
+    assert executar_pipeline(etapas, workers=1)["VALOR"] == "concluida"
@@ -0,0 +1,88 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.agregados import acumular_jogos
+from src.analytics.quantis import EstimadorQuantis, MedianaDuasPilhas, TDigest, atualizar_estimadores
+
+
+def test_mediana_exata_a_cada_jogo():
+    valores = np.random.default_rng(0).poisson(8, 200)
+    pilhas = MedianaDuasPilhas()
+    for i, valor in enumerate(valores, start=1):
+        pilhas.adicionar(int(valor))
+        vistos = valores[:i]
+        assert pilhas.mediana() == np.median(vistos)
+        assert pilhas.menores_que_mediana() == (vistos < np.median(vistos)).sum()
+
+
+def test_tdigest_aproxima_os_quantis():
+    valores = np.random.default_rng(1).normal(20, 6, 50_000)
+    digest = TDigest(100)
+    for valor in valores:
+        digest.adicionar(valor)
+
+    assert len(digest._medias) < 300
+    for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+        assert abs((valores < digest.quantil(q)).mean() - q) < 0.005
+    assert abs(digest.proporcao_abaixo(25) - (valores < 25).mean()) < 0.005
+
+
+def test_unir_temporadas_e_salvar():
+    rng = np.random.default_rng(2)
+    temporadas = [rng.poisson(12, 80), rng.poisson(15, 70)]
+    estimadores = []
+    for valores in temporadas:
+        estimador = EstimadorQuantis(limite_exato=100)
+        for valor in valores:
+            estimador.adicionar(int(valor))
+        estimadores.append(estimador)
+
+    # Exato enquanto cabe no limite; a união passa dele e vira t-digest
+    assert estimadores[0].mediana() == np.median(temporadas[0])
+    unido = estimadores[0].unir(estimadores[1])
+    todos = np.concatenate(temporadas)
+    assert unido.digest is not None and len(unido) == len(todos) and unido.soma == todos.sum()
+    assert abs(unido.mediana() - np.median(todos)) <= 1
+
+    copia = EstimadorQuantis.de_dict(json.loads(json.dumps(unido.para_dict())))
+    assert copia.mediana() == unido.mediana() and len(copia) == len(unido)
+
+
+def test_estimadores_recebem_so_os_jogos_novos():
+    rng = np.random.default_rng(3)
+    jogos = pd.DataFrame({"PLAYER_ID": 1, "GAME_ID": [f"{i:03d}" for i in range(30)],
+                          "GAME_DATE": pd.date_range("2024-10-22", periods=30), "PTS": rng.poisson(15, 30),
+                          "REB": rng.poisson(5, 30), "AST": rng.poisson(3, 30)})
+    estimadores, _ = atualizar_estimadores(acumular_jogos(jogos.iloc[:20]), ("PTS",))
+    pilhas = estimadores[(1, "PTS")].exato
+
+    estimadores, alterado = atualizar_estimadores(acumular_jogos(jogos), ("PTS",), estimadores)
+    assert alterado and estimadores[(1, "PTS")].exato is pilhas
+    assert estimadores[(1, "PTS")].mediana() == np.median(jogos["PTS"])
+    assert not atualizar_estimadores(acumular_jogos(jogos), ("PTS",), estimadores)[1]
+
+    # Um jogo antigo corrigido refaz o estimador do jogador
+    corrigidos = jogos.assign(PTS=jogos["PTS"].where(jogos.index != 0, 99))
+    estimadores, _ = atualizar_estimadores(acumular_jogos(corrigidos), ("PTS",), estimadores)
+    assert estimadores[(1, "PTS")].mediana() == np.median(corrigidos["PTS"])
+    assert len(estimadores[(1, "PTS")]) == 30
+
+
+def test_pilhas_salvas_como_estao():
+    valores = [int(valor) for valor in np.random.default_rng(4).poisson(10, 101)]
+    estimador = EstimadorQuantis()
+    for valor in valores:
+        estimador.adicionar(valor)
+
+    dados = json.loads(json.dumps(estimador.para_dict()))
+    copia = EstimadorQuantis.de_dict(dados)
+    assert copia.exato._baixo == estimador.exato._baixo and copia.exato._alto == estimador.exato._alto
+    assert copia.mediana() == np.median(valores)
+    assert copia.proporcao_abaixo_mediana() == estimador.proporcao_abaixo_mediana()
+
+    # O formato anterior, com a lista de valores, continua sendo lido
+    antigo = {chave: valor for chave, valor in dados.items() if chave != "pilhas"}
+    antigo["valores"] = sorted(valores)
+    assert EstimadorQuantis.de_dict(antigo).mediana() == copia.mediana()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.models.registro import consultar_modelo, obter_modelo
+from src.models.regressao_linear import aplicar_regressao
+from src.models.regressao_logistica import ajustar_logisticas, probabilidades_logisticas
+
+
+def _dados(n=30):
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame({"MIN": rng.uniform(10, 40, n), "FGA": rng.uniform(2, 20, n), "TOV": rng.uniform(0, 5, n)})
+    y = 0.5 * X["MIN"] + 1.2 * X["FGA"] + rng.normal(0, 1, n)
+    return X, y
+
+
+def test_modelo_atual_nao_e_ajustado_de_novo(tmp_path):
+    X, y = _dados()
+    identificacao = {"season": "2024-25", "target": "PTS", "features": list(X.columns)}
+    chamadas = []
+
+    def ajustar(X, y):
+        chamadas.append(len(y))
+        return aplicar_regressao(X, y)
+
+    modelo = obter_modelo("regressao_linear", identificacao, X, y, ajustar, diretorio=str(tmp_path))
+    # Mesmos dados com outro índice: o modelo vem do registro
+    carregado = obter_modelo("regressao_linear", identificacao, X.reset_index(drop=True).set_index(X.index + 100),
+                             y.reset_index(drop=True), ajustar, diretorio=str(tmp_path))
+    assert chamadas == [30]
+    np.testing.assert_allclose(carregado.coef_, modelo.coef_)
+
+    # Outra identificação é outro modelo
+    obter_modelo("regressao_linear", dict(identificacao, season="2023-24"), X, y, ajustar, diretorio=str(tmp_path))
+    assert chamadas == [30, 30]
+
+
+def test_situacoes_do_registro(tmp_path):
+    X, y = _dados()
+    identificacao = {"target": "PTS"}
+    assert consultar_modelo("regressao_linear", identificacao, X, y, str(tmp_path))[0] == "ausente"
+
+    obter_modelo("regressao_linear", identificacao, X.iloc[:20], y.iloc[:20], aplicar_regressao, diretorio=str(tmp_path))
+    assert consultar_modelo("regressao_linear", identificacao, X.iloc[:20], y.iloc[:20], str(tmp_path))[0] == "atual"
+    assert consultar_modelo("regressao_linear", identificacao, X, y, str(tmp_path))[0] == "ampliado"
+    assert consultar_modelo("regressao_linear", identificacao, X.iloc[5:], y.iloc[5:], str(tmp_path))[0] == "alterado"
+
+
+def test_regressoes_logisticas_em_lote_aquecidas(tmp_path):
+    X, y = _dados(60)
+    Y = np.column_stack([(y > y.median()), (y > y.mean()), (X["MIN"] > 25)]).astype(int)
+    Y_treino = Y.copy()
+    Y_treino[::4, 0] = -1  # linhas fora do treino do primeiro problema
+
+    coef = ajustar_logisticas(X, Y_treino)
+    for j in range(3):
+        treino = Y_treino[:, j] >= 0
+        sklearn = LogisticRegression(tol=1e-10, max_iter=10000).fit(X[treino], Y[treino, j])
+        np.testing.assert_allclose(probabilidades_logisticas(coef, X)[:, j], sklearn.predict_proba(X)[:, 1], atol=1e-5)
+
+    # O registro usa os coeficientes anteriores como ponto de partida quando os dados mudam
+    identificacao = {"target": "PTS", "amostra": "lote"}
+    iniciais = []
+
+    def aquecer(anterior, X, Y, ampliado):
+        iniciais.append(anterior)
+        return ajustar_logisticas(X, Y, inicial=anterior)
+
+    obter_modelo("regressao_logistica_lote", identificacao, X.iloc[:40], Y[:40], ajustar_logisticas,
+                 aquecer=aquecer, diretorio=str(tmp_path))
+    aquecido = obter_modelo("regressao_logistica_lote", identificacao, X, Y, ajustar_logisticas,
+                            aquecer=aquecer, diretorio=str(tmp_path))
+    assert len(iniciais) == 1 and iniciais[0].shape == (3, 4)
+    np.testing.assert_allclose(aquecido, ajustar_logisticas(X, Y), atol=1e-6)
@@ -0,0 +1,152 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+from src.data import repositorio_gamelogs
+from src.data.repositorio_gamelogs import carregar_gamelog, caminho_gamelog, limpar_memoria, ler_manifesto
+
+
+class RespostaFalsa:
+    def __init__(self, df):
+        self.df = df
+
+    def get_data_frames(self):
+        return [self.df]
+
+
+def test_gamelog_buscado_uma_unica_vez(tmp_path, monkeypatch):
+    chamadas = []
+
+    def consultar_falso(endpoint, **kwargs):
+        chamadas.append(kwargs)
+        return RespostaFalsa(pd.DataFrame({"Game_ID": ["002", "001"], "GAME_DATE": ["NOV 03, 2023", "NOV 01, 2023"], "PTS": [20, 10]}))
+
+    monkeypatch.setattr(repositorio_gamelogs, "consultar_endpoint", consultar_falso)
+    limpar_memoria()
+
+    primeiro = carregar_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+    primeiro["PTS"] = 0
+    segundo = carregar_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+
+    # Sem a memória do processo, o log vem do arquivo Parquet
+    limpar_memoria()
+    terceiro = carregar_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+
+    assert len(chamadas) == 1
+    assert segundo["PTS"].tolist() == terceiro["PTS"].tolist() == [20, 10]
+    assert caminho_gamelog(1630560, "2023-24", diretorio=str(tmp_path)).endswith(
+        "jogadores/season=2023-24/player_id=1630560/regular_season.parquet"
+    )
+
+
+def test_sincronizacao_incremental_busca_apenas_jogos_novos(tmp_path, monkeypatch):
+    respostas = [
+        pd.DataFrame({"Game_ID": ["002", "001"], "GAME_DATE": ["APR 03, 2025", "APR 01, 2025"], "PTS": [20, 10]}),
+        pd.DataFrame({"Game_ID": ["003", "002"], "GAME_DATE": ["APR 05, 2025", "APR 03, 2025"], "PTS": [30, 20]}),
+    ]
+    chamadas = []
+
+    def consultar_falso(endpoint, **kwargs):
+        chamadas.append(kwargs)
+        return RespostaFalsa(respostas[len(chamadas) - 1])
+
+    monkeypatch.setattr(repositorio_gamelogs, "consultar_endpoint", consultar_falso)
+    # Temporada atual com TTL zero: todo acesso ao arquivo dispara a sincronização
+    monkeypatch.setattr(repositorio_gamelogs, "calcular_ttl", lambda nome_endpoint, parametros, criado_em=None: 0)
+    limpar_memoria()
+
+    carregar_gamelog(1630560, "2024-25", diretorio=str(tmp_path))
+    caminho = caminho_gamelog(1630560, "2024-25", diretorio=str(tmp_path))
+    os.utime(caminho, (0, 0))
+    atualizado = carregar_gamelog(1630560, "2024-25", diretorio=str(tmp_path))
+
+    assert "date_from_nullable" not in chamadas[0]
+    assert chamadas[1]["date_from_nullable"] == "04/03/2025"
+    assert atualizado["GAME_ID"].tolist() == ["003", "002", "001"]
+
+    marca = ler_manifesto(str(tmp_path))[os.path.relpath(caminho, str(tmp_path))]
+    assert marca["ultimo_game_id"] == "003"
+    assert marca["ultima_data"] == "2025-04-05"
+    assert marca["jogos"] == 3
+
+
+def test_log_gravado_no_meio_da_temporada_e_completado_depois_dela(tmp_path, monkeypatch):
+    respostas = [
+        pd.DataFrame({"Game_ID": ["001"], "GAME_DATE": ["FEB 01, 2024"], "PTS": [10]}),
+        pd.DataFrame({"Game_ID": ["002", "001"], "GAME_DATE": ["APR 10, 2024", "FEB 01, 2024"], "PTS": [20, 10]}),
+    ]
+    chamadas = []
+
+    def consultar_falso(endpoint, **kwargs):
+        chamadas.append(kwargs)
+        return RespostaFalsa(respostas[len(chamadas) - 1])
+
+    monkeypatch.setattr(repositorio_gamelogs, "consultar_endpoint", consultar_falso)
+    limpar_memoria()
+
+    carregar_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+    # Última sincronização em fevereiro de 2024, no meio da temporada 2023-24, já encerrada
+    caminho = caminho_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+    meio_da_temporada = pd.Timestamp("2024-02-02").timestamp()
+    os.utime(caminho, (meio_da_temporada, meio_da_temporada))
+    limpar_memoria()
+
+    completo = carregar_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+    assert chamadas[1]["date_from_nullable"] == "02/01/2024"
+    assert completo["GAME_ID"].tolist() == ["002", "001"]
+
+    # Gravado depois do fim da temporada, o arquivo não é mais sincronizado
+    limpar_memoria()
+    carregar_gamelog(1630560, "2023-24", diretorio=str(tmp_path))
+    assert len(chamadas) == 2
+
+def test_logs_da_liga_divididos_por_time_e_jogador(tmp_path, monkeypatch):
+    log_times = pd.DataFrame({
+        "TEAM_ID": [1, 2, 1, 2],
+        "GAME_ID": ["001", "001", "002", "002"],
+        "GAME_DATE": ["2023-11-01", "2023-11-01", "2023-11-03", "2023-11-03"],
+        "MATCHUP": ["AAA vs. BBB", "BBB @ AAA", "AAA @ BBB", "BBB vs. AAA"],
+        "WL": ["W", "L", "L", "W"],
+        "PTS": [110, 100, 90, 95],
+    })
+    log_jogadores = pd.DataFrame({
+        "PLAYER_ID": [10, 20, 10],
+        "GAME_ID": ["001", "001", "002"],
+        "GAME_DATE": ["2023-11-01", "2023-11-01", "2023-11-03"],
+        "MATCHUP": ["AAA vs. BBB", "BBB @ AAA", "AAA @ BBB"],
+        "WL": ["W", "L", "L"],
+        "PTS": [30, 25, 12],
+    })
+    chamadas = []
+
+    def consultar_falso(endpoint, **kwargs):
+        chamadas.append(kwargs["player_or_team_abbreviation"])
+        return RespostaFalsa(log_times if kwargs["player_or_team_abbreviation"] == "T" else log_jogadores)
+
+    monkeypatch.setattr(repositorio_gamelogs, "consultar_endpoint", consultar_falso)
+    limpar_memoria()
+
+    assert repositorio_gamelogs.distribuir_gamelogs_liga("2023-24", diretorio=str(tmp_path)) == (2, 2)
+    time = repositorio_gamelogs.carregar_gamelog_time(1, "2023-24", diretorio=str(tmp_path))
+    jogador = carregar_gamelog(10, "2023-24", diretorio=str(tmp_path))
+
+    # Duas requisições para a liga inteira; os logs de times e jogadores são lidos do repositório
+    assert sorted(chamadas) == ["P", "T"]
+    assert time["GAME_ID"].tolist() == ["002", "001"]
+    assert time["GAME_DATE"].dt.strftime("%Y-%m-%d").tolist() == ["2023-11-03", "2023-11-01"]
+    assert time[["W", "L"]].values.tolist() == [[1, 1], [1, 0]]
+    assert jogador["PTS"].tolist() == [12, 30]
+    assert len(ler_manifesto(str(tmp_path))) == 6
+
+
+def _gravar_marcas_do_processo(diretorio, inicio):
+    for i in range(inicio, inicio + 20):
+        repositorio_gamelogs._gravar_marcas({os.path.join(diretorio, f"log_{i}.parquet"): {"jogos": i}}, diretorio)
+
+
+def test_manifesto_nao_perde_marcas_entre_processos(tmp_path):
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        list(pool.map(_gravar_marcas_do_processo, [str(tmp_path)] * 4, [0, 20, 40, 60]))
+
+    # Cada processo relê o manifesto sob a trava antes de gravar, então nenhuma marca se perde
+    assert len(ler_manifesto(str(tmp_path))) == 80
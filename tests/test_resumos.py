@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics.histogramas import Histograma
+from src.analytics import agregados
+from src.analytics.agregados import caminho_agregados, resumos_distribuicao
+from src.analytics.quantis import salvar_estimadores
+from src.analytics.resumos import ResumoDistribuicao
+
+
+def test_resumo_igual_ao_pandas():
+    rng = np.random.default_rng(0)
+    for valores in (pd.Series(rng.poisson(9, 60)), pd.Series(rng.normal(15, 4, 60).round(1))):
+        resumo = ResumoDistribuicao(valores)
+        assert resumo.media == valores.mean()
+        assert resumo.mediana == valores.median()
+        assert resumo.moda == valores.mode().iloc[0]
+        assert resumo.modas == valores.mode().tolist()
+        assert (resumo.minimo, resumo.maximo) == (valores.min(), valores.max())
+        np.testing.assert_allclose(resumo.desvio, valores.std())
+        assert resumo.proporcao_abaixo(resumo.media) == valores.lt(valores.mean()).mean()
+
+    # Inteiros não negativos ficam em histograma; os demais, no vetor ordenado
+    assert ResumoDistribuicao([3, 1, 2]).histograma is not None
+    assert ResumoDistribuicao([1.5, -2.0]).histograma is None
+
+
+def test_resumos_dos_histogramas_salvos(tmp_path, monkeypatch):
+    temporadas = {"2023-24": [10, 12, 12], "2024-25": [10, 10, 15]}
+    for season, pontos in temporadas.items():
+        salvar_estimadores({(1630560, "PTS"): Histograma.de_valores(pontos), (1, "PTS"): Histograma.de_valores([3])},
+                           caminho_agregados(season, "BKN", str(tmp_path), "_histogramas.json"))
+
+    def recalcular(*args, **kwargs):
+        raise AssertionError("os histogramas salvos deveriam ser lidos, não recalculados")
+
+    monkeypatch.setattr(agregados, "agregados_jogadores", recalcular)
+    resumos = resumos_distribuicao([1630560], list(temporadas), "BKN", diretorio=str(tmp_path))
+
+    # Uma chave por jogador e métrica, com as temporadas unidas
+    assert list(resumos) == [(1630560, "PTS")]
+    resumo = resumos[(1630560, "PTS")]
+    assert resumo.n == 6 and resumo.modas == [10] and resumo.ocorrencias_moda == [3]
+    assert resumo.mediana == 11 and (resumo.minimo, resumo.maximo) == (10, 15)
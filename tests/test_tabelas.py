@@ -0,0 +1,25 @@
+import pandas as pd
+
+from src.visualizations.tabelas import salvar_tabela_como_imagem, salvar_tabela_em_paginas, salvar_tabelas_em_lote
+
+
+def _tabela(linhas):
+    return pd.DataFrame({"Jogador": [f"J{i}" for i in range(linhas)], "PTS": range(linhas)})
+
+
+def test_formato_e_tabela_vazia(tmp_path):
+    caminho = salvar_tabela_como_imagem(_tabela(3), str(tmp_path / "pontos.jpg"), "Pontos", dpi=50, formato="webp")
+
+    assert caminho == str(tmp_path / "pontos.webp")
+    assert (tmp_path / "pontos.webp").read_bytes()[8:12] == b"WEBP"
+    assert salvar_tabela_como_imagem(_tabela(0), str(tmp_path / "vazia.png"), "Vazia") is None
+
+
+def test_lote_e_paginas(tmp_path):
+    tabelas = [(_tabela(n), str(tmp_path / f"t{n}.png"), f"Tabela {n}") for n in (1, 2, 3)]
+
+    assert salvar_tabelas_em_lote(tabelas, workers=2, dpi=50) == [caminho for _, caminho, _ in tabelas]
+    assert all((tmp_path / f"t{n}.png").exists() for n in (1, 2, 3))
+
+    paginas = salvar_tabela_em_paginas(_tabela(45), str(tmp_path), "jogos", workers=2)
+    assert [p.rsplit("_", 1)[-1] for p in paginas] == ["1.jpg", "2.jpg", "3.jpg"]
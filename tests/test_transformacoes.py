@@ -0,0 +1,39 @@
+import pandas as pd
+
+from src.data.transformacoes import enriquecer_gamelog, local_do_jogo, sigla_adversario, resultado_por_local
+
+
+GAME_LOG = pd.DataFrame({
+    "Game_ID": ["001", "002", "003", "004"],
+    "MATCHUP": ["BKN vs. LAL", "BKN @ TOR", "BKN @ NYK", "BKN vs. BOS"],
+    "WL": ["W", "L", "W", "L"],
+    "PTS": [110, 98, 120, 101],
+})
+
+
+def test_local_e_adversario():
+    assert list(local_do_jogo(GAME_LOG["MATCHUP"])) == ["Casa", "Fora", "Fora", "Casa"]
+    assert list(sigla_adversario(GAME_LOG["MATCHUP"])) == ["LAL", "TOR", "NYK", "BOS"]
+    assert list(sigla_adversario(pd.Series(["", "BKN x BOS"]))) == ["", ""]
+
+
+def test_resultado_por_local_igual_ao_calculo_por_linha():
+    em_casa = GAME_LOG["MATCHUP"].str.contains("vs.", regex=False)
+    casa, fora = resultado_por_local(em_casa, GAME_LOG["WL"] == "W")
+
+    esperado_casa = [1 if "vs." in m and wl == "W" else (-1 if "vs." in m else 0)
+                     for m, wl in zip(GAME_LOG["MATCHUP"], GAME_LOG["WL"])]
+    esperado_fora = [1 if "@" in m and wl == "W" else (-1 if "@" in m else 0)
+                     for m, wl in zip(GAME_LOG["MATCHUP"], GAME_LOG["WL"])]
+    assert list(casa) == esperado_casa
+    assert list(fora) == esperado_fora
+
+
+def test_enriquecer_gamelog():
+    df = enriquecer_gamelog(GAME_LOG, pontos_adversarios={"001": 100, "002": 105, "003": 99})
+
+    assert list(df["VITORIA"]) == [1, 0, 1, 0]
+    assert list(df["DERROTA"]) == [0, 1, 0, 1]
+    assert list(df["SALDO"].iloc[:3]) == [10, -7, 21]
+    assert pd.isna(df["SALDO"].iloc[3])
+    assert "EM_CASA" not in GAME_LOG.columns
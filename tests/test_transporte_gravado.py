@@ -0,0 +1,62 @@
+import time
+
+import pytest
+import requests
+
+from src.data import transporte_gravado
+from src.data.transporte_gravado import ativar_transporte, desativar_transporte, RespostaNaoGravada
+
+
+def _resposta_falsa(sessao, method, url, params=None, data=None, **kwargs):
+    resposta = requests.Response()
+    resposta.status_code = 200
+    resposta._content = f"<html>{url} {params}</html>".encode("utf-8")
+    resposta.encoding = "utf-8"
+    resposta.headers["Content-Type"] = "text/html"
+    resposta.url = url
+    return resposta
+
+
+def _sem_rede(*args, **kwargs):
+    raise AssertionError("A reprodução não deveria acessar a rede.")
+
+
+def test_resposta_gravada_e_reproduzida_sem_rede(tmp_path, monkeypatch):
+    monkeypatch.setattr(transporte_gravado, "_enviar", _resposta_falsa)
+    try:
+        ativar_transporte("gravar", str(tmp_path))
+        gravada = requests.get("https://hoopshype.com/salaries/players/", params={"pagina": 1})
+
+        monkeypatch.setattr(transporte_gravado, "_enviar", _sem_rede)
+        ativar_transporte("reproduzir", str(tmp_path), latencia=0)
+        reproduzida = requests.get("https://hoopshype.com/salaries/players/", params={"pagina": 1})
+    finally:
+        desativar_transporte()
+
+    assert reproduzida.status_code == 200
+    assert reproduzida.text == gravada.text
+    assert reproduzida.headers["Content-Type"] == "text/html"
+    assert len(list((tmp_path / "hoopshype.com").iterdir())) == 1
+
+
+def test_reproducao_sem_resposta_gravada_falha(tmp_path):
+    try:
+        ativar_transporte("reproduzir", str(tmp_path))
+        with pytest.raises(RespostaNaoGravada):
+            requests.get("https://www.basketball-reference.com/teams/BRK/2025_games.html")
+    finally:
+        desativar_transporte()
+
+
+def test_latencia_simulada(tmp_path, monkeypatch):
+    monkeypatch.setattr(transporte_gravado, "_enviar", _resposta_falsa)
+    try:
+        ativar_transporte("gravar", str(tmp_path))
+        requests.get("https://stats.nba.com/stats/teste")
+
+        ativar_transporte("reproduzir", str(tmp_path), latencia=0.05)
+        inicio = time.monotonic()
+        requests.get("https://stats.nba.com/stats/teste")
+        assert time.monotonic() - inicio >= 0.05
+    finally:
+        desativar_transporte()